@@ -1,48 +1,53 @@
 """The Modbus Wizard integration."""
 import os
-import shutil
+import hashlib
 import logging
+import time
+from functools import partial
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
-from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient, AsyncModbusUdpClient
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.service import SupportsResponse
+from homeassistant.helpers.storage import Store
 from datetime import timedelta
 from .const import (
-    CONF_BAUDRATE,
-    CONF_BYTESIZE,
-    CONF_CONNECTION_TYPE,
-    CONF_PROTOCOL,
-    CONF_HOST,
-    CONF_PARITY,
-    CONF_PORT,
-    CONF_SERIAL_PORT,
+    CONF_DEVICES,
+    CONF_ENTITIES,
+    CONF_HUB,
     CONF_SLAVE_ID,
-    CONF_STOPBITS,
     CONF_UPDATE_INTERVAL,
     CONF_NAME,
-    CONNECTION_TYPE_SERIAL,
-    CONNECTION_TYPE_IP,
-    CONNECTION_TYPE_UDP,
-    CONNECTION_TYPE_TCP,
-    DEFAULT_BAUDRATE,
-    DEFAULT_BYTESIZE,
-    DEFAULT_PARITY,
-    DEFAULT_STOPBITS,
     DOMAIN,
+    reg_key,
 )
+from .bus import async_unschedule, get_bus_schedule, join_poll_group, leave_poll_group
+from .capture import unwrap_client
+from .connection import connection_key, create_client
 from .coordinator import ModbusWizardCoordinator
+from .entity_manager import ModbusWizardEntityManager
+from .hub import async_setup_hub
+from .profiling import DEFAULT_PROFILE_CYCLES, DEFAULT_PROFILE_TOP, PollProfiler
+from .register_store import SIGNAL_REGISTERS_UPDATED, get_register_store
+from .scanner import SCAN_REGISTER_TYPES
+from .trace import TracingClient, get_trace
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR, Platform.NUMBER, Platform.SELECT]
+PLATFORMS = [Platform.SENSOR, Platform.NUMBER, Platform.SELECT, Platform.SWITCH]
+
+# Most addresses one read_range call may cover
+MAX_RANGE_READ = 1000
 
 async def async_install_frontend_resource(hass: HomeAssistant):
     """Ensure the frontend JS file is copied to the www/community folder."""
     
     def install():
+        import shutil
+
         # Source path: custom_components/ha_felicity/frontend/
         source_path = hass.config.path("custom_components", DOMAIN, "frontend", "ha_modbus_wizard.js")
         
@@ -50,20 +55,26 @@ async def async_install_frontend_resource(hass: HomeAssistant):
         target_dir = hass.config.path("www", "community", DOMAIN)
         target_path = os.path.join(target_dir, "ha_modbus_wizard.js")
 
+        def _digest(path):
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+
         try:
             # 1. Ensure the destination directory exists
             if not os.path.exists(target_dir):
                 _LOGGER.debug("Creating directory: %s", target_dir)
                 os.makedirs(target_dir, exist_ok=True)
 
-            # 2. Check if source exists and copy
-            if os.path.exists(source_path):
+            # 2. Check if source exists and copy when the content changed
+            if not os.path.exists(source_path):
+                _LOGGER.warning("Frontend source file missing at %s", source_path)
+            elif os.path.exists(target_path) and _digest(source_path) == _digest(target_path):
+                _LOGGER.debug("Frontend resource up to date: %s", target_path)
+            else:
                 # Using copy2 to preserve metadata (timestamps)
                 shutil.copy2(source_path, target_path)
                 _LOGGER.info("Updated frontend resource: %s", target_path)
-            else:
-                _LOGGER.warning("Frontend source file missing at %s", source_path)
-                
+
         except Exception as err:
             _LOGGER.error("Failed to install frontend resource: %s", err)
 
@@ -105,74 +116,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault("connections", {})
     hass.data[DOMAIN].setdefault("coordinators", {})
+    hass.data[DOMAIN].setdefault("entity_managers", {})
+    hass.data[DOMAIN].setdefault("hubs", {})
 
     config = entry.data
-    connection_type = config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL)
-    protocol = config.get(CONF_PROTOCOL, CONNECTION_TYPE_TCP)
 
     # ----------------------------------------------------------------
     # Get or create shared Modbus connection
     # ----------------------------------------------------------------
-    if connection_type == CONNECTION_TYPE_SERIAL:
-        key = (
-            f"serial:"
-            f"{config[CONF_SERIAL_PORT]}:"
-            f"{config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)}:"
-            f"{config.get(CONF_PARITY, DEFAULT_PARITY)}:"
-            f"{config.get(CONF_STOPBITS, DEFAULT_STOPBITS)}:"
-            f"{config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE)}"
-        )
+    key = connection_key(config)
 
-        if key not in hass.data[DOMAIN]["connections"]:
-            _LOGGER.debug("Creating a serial Modbus client in init")
-
-            hass.data[DOMAIN]["connections"][key] = AsyncModbusSerialClient(
-                port=config[CONF_SERIAL_PORT],
-                baudrate=config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
-                parity=config.get(CONF_PARITY, DEFAULT_PARITY),
-                stopbits=config.get(CONF_STOPBITS, DEFAULT_STOPBITS),
-                bytesize=config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
-                timeout=5,
-            )
-    elif connection_type == CONNECTION_TYPE_IP and protocol == CONNECTION_TYPE_UDP:
-        key = f"ip_udp:{config[CONF_HOST]}:{config[CONF_PORT]}"
-        _LOGGER.debug("Creating a IP-UDP Modbus client in init")
-
-        if key not in hass.data[DOMAIN]["connections"]:
-            hass.data[DOMAIN]["connections"][key] = AsyncModbusUdpClient(
-                host=config[CONF_HOST],
-                port=config[CONF_PORT],
-                timeout=5,
-            )
-    else:  # UDP
-        key = f"ip_tcp:{config[CONF_HOST]}:{config[CONF_PORT]}"
-        _LOGGER.debug("Creating a IP-TCP Modbus client in init")
-
-        if key not in hass.data[DOMAIN]["connections"]:
-            hass.data[DOMAIN]["connections"][key] = AsyncModbusTcpClient(
-                host=config[CONF_HOST],
-                port=config[CONF_PORT],
-                timeout=5,
-            )
+    if key not in hass.data[DOMAIN]["connections"]:
+        _LOGGER.debug("Creating Modbus client %s in init", key)
+        # Every request on the connection is recorded in its transaction trace
+        hass.data[DOMAIN]["connections"][key] = TracingClient(
+            create_client(config, timeout=5), get_trace(hass, key)
+        )
 
     client = hass.data[DOMAIN]["connections"][key]
 
     # ----------------------------------------------------------------
-    # Create coordinator (ONE per config entry)
+    # Create coordinator (ONE per config entry; a hub polls all its slaves)
     # ----------------------------------------------------------------
     update_interval = entry.options.get(CONF_UPDATE_INTERVAL, 10)
 
-    coordinator = ModbusWizardCoordinator(
-        hass=hass,
-        client=client,
-        slave_id=int(config[CONF_SLAVE_ID]),
-        config_entry=entry,
-        update_interval=timedelta(seconds=update_interval),
-    )
-
-    await coordinator.async_config_entry_first_refresh()
+    # Both start from the last-known values; the first poll runs in the
+    # background so slow devices don't hold up HA startup
+    if config.get(CONF_HUB):
+        coordinator = await async_setup_hub(
+            hass, entry, client, key, timedelta(seconds=update_interval)
+        )
+        hass.data[DOMAIN]["hubs"][entry.entry_id] = coordinator
+        get_bus_schedule(hass, key).set(coordinator, timedelta(seconds=update_interval))
+    else:
+        # The coordinator compiles its plan from the register map on creation
+        await get_register_store(hass, entry.entry_id).async_load()
+        coordinator = ModbusWizardCoordinator(
+            hass=hass,
+            client=client,
+            slave_id=int(config[CONF_SLAVE_ID]),
+            connection_key=key,
+            config_entry=entry,
+            update_interval=timedelta(seconds=update_interval),
+        )
+        await coordinator.async_load_cached_values()
+        # Entries on the same slave of this connection share one poll slot;
+        # slots of all entries on the connection are staggered by the bus schedule
+        join_poll_group(hass, coordinator)
 
-    hass.data[DOMAIN]["coordinators"][entry.entry_id] = coordinator
+        hass.data[DOMAIN]["coordinators"][entry.entry_id] = coordinator
+        hass.data[DOMAIN]["entity_managers"][entry.entry_id] = ModbusWizardEntityManager(hass, entry)
     # CREATE DEVICE REGISTRY ENTRY
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
@@ -188,20 +181,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # ----------------------------------------------------------------
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Options and register map changes are applied in place, no reload
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    if not config.get(CONF_HUB):
+        entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_REGISTERS_UPDATED.format(entry.entry_id),
+                partial(_async_options_updated, hass, entry),
+            )
+        )
+
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_refresh(),
+        name=f"{DOMAIN} first refresh {entry.entry_id}",
+    )
+
     # ----------------------------------------------------------------
     # Services (register once)
     # ----------------------------------------------------------------
     if not hass.data[DOMAIN].get("services_registered"):
         await async_setup_services(hass)
+        async_register_websocket_commands(hass)
         hass.data[DOMAIN]["services_registered"] = True
 
     # ----------------------------------------------------------------
-    # Frontend
+    # Frontend (once per HA start)
     # ----------------------------------------------------------------
+    if not hass.data[DOMAIN].get("frontend_registered"):
+        hass.data[DOMAIN]["frontend_registered"] = True
+        hass.async_create_background_task(
+            _async_setup_frontend(hass, entry),
+            name=f"{DOMAIN} frontend setup",
+        )
+
+    return True
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate old config entries."""
+    if entry.version > 2:
+        return False
+
+    if entry.version == 1:
+        # Register map: entry options -> per-entry Store. Written before the
+        # options are trimmed, so a failed write leaves the entry untouched.
+        options = dict(entry.options)
+        registers = options.pop(CONF_ENTITIES, None)
+        if registers:
+            await get_register_store(hass, entry.entry_id).async_save(registers)
+        hass.config_entries.async_update_entry(entry, options=options, version=2)
+        _LOGGER.info(
+            "Migrated %d registers of %s to their own store", len(registers or []), entry.title
+        )
+    return True
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Recompile the coordinator plan and sync entities after an options or register map change."""
+    hub = hass.data[DOMAIN]["hubs"].get(entry.entry_id)
+    if hub is not None:
+        # Slaves are created at setup; adding or removing them reloads the hub
+        if hub.devices_changed:
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+            return
+        interval = entry.options.get(CONF_UPDATE_INTERVAL)
+        if interval:
+            get_bus_schedule(hass, hub.connection_key).set(hub, timedelta(seconds=interval))
+        return
+
+    coordinator = hass.data[DOMAIN]["coordinators"].get(entry.entry_id)
+    if not coordinator:
+        return
+    await coordinator.async_apply_options()
+    await hass.data[DOMAIN]["entity_managers"][entry.entry_id].async_apply(coordinator.registers)
+    await coordinator.async_request_refresh()
+
+async def _async_setup_frontend(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await async_install_frontend_resource(hass)
     await async_register_card(hass, entry)
-    
-    return True
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     def _get_coordinator(call: ServiceCall) -> ModbusWizardCoordinator:
@@ -247,6 +305,19 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             else:
                 raise HomeAssistantError("No coordinators found")
     
+        # Hub entries: the slave is the registry device the entity belongs to
+        hub = hass.data[DOMAIN]["hubs"].get(entry_id)
+        if hub is not None:
+            device_entry = (
+                dr.async_get(hass).async_get(entity_entry.device_id)
+                if entity_entry and entity_entry.device_id
+                else None
+            )
+            coordinator = hub.device_for_identifiers(device_entry.identifiers) if device_entry else None
+            if coordinator is None:
+                raise HomeAssistantError(f"Entity {entity_id} does not belong to a slave of the hub")
+            return coordinator
+
         # Get coordinator
         coordinator = hass.data[DOMAIN]["coordinators"].get(entry_id)
         if not coordinator:
@@ -255,6 +326,12 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         _LOGGER.debug("Successfully found coordinator for entry: %s", entry_id)
         return coordinator
         
+    def _all_coordinators() -> list[ModbusWizardCoordinator]:
+        coordinators = list(hass.data[DOMAIN]["coordinators"].values())
+        for hub in hass.data[DOMAIN]["hubs"].values():
+            coordinators.extend(hub.devices.values())
+        return coordinators
+
     async def handle_write_register(call: ServiceCall):
         coordinator = _get_coordinator(call)
         _LOGGER.debug("About to write to register via external call")
@@ -301,6 +378,93 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         
         _LOGGER.debug("Read successful, returning value: %s", value)
         return {"value": value}
+
+    async def handle_read_range(call: ServiceCall):
+        """Read a block of raw register words or bits, e.g. for the card's register table."""
+        address = int(call.data["address"])
+        count = int(call.data.get("count", 1))
+        register_type = call.data.get("register_type", "holding").lower()
+        if not 1 <= count <= MAX_RANGE_READ or address < 0 or address + count > 65536:
+            raise HomeAssistantError(f"Range must be 1-{MAX_RANGE_READ} addresses within 0-65535")
+        if register_type not in SCAN_REGISTER_TYPES:
+            raise HomeAssistantError(f"Invalid register_type: {register_type}")
+
+        coordinator = _get_coordinator(call)
+        values = await coordinator.async_read_range(register_type, address, count)
+        return {"register_type": register_type, "address": address, "values": values}
+
+    async def handle_scan_registers(call: ServiceCall):
+        """Start a background register-map scan."""
+        coordinator = _get_coordinator(call)
+        start = int(call.data.get("start", 0))
+        end = int(call.data.get("end", 65535))
+        if end < start:
+            raise HomeAssistantError("end must be greater than or equal to start")
+
+        started = await coordinator.async_start_scan(
+            start=start,
+            end=end,
+            register_types=call.data.get("register_types"),
+        )
+        if not started:
+            raise HomeAssistantError("Scan could not be started (already running or not connected)")
+
+    async def handle_cancel_scan(call: ServiceCall):
+        """Cancel a running register-map scan."""
+        coordinator = _get_coordinator(call)
+        if not await coordinator.async_cancel_scan():
+            raise HomeAssistantError("No scan is running for this device")
+
+    async def handle_start_capture(call: ServiceCall):
+        """Start recording the bus traffic of a device."""
+        coordinator = _get_coordinator(call)
+        started = await coordinator.async_start_capture(
+            max_bytes=int(float(call.data.get("max_size", 5)) * 1024 * 1024),
+            backups=int(call.data.get("backups", 3)),
+        )
+        if not started:
+            raise HomeAssistantError("A capture is already running for this device")
+
+    async def handle_stop_capture(call: ServiceCall):
+        """Stop recording and return where the capture was written."""
+        coordinator = _get_coordinator(call)
+        result = await coordinator.async_stop_capture()
+        if result is None:
+            raise HomeAssistantError("No capture is running for this device")
+        return result
+
+    async def handle_profile(call: ServiceCall):
+        """Profile the next poll cycles of one or all devices."""
+        if call.data.get("all_devices"):
+            coordinators = _all_coordinators()
+        else:
+            coordinators = [_get_coordinator(call)]
+        if not coordinators:
+            raise HomeAssistantError("No coordinators found")
+        if any(c.profiler is not None for c in _all_coordinators()):
+            raise HomeAssistantError("A profiling session is already running")
+
+        PollProfiler(
+            hass,
+            coordinators,
+            cycles=int(call.data.get("cycles", DEFAULT_PROFILE_CYCLES)),
+            memory=bool(call.data.get("memory", False)),
+            top=int(call.data.get("top", DEFAULT_PROFILE_TOP)),
+        ).async_start()
+
+    async def handle_get_history(call: ServiceCall):
+        """Return buffered samples for the device's registers."""
+        coordinator = _get_coordinator(call)
+        registers = call.data.get("registers")
+        samples = call.data.get("samples")
+        since = call.data.get("seconds")
+        return {
+            "registers": coordinator.get_history(
+                keys=[reg_key(name) for name in registers] if registers else None,
+                samples=int(samples) if samples else None,
+                since=time.time() - float(since) if since else None,
+            )
+        }
         
     # Register the services with supports_response
     hass.services.async_register(
@@ -316,13 +480,88 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         supports_response=SupportsResponse.ONLY,  # This service ONLY returns responses
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "read_range",
+        handle_read_range,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "scan_registers",
+        handle_scan_registers,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "cancel_scan",
+        handle_cancel_scan,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "start_capture",
+        handle_start_capture,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "stop_capture",
+        handle_stop_capture,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        handle_profile,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_history",
+        handle_get_history,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the register map, stored scan result and last-known values of a removed entry."""
+    await get_register_store(hass, entry.entry_id).async_remove()
+    hass.data[DOMAIN]["register_stores"].pop(entry.entry_id, None)
+
+    storage_keys = [entry.entry_id]
+    if entry.data.get(CONF_HUB):
+        storage_keys = [
+            f"{entry.entry_id}_{int(device[CONF_SLAVE_ID])}"
+            for device in entry.options.get(CONF_DEVICES, [])
+        ]
+    for storage_key in storage_keys:
+        for kind in ("scan", "values"):
+            await Store(hass, 1, f"{DOMAIN}.{kind}.{storage_key}").async_remove()
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
     coordinator = hass.data[DOMAIN]["coordinators"].pop(entry.entry_id, None)
+    hass.data[DOMAIN]["entity_managers"].pop(entry.entry_id, None)
+    hub = hass.data[DOMAIN]["hubs"].pop(entry.entry_id, None)
     _LOGGER.debug("About to unload coordinator")
 
+    devices = list(hub.devices.values()) if hub else [coordinator] if coordinator else []
+    for device in devices:
+        await device.async_cancel_scan()
+        await device.async_stop_capture()
+        if device.profiler is not None:
+            device.profiler.discard(device)
+    if hub:
+        async_unschedule(hass, hub.connection_key, hub)
+        coordinator = hub
+    elif coordinator:
+        leave_poll_group(hass, coordinator)
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if not unload_ok:
         return False
@@ -331,8 +570,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if coordinator:
         client = coordinator.client
         still_used = any(
-            c.client is client
-            for c in hass.data[DOMAIN]["coordinators"].values()
+            unwrap_client(c.client) is client
+            for c in [
+                *hass.data[DOMAIN]["coordinators"].values(),
+                *hass.data[DOMAIN]["hubs"].values(),
+            ]
         )
 
         if not still_used:
@@ -0,0 +1,50 @@
+"""Running aggregates for registers published slower than they are polled."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class RunningAggregate:
+    """Min / max / mean / last of the samples in the current publish window.
+
+    Constant memory: only the running sums are kept, never the samples.
+    """
+
+    started: float
+    samples: int = 0
+    total: float = 0.0
+    minimum: float = 0.0
+    maximum: float = 0.0
+    last: float = 0.0
+
+    def add(self, value: float) -> None:
+        if self.samples == 0:
+            self.minimum = self.maximum = value
+        elif value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+        self.samples += 1
+        self.total += value
+        self.last = value
+
+    def due(self, now: float, interval: float) -> bool:
+        return self.samples > 0 and now - self.started >= interval
+
+    def snapshot(self) -> dict[str, Any]:
+        """Aggregates of the window, as exposed in entity attributes."""
+        return {
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": round(self.total / self.samples, 6) if self.samples else None,
+            "last": self.last,
+            "samples": self.samples,
+        }
+
+    def reset(self, now: float) -> None:
+        self.started = now
+        self.samples = 0
+        self.total = 0.0
@@ -0,0 +1,516 @@
+"""Bus-level coordination of the Modbus Wizard coordinators sharing a connection."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    CONF_BAUDRATE,
+    CONF_BUS_BUDGET,
+    CONF_BYTESIZE,
+    CONF_CONNECTION_TYPE,
+    CONF_PARITY,
+    CONF_STOPBITS,
+    CONNECTION_TYPE_SERIAL,
+    DEFAULT_BAUDRATE,
+    DEFAULT_BYTESIZE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    DOMAIN,
+)
+from .plan import PRIORITIES
+
+if TYPE_CHECKING:
+    from .coordinator import ModbusWizardCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# Bus cost model
+# ----------------------------------------------------------------------
+
+# Modbus RTU read request: address, function, start, count, CRC
+REQUEST_BYTES = 8
+# Read response: address, function, byte count and CRC around the data
+RESPONSE_OVERHEAD_BYTES = 5
+# Silent interval that ends every frame, in characters
+FRAME_GAP_CHARS = 3.5
+# Slave processing time assumed per transaction (seconds)
+TURNAROUND = 0.005
+# Registers are stretched to at most one read per this many cycles
+MAX_STRETCH = 60
+
+
+@dataclass(slots=True, frozen=True)
+class LineTiming:
+    """Character time of a serial line, for estimating what a read costs."""
+
+    char_time: float
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> LineTiming | None:
+        """Timing of a serial connection; None for TCP/UDP (no baud rate to budget)."""
+        if config.get(CONF_CONNECTION_TYPE) != CONNECTION_TYPE_SERIAL:
+            return None
+        bits = (
+            1
+            + int(config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE))
+            + (0 if config.get(CONF_PARITY, DEFAULT_PARITY) == "N" else 1)
+            + int(config.get(CONF_STOPBITS, DEFAULT_STOPBITS))
+        )
+        return cls(char_time=bits / int(config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)))
+
+    def block_cost(self, register_type: str, count: int) -> float:
+        """Seconds of bus time for reading one block: both frames, gaps and turnaround."""
+        data = (count + 7) // 8 if register_type in ("coil", "discrete") else 2 * count
+        chars = REQUEST_BYTES + RESPONSE_OVERHEAD_BYTES + data + 2 * FRAME_GAP_CHARS
+        return chars * self.char_time + TURNAROUND
+
+
+def cycle_costs(coordinators: list[ModbusWizardCoordinator], timing: LineTiming) -> dict[str, float]:
+    """Bus time of one poll cycle of some coordinators, per priority.
+
+    A block read for more than one register (or poll group member) is
+    counted once, at the highest priority of the registers using it.
+    """
+    blocks: dict[tuple[int, str, int, int], int] = {}
+    for coordinator in coordinators:
+        for planned in coordinator.plan:
+            key = (coordinator.slave_id, planned.register_type, planned.address, planned.count)
+            rank = PRIORITIES.index(planned.priority)
+            blocks[key] = min(rank, blocks.get(key, rank))
+
+    costs = dict.fromkeys(PRIORITIES, 0.0)
+    for (_, register_type, _, count), rank in blocks.items():
+        costs[PRIORITIES[rank]] += timing.block_cost(register_type, count)
+    return costs
+
+
+def _polled_rates(
+    owner: DataUpdateCoordinator, interval: float
+) -> list[tuple[list[ModbusWizardCoordinator], float]]:
+    """Coordinators a bus slot polls, by the interval (seconds) they are polled at.
+
+    Blocks shared by poll group members of different intervals are counted
+    at each of them, so the estimate errs on the high side.
+    """
+    group = getattr(owner, "poll_group", None)
+    if group is not None and group.leader is owner and len(group.members) > 1:
+        return group.rates()
+    return [(owner.polled_coordinators(), interval)]
+
+
+def compute_stretch(loads: Mapping[str, float], budget: float) -> dict[str, int]:
+    """Read-every-k-cycles factor per priority that fits ``loads`` into ``budget``.
+
+    Loads and budget are fractions of bus time. Low priority is stretched
+    first; a class is only stretched once all lower ones are at MAX_STRETCH.
+    """
+    stretch = dict.fromkeys(PRIORITIES, 1)
+    if sum(loads.values()) <= budget:
+        return stretch
+
+    for priority in reversed(PRIORITIES):
+        load = loads.get(priority, 0.0)
+        if not load:
+            continue
+        rest = sum(loads.get(p, 0.0) / stretch[p] for p in PRIORITIES if p != priority)
+        room = budget - rest
+        if room > 0 and load / room <= MAX_STRETCH:
+            stretch[priority] = max(1, math.ceil(load / room))
+            return stretch
+        stretch[priority] = MAX_STRETCH
+    return stretch
+
+
+def fair_shares(loads: Mapping[Any, float], budget: float) -> dict[Any, float]:
+    """Split ``budget`` over slots by max-min fairness.
+
+    Slots needing less than an equal share keep what they need; the rest of
+    the budget is divided equally among the others. So only the slots over
+    their share are stretched, and never below an equal share.
+    """
+    shares = {}
+    remaining = budget
+    pending = sorted(loads, key=loads.get)
+    while pending:
+        share = remaining / len(pending)
+        slot = pending[0]
+        if loads[slot] > share:
+            shares.update(dict.fromkeys(pending, share))
+            break
+        shares[slot] = loads[slot]
+        remaining -= loads[slot]
+        pending.pop(0)
+    return shares
+
+
+# ----------------------------------------------------------------------
+# Phase-staggered schedule per connection
+# ----------------------------------------------------------------------
+
+@dataclass(slots=True)
+class _Timer:
+    interval: float
+    phase: float = 0.0
+    next_run: float = 0.0
+    handle: asyncio.TimerHandle | None = None
+    task: asyncio.Task | None = None
+    runs: int = 0
+    skipped: int = 0
+    first_run: float = 0.0
+    last_run: float = 0.0
+
+
+class BusSchedule:
+    """Poll timers of all coordinators sharing one connection.
+
+    Instead of each coordinator's own timer (which HA fires on whole-second
+    boundaries, so every device on a line polls in the same burst), the
+    schedule gives each of them a phase offset that spreads their cycles
+    evenly across the interval. Slots are kept on a fixed grid, so slow
+    cycles do not drift, and a slot whose previous cycle is still running
+    is skipped rather than queued. Offsets are recomputed whenever a
+    coordinator is added, removed or changes its interval.
+
+    On a serial line the schedule also enforces the connection's bus budget
+    (maximum occupancy, the lowest one set by its entries). The bus time of
+    every cycle is estimated from frame sizes and the baud rate; when the
+    total exceeds the budget, each slot gets a fair share of it and the
+    slots over their share read registers only every k-th cycle, low
+    priority first.
+    """
+
+    def __init__(self, hass: HomeAssistant, connection_key: str) -> None:
+        self.hass = hass
+        self.connection_key = connection_key
+        self._epoch = hass.loop.time()
+        self._timers: dict[DataUpdateCoordinator, _Timer] = {}
+        self.budget: float | None = None
+        self.occupancy: float | None = None
+        # Stretch factors of the slots over their share, by entry id
+        self.stretch: dict[str, dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    @callback
+    def set(self, coordinator: DataUpdateCoordinator, interval: timedelta | None) -> None:
+        """Poll a coordinator every ``interval`` (None stops polling it)."""
+        if interval is None:
+            self.remove(coordinator)
+            return
+        # The schedule replaces the coordinator's own timer
+        coordinator.update_interval = None
+        timer = self._timers.get(coordinator)
+        if timer is None:
+            self._timers[coordinator] = _Timer(interval.total_seconds())
+        elif timer.interval == interval.total_seconds():
+            # Same slot; the plans behind it may have changed
+            self.apply_budget()
+            return
+        else:
+            timer.interval = interval.total_seconds()
+        self.rebalance()
+
+    @callback
+    def remove(self, coordinator: DataUpdateCoordinator) -> None:
+        timer = self._timers.pop(coordinator, None)
+        if timer is None:
+            return
+        if timer.handle is not None:
+            timer.handle.cancel()
+        self.rebalance()
+
+    def interval(self, coordinator: DataUpdateCoordinator) -> timedelta | None:
+        timer = self._timers.get(coordinator)
+        return timedelta(seconds=timer.interval) if timer is not None else None
+
+    @callback
+    def rebalance(self) -> None:
+        """Spread the coordinators' slots evenly over their intervals."""
+        now = self.hass.loop.time()
+        count = len(self._timers)
+        ordered = sorted(self._timers.items(), key=lambda item: item[1].interval)
+        for index, (coordinator, timer) in enumerate(ordered):
+            timer.phase = timer.interval * index / count
+            if timer.handle is not None:
+                timer.handle.cancel()
+            timer.next_run = self._next_slot(timer, now)
+            timer.handle = self.hass.loop.call_at(timer.next_run, self._fire, coordinator)
+        if count > 1:
+            _LOGGER.debug(
+                "Staggered %d poll schedule(s) on %s: %s",
+                count,
+                self.connection_key,
+                ", ".join(f"{t.phase:.2f}s/{t.interval:g}s" for _, t in ordered),
+            )
+        self.apply_budget()
+
+    @callback
+    def apply_budget(self) -> None:
+        """Re-estimate the bus occupancy and stretch registers to fit the budget."""
+        if not self._timers:
+            return
+        owners = list(self._timers)
+        timing = LineTiming.from_config(owners[0].my_config_entry.data)
+        budgets = [o.my_config_entry.options.get(CONF_BUS_BUDGET) for o in owners]
+        budgets = [int(b) for b in budgets if b]
+        self.budget = min(budgets) / 100 if budgets else None
+
+        stretches: dict[DataUpdateCoordinator, dict[str, int]] = {}
+        if timing is None:
+            self.occupancy = None
+        else:
+            # A poll group leader's slot carries the load of the whole group,
+            # each member at its own interval
+            loads = {}
+            for owner, timer in self._timers.items():
+                load = dict.fromkeys(PRIORITIES, 0.0)
+                for coordinators, interval in _polled_rates(owner, timer.interval):
+                    for priority, cost in cycle_costs(coordinators, timing).items():
+                        load[priority] += cost / interval
+                loads[owner] = load
+            totals = {owner: sum(load.values()) for owner, load in loads.items()}
+            self.occupancy = sum(totals.values())
+            if self.budget is not None and self.occupancy > self.budget:
+                for owner, share in fair_shares(totals, self.budget).items():
+                    stretch = compute_stretch(loads[owner], share)
+                    if any(k > 1 for k in stretch.values()):
+                        stretches[owner] = stretch
+
+        stretch_by_entry = {owner.my_config_entry.entry_id: stretch for owner, stretch in stretches.items()}
+        if stretch_by_entry != self.stretch:
+            if stretches:
+                _LOGGER.warning(
+                    "Bus %s needs an estimated %.0f%% of its time, budget is %.0f%%; "
+                    "reading registers every %s cycles (by priority)",
+                    self.connection_key,
+                    self.occupancy * 100,
+                    self.budget * 100,
+                    ", ".join(
+                        f"{owner.my_config_entry.title}: " + "/".join(f"{p} {k}" for p, k in stretch.items())
+                        for owner, stretch in stretches.items()
+                    ),
+                )
+            else:
+                _LOGGER.info("Bus %s is within its budget again", self.connection_key)
+        self.stretch = stretch_by_entry
+        for owner in owners:
+            stretch = stretches.get(owner, {})
+            for coordinator in owner.polled_coordinators():
+                coordinator.stretch = stretch
+
+    def _next_slot(self, timer: _Timer, now: float) -> float:
+        """First slot of the timer's grid after ``now``."""
+        cycles = int((now - self._epoch - timer.phase) // timer.interval) + 1
+        return self._epoch + timer.phase + cycles * timer.interval
+
+    @callback
+    def _fire(self, coordinator: DataUpdateCoordinator) -> None:
+        timer = self._timers.get(coordinator)
+        if timer is None or self.hass.is_stopping:
+            return
+
+        if timer.task is None or timer.task.done():
+            now = self.hass.loop.time()
+            if not timer.runs:
+                timer.first_run = now
+            timer.last_run = now
+            timer.runs += 1
+            timer.task = self.hass.async_create_background_task(
+                coordinator.async_refresh(), name=f"{DOMAIN} poll {self.connection_key}"
+            )
+        else:
+            # The previous cycle overran its interval; don't queue another
+            timer.skipped += 1
+            _LOGGER.debug("Poll of %s still running, skipping slot", coordinator.my_config_entry.title)
+
+        timer.next_run = self._next_slot(timer, self.hass.loop.time())
+        timer.handle = self.hass.loop.call_at(timer.next_run, self._fire, coordinator)
+
+    def describe(self) -> dict[str, Any]:
+        """Budget, estimated occupancy and achieved rates of the slots, for diagnostics."""
+        slots = []
+        for coordinator, timer in self._timers.items():
+            achieved = (timer.last_run - timer.first_run) / (timer.runs - 1) if timer.runs > 1 else None
+            slots.append({
+                "entry_id": coordinator.my_config_entry.entry_id,
+                "interval": timer.interval,
+                "phase": round(timer.phase, 3),
+                "runs": timer.runs,
+                "skipped": timer.skipped,
+                "achieved_interval": round(achieved, 3) if achieved is not None else None,
+            })
+        return {
+            "budget_percent": round(self.budget * 100, 1) if self.budget is not None else None,
+            "estimated_occupancy_percent": round(self.occupancy * 100, 1) if self.occupancy is not None else None,
+            "stretch": self.stretch or None,
+            "slots": slots,
+        }
+
+
+def get_bus_schedule(hass: HomeAssistant, connection_key: str) -> BusSchedule:
+    """Return the poll schedule of a connection, creating it on first use."""
+    schedules = hass.data.setdefault(DOMAIN, {}).setdefault("bus_schedules", {})
+    if connection_key not in schedules:
+        schedules[connection_key] = BusSchedule(hass, connection_key)
+    return schedules[connection_key]
+
+
+@callback
+def async_unschedule(hass: HomeAssistant, connection_key: str, coordinator: DataUpdateCoordinator) -> None:
+    """Stop polling a coordinator; drop the schedule once it is empty."""
+    schedules = hass.data.get(DOMAIN, {}).get("bus_schedules", {})
+    schedule = schedules.get(connection_key)
+    if schedule is None:
+        return
+    schedule.remove(coordinator)
+    if not len(schedule):
+        schedules.pop(connection_key, None)
+
+
+# ----------------------------------------------------------------------
+# Entries sharing a slave
+# ----------------------------------------------------------------------
+
+# A poll group member may be polled this fraction of the group cycle early
+DUE_TOLERANCE = 0.1
+
+
+class PollGroup:
+    """Coordinators of different entries polling the same slave on one connection.
+
+    The first member leads: it is the only one on the bus schedule, at the
+    shortest interval of all members. Each member keeps its own interval as
+    a due time; the leader's cycle polls only the members that are due, and
+    their overlapping or adjacent blocks are merged into spans that are read
+    once per cycle (see SharedReads), so overlapping register maps cost no
+    extra requests and slower members are not polled at the leader's rate.
+    """
+
+    def __init__(self, hass: HomeAssistant, connection_key: str, slave_id: int) -> None:
+        self.hass = hass
+        self.connection_key = connection_key
+        self.slave_id = slave_id
+        self.members: list[ModbusWizardCoordinator] = []
+        # Loop time each member is due for its next poll
+        self._next_due: dict[ModbusWizardCoordinator, float] = {}
+
+    @property
+    def leader(self) -> ModbusWizardCoordinator:
+        return self.members[0]
+
+    @property
+    def cycle(self) -> float | None:
+        """Seconds between the leader's polls: the shortest member interval."""
+        intervals = [m.poll_interval.total_seconds() for m in self.members if m.poll_interval is not None]
+        return min(intervals) if intervals else None
+
+    def due_members(self, now: float) -> list[ModbusWizardCoordinator]:
+        """Members to poll in the leader's cycle at ``now``; advances their due times.
+
+        A member is due once its own interval has passed since its previous
+        due time (a little early is fine, to absorb timer jitter). So it is
+        polled at its configured rate on average, and at most one group cycle
+        late when its interval is not a multiple of the group's.
+        """
+        cycle = self.cycle
+        slack = cycle * DUE_TOLERANCE if cycle else 0.0
+        due = []
+        for member in self.members:
+            interval = member.poll_interval
+            next_due = self._next_due.get(member, now if interval is not None else math.inf)
+            if next_due > now + slack:
+                continue
+            due.append(member)
+            if interval is None:
+                # Only polled on request
+                self._next_due.pop(member, None)
+                continue
+            next_due += interval.total_seconds()
+            # After a stall, don't catch up on the missed polls
+            self._next_due[member] = next_due if next_due > now else now + interval.total_seconds()
+        return due
+
+    def rates(self) -> list[tuple[list[ModbusWizardCoordinator], float]]:
+        """Members grouped by the interval (seconds) they are polled at."""
+        by_interval: dict[float, list[ModbusWizardCoordinator]] = {}
+        for member in self.members:
+            if member.poll_interval is not None:
+                by_interval.setdefault(member.poll_interval.total_seconds(), []).append(member)
+        return [(members, interval) for interval, members in by_interval.items()]
+
+    async def async_request_refresh(self, member: ModbusWizardCoordinator) -> None:
+        """Make ``member`` due at once and request a (debounced) refresh of the leader."""
+        self._next_due[member] = -math.inf
+        await DataUpdateCoordinator.async_request_refresh(self.leader)
+
+    def add(self, coordinator: ModbusWizardCoordinator) -> None:
+        coordinator.poll_group = self
+        self.members.append(coordinator)
+        self.rebalance()
+
+    def remove(self, coordinator: ModbusWizardCoordinator) -> None:
+        coordinator.poll_group = None
+        self.members.remove(coordinator)
+        self._next_due.pop(coordinator, None)
+        async_unschedule(self.hass, self.connection_key, coordinator)
+        # Back on its own timer, should it stay loaded
+        coordinator.update_interval = coordinator.poll_interval
+        self.rebalance()
+
+    def rebalance(self) -> None:
+        """Schedule the leader at the shortest member interval, unschedule the others."""
+        if not self.members:
+            return
+        schedule = get_bus_schedule(self.hass, self.connection_key)
+        intervals = [m.poll_interval for m in self.members if m.poll_interval is not None]
+        for member in self.members[1:]:
+            # Followers are polled by the leader: no slot and no timer of their own
+            schedule.remove(member)
+            member.update_interval = None
+        schedule.set(self.leader, min(intervals) if intervals else None)
+        if len(self.members) > 1:
+            _LOGGER.debug(
+                "Slave %s on %s: %d entries share one poll schedule every %s",
+                self.slave_id,
+                self.connection_key,
+                len(self.members),
+                schedule.interval(self.leader),
+            )
+
+
+def get_poll_groups(hass: HomeAssistant) -> dict[tuple[str, int], PollGroup]:
+    """Poll groups by (connection key, slave id)."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault("poll_groups", {})
+
+
+def join_poll_group(hass: HomeAssistant, coordinator: ModbusWizardCoordinator) -> PollGroup:
+    """Add a coordinator to the group of its (connection, slave), creating it if needed."""
+    key = (coordinator.connection_key, coordinator.slave_id)
+    groups = get_poll_groups(hass)
+    group = groups.get(key)
+    if group is None:
+        group = groups[key] = PollGroup(hass, *key)
+    group.add(coordinator)
+    return group
+
+
+def leave_poll_group(hass: HomeAssistant, coordinator: ModbusWizardCoordinator) -> None:
+    group = coordinator.poll_group
+    if group is None:
+        return
+    group.remove(coordinator)
+    if not group.members:
+        get_poll_groups(hass).pop((group.connection_key, group.slave_id), None)
@@ -0,0 +1,387 @@
+"""Bus traffic capture and deterministic replay for Modbus Wizard.
+
+A capture file is an append-only sequence of binary records, one per
+request, after an 8-byte magic header:
+
+    <d  timestamp (epoch seconds)
+    <f  duration of the request (seconds)
+    B   status (0 = ok, 1 = Modbus exception reply, 2 = no reply / error)
+    B   function code
+    B   device id
+    B   exception code
+    <H  address
+    <H  count
+    <H  number of payload values
+
+followed by the payload: big-endian 16-bit registers, or bits packed
+LSB-first. For reads the payload is the reply, for writes the values sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"MBWCAP1\n"
+RECORD = struct.Struct("<dfBBBBHHH")
+
+STATUS_OK = 0
+STATUS_EXCEPTION = 1
+STATUS_FAILED = 2
+
+# Captured client methods: name -> (function code, payload is bits, is write)
+CAPTURED_METHODS = {
+    "read_coils": (1, True, False),
+    "read_discrete_inputs": (2, True, False),
+    "read_holding_registers": (3, False, False),
+    "read_input_registers": (4, False, False),
+    "write_coil": (5, True, True),
+    "write_register": (6, False, True),
+    "write_coils": (15, True, True),
+    "write_registers": (16, False, True),
+    # Payload is the read-back; the values written are not recorded
+    "readwrite_registers": (23, False, False),
+    # Payload is [and_mask, or_mask]
+    "mask_write_register": (22, False, True),
+}
+BIT_FUNCTIONS = {fc for fc, bits, _ in CAPTURED_METHODS.values() if bits}
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+# Buffered records are written out when this large or this old
+FLUSH_BYTES = 32 * 1024
+FLUSH_INTERVAL = 10
+
+
+# ----------------------------------------------------------------------
+# Record encoding
+# ----------------------------------------------------------------------
+
+def request_info(name: str, write: bool, args: tuple, kwargs: dict) -> tuple[int, int, list | None]:
+    """(address, count, values sent) of a captured client method call."""
+    if name == "readwrite_registers":
+        return kwargs.get("read_address", 0), kwargs.get("read_count", 0), None
+    if name == "mask_write_register":
+        return kwargs.get("address", 0), 1, [kwargs.get("and_mask", 0xFFFF), kwargs.get("or_mask", 0)]
+    address = args[0] if args else kwargs["address"]
+    if write:
+        sent = args[1] if len(args) > 1 else kwargs.get("values", kwargs.get("value"))
+        sent = list(sent) if isinstance(sent, (list, tuple)) else [sent]
+        return address, len(sent), sent
+    return address, kwargs.get("count", 1), None
+
+
+@dataclass(slots=True, frozen=True)
+class CaptureRecord:
+    """One captured request/response."""
+
+    timestamp: float
+    duration: float
+    status: int
+    function_code: int
+    device_id: int
+    exception_code: int
+    address: int
+    count: int
+    values: tuple[int, ...]
+
+
+def encode_record(
+    timestamp: float,
+    duration: float,
+    status: int,
+    function_code: int,
+    device_id: int,
+    exception_code: int,
+    address: int,
+    count: int,
+    values,
+) -> bytes:
+    values = [int(v) for v in values]
+    header = RECORD.pack(
+        timestamp, duration, status, function_code, device_id & 0xFF,
+        exception_code & 0xFF, address, count, len(values),
+    )
+    if function_code in BIT_FUNCTIONS:
+        packed = bytearray((len(values) + 7) // 8)
+        for i, bit in enumerate(values):
+            if bit:
+                packed[i // 8] |= 1 << (i % 8)
+        return header + bytes(packed)
+    return header + struct.pack(f">{len(values)}H", *values)
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """Blocking: yield the records of one capture file, oldest first."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Modbus Wizard capture")
+
+    offset = len(MAGIC)
+    while offset + RECORD.size <= len(data):
+        timestamp, duration, status, fc, device_id, exc, address, count, n = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if fc in BIT_FUNCTIONS:
+            size = (n + 7) // 8
+            raw = data[offset : offset + size]
+            values = tuple((raw[i // 8] >> (i % 8)) & 1 for i in range(n)) if len(raw) == size else None
+        else:
+            size = 2 * n
+            raw = data[offset : offset + size]
+            values = struct.unpack(f">{n}H", raw) if len(raw) == size else None
+        if values is None:
+            _LOGGER.debug("Truncated record at end of %s", path)
+            return
+        offset += size
+        yield CaptureRecord(timestamp, duration, status, fc, device_id, exc, address, count, values)
+
+
+def capture_files(path: str) -> list[str]:
+    """A capture and its rotated backups, oldest first."""
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.insert(0, f"{path}.{index}")
+        index += 1
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+# ----------------------------------------------------------------------
+# Capture
+# ----------------------------------------------------------------------
+
+class CaptureWriter:
+    """Buffers encoded records and appends them to a size-bounded file.
+
+    Records are collected in memory on the event loop and written out in the
+    executor; the file is rotated to ``path.1`` .. ``path.N`` at max_bytes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> None:
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.records = 0
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+        self._flush_task: asyncio.Future | None = None
+
+    def record(self, *fields) -> None:
+        self._buffer += encode_record(*fields)
+        self.records += 1
+        if len(self._buffer) >= FLUSH_BYTES or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+        self._flush_task = self.hass.async_add_executor_job(self._write, data)
+
+    async def async_close(self) -> None:
+        """Write out everything still buffered."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._buffer:
+            self._schedule_flush()
+            await self._flush_task
+
+    def _write(self, data: bytes) -> None:
+        """Blocking: append to the capture file, rotating it when full."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as f:
+                if f.tell() == 0:
+                    f.write(MAGIC)
+                f.write(data)
+                size = f.tell()
+            if size >= self.max_bytes:
+                self._rotate()
+        except OSError as err:
+            _LOGGER.error("Failed to write capture %s: %s", self.path, err)
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class CapturingClient:
+    """Client wrapper that records every request it forwards.
+
+    Only installed while a capture runs, so the normal poll path has no
+    capture overhead at all. Everything that is not a captured request
+    method (connect, connected, DATATYPE, ...) is delegated unchanged.
+    """
+
+    def __init__(self, client, writer: CaptureWriter) -> None:
+        self.wrapped = client
+        self.writer = writer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+
+def _captured(name: str, function_code: int, bits: bool, write: bool):
+    async def method(self: CapturingClient, *args, **kwargs):
+        device_id = kwargs.get("device_id", 1)
+        address, count, sent = request_info(name, write, args, kwargs)
+
+        started = time.time()
+        try:
+            result = await getattr(self.wrapped, name)(*args, **kwargs)
+        except BaseException:
+            self.writer.record(started, time.time() - started, STATUS_FAILED, function_code, device_id, 0, address, count, ())
+            raise
+
+        duration = time.time() - started
+        if result.isError():
+            exception_code = getattr(result, "exception_code", 0) or 0
+            self.writer.record(started, duration, STATUS_EXCEPTION, function_code, device_id, exception_code, address, count, ())
+        elif write:
+            self.writer.record(started, duration, STATUS_OK, function_code, device_id, 0, address, count, sent)
+        else:
+            values = result.bits[:count] if bits else result.registers
+            self.writer.record(started, duration, STATUS_OK, function_code, device_id, 0, address, count, values)
+        return result
+
+    method.__name__ = name
+    return method
+
+
+for _name, (_fc, _bits, _write) in CAPTURED_METHODS.items():
+    setattr(CapturingClient, _name, _captured(_name, _fc, _bits, _write))
+
+
+def unwrap_client(client):
+    """Return the real client behind a capture wrapper."""
+    return client.wrapped if isinstance(client, CapturingClient) else client
+
+
+# ----------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------
+
+@dataclass(slots=True)
+class ReplayResponse:
+    """Minimal stand-in for a pymodbus response."""
+
+    registers: list[int]
+    bits: list[bool]
+    exception_code: int = 0
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+
+class ReplayClient:
+    """Fake client that answers requests from capture records.
+
+    Replies are served per (function code, device, address, count) in the
+    order they were captured and wrap around when exhausted, so the same
+    capture always drives the coordinator through the same sequence.
+    Requests never seen in the capture get an ILLEGAL DATA ADDRESS reply.
+    With ``pace`` each reply is delayed by its recorded duration.
+    """
+
+    def __init__(self, records: list[CaptureRecord], pace: bool = False) -> None:
+        self.pace = pace
+        self.connected = False
+        self._replies: dict[tuple[int, int, int, int], list[CaptureRecord]] = defaultdict(list)
+        self._positions: dict[tuple[int, int, int, int], int] = {}
+        self.unmatched: deque[tuple[int, int, int, int]] = deque(maxlen=100)
+        for rec in records:
+            self._replies[(rec.function_code, rec.device_id, rec.address, rec.count)].append(rec)
+
+    @classmethod
+    def from_file(cls, path: str, pace: bool = False) -> ReplayClient:
+        """Blocking: load a capture including its rotated backups."""
+        records = [rec for file in capture_files(path) for rec in read_capture(file)]
+        return cls(records, pace=pace)
+
+    async def connect(self) -> bool:
+        self.connected = True
+        return True
+
+    def close(self) -> None:
+        self.connected = False
+
+    @property
+    def DATATYPE(self):
+        from pymodbus.client.mixin import ModbusClientMixin
+
+        return ModbusClientMixin.DATATYPE
+
+    def convert_from_registers(self, *args, **kwargs):
+        from pymodbus.client.mixin import ModbusClientMixin
+
+        return ModbusClientMixin.convert_from_registers(*args, **kwargs)
+
+    def convert_to_registers(self, *args, **kwargs):
+        from pymodbus.client.mixin import ModbusClientMixin
+
+        return ModbusClientMixin.convert_to_registers(*args, **kwargs)
+
+    async def _reply(self, function_code: int, address: int, count: int, device_id: int) -> ReplayResponse:
+        key = (function_code, device_id & 0xFF, address, count)
+        replies = self._replies.get(key)
+        if not replies:
+            self.unmatched.append(key)
+            return ReplayResponse([], [], exception_code=2)
+
+        position = self._positions.get(key, 0)
+        self._positions[key] = (position + 1) % len(replies)
+        rec = replies[position]
+
+        if self.pace and rec.duration > 0:
+            await asyncio.sleep(rec.duration)
+        if rec.status == STATUS_FAILED:
+            from pymodbus.exceptions import ModbusIOException
+
+            raise ModbusIOException("replayed failure")
+        if rec.status == STATUS_EXCEPTION:
+            return ReplayResponse([], [], exception_code=rec.exception_code or 4)
+        if function_code in BIT_FUNCTIONS:
+            return ReplayResponse([], [bool(v) for v in rec.values])
+        return ReplayResponse(list(rec.values), [])
+
+
+def _replayed(name: str, function_code: int, write: bool):
+    async def method(self: ReplayClient, *args, **kwargs):
+        address, count, _ = request_info(name, write, args, kwargs)
+        return await self._reply(function_code, address, count, kwargs.get("device_id", 1))
+
+    return method
+
+
+for _name, (_fc, _bits, _write) in CAPTURED_METHODS.items():
+    setattr(ReplayClient, _name, _replayed(_name, _fc, _write))
@@ -1,8 +1,8 @@
 """Config flow for Modbus Wizard."""
+import asyncio
 import logging
 from typing import Any
 #from datetime import timedelta
-import serial.tools.list_ports
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -10,10 +10,15 @@ from homeassistant.helpers import selector
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
-from .options_flow import ModbusWizardOptionsFlow
-from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient, AsyncModbusUdpClient
-from pymodbus.framer import FramerType
-from pymodbus.exceptions import ModbusException
+from .options_flow import ModbusWizardHubOptionsFlow, ModbusWizardOptionsFlow
+from .connection import connection_key, create_client, get_detect_cache, get_shared_client
+from .serial_ports import get_port_cache
+from .discovery import (
+    DISCOVERY_CONCURRENCY_IP,
+    DISCOVERY_TIMEOUT_IP,
+    DISCOVERY_TIMEOUT_SERIAL,
+    async_discover_slaves,
+)
 
 from .const import (
     CONNECTION_TYPE_SERIAL,
@@ -21,6 +26,8 @@ from .const import (
     CONNECTION_TYPE_TCP,
     CONNECTION_TYPE_UDP,
     CONF_CONNECTION_TYPE,
+    CONF_DISCOVER,
+    CONF_HUB,
     CONF_PROTOCOL,
     CONF_HOST,
     CONF_PORT,
@@ -45,19 +52,28 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Connection test: short per-attempt timeouts so a bad port fails fast
+TEST_TIMEOUT = 1.5
+TEST_CONNECT_TIMEOUT = 3
+
 class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle config flow for Modbus Wizard."""
 
-    VERSION = 1
+    # 2: register maps moved from the entry options to their own Store
+    VERSION = 2
 
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._data: dict[str, Any] = {}
+        self._discover_task: asyncio.Task | None = None
+        self._discovered: dict[int, list[str]] = {}
 
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry):
         """Get the options flow for this handler."""
+        if config_entry.data.get(CONF_HUB):
+            return ModbusWizardHubOptionsFlow(config_entry)
         return ModbusWizardOptionsFlow(config_entry)
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
@@ -112,6 +128,10 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         vol.Coerce(int),
                         vol.Range(min=5, max=300),  # 5 seconds to 5 minutes
                     ),
+                    vol.Optional(CONF_DISCOVER, default=False): bool,
+                    # Hub: many slaves on this connection, each from a template;
+                    # the slave ID above is only used for the connection test
+                    vol.Optional(CONF_HUB, default=False): bool,
                 }
             ),
         )
@@ -120,16 +140,23 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Serial-specific settings."""
         errors = {}
 
-        ports = await self.hass.async_add_executor_job(serial.tools.list_ports.comports)
+        ports = await get_port_cache(self.hass).async_get_ports()
+
+        # Ports already used by Wizard entries (they share the connection)
+        in_use: dict[str, list[str]] = {}
+        for entry in self._async_current_entries(include_ignore=False):
+            if entry.data.get(CONF_SERIAL_PORT):
+                in_use.setdefault(entry.data[CONF_SERIAL_PORT], []).append(entry.title)
+
         port_options = [
             selector.SelectOptionDict(
-                value=port.device,
-                label=f"{port.device} - {port.description or 'Unknown'}"
-                      + (f" ({port.manufacturer})" if port.manufacturer else ""),
+                value=port["device"],
+                label=f"{port['device']} - {port['description'] or 'Unknown'}"
+                      + (f" ({port['manufacturer']})" if port["manufacturer"] else "")
+                      + (f" [in use by {', '.join(in_use[port['device']])}]" if port["device"] in in_use else ""),
             )
             for port in ports
         ]
-        port_options.sort(key=lambda opt: opt["value"])
 
         if user_input is not None:
             try:
@@ -142,6 +169,10 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_BYTESIZE: user_input[CONF_BYTESIZE],
                 }
 
+                if final_data.get(CONF_DISCOVER):
+                    self._data = final_data
+                    return await self.async_step_discover()
+
                 await self._async_test_connection(final_data)
 
                 return self.async_create_entry(title=final_data[CONF_NAME], data=final_data)
@@ -180,6 +211,10 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_PROTOCOL: user_input[CONF_PROTOCOL],
                 }
 
+                if final_data.get(CONF_DISCOVER):
+                    self._data = final_data
+                    return await self.async_step_discover()
+
                 await self._async_test_connection(final_data)
 
                 return self.async_create_entry(title=final_data[CONF_NAME], data=final_data)
@@ -212,35 +247,144 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    # ------------------------------------------------------------------
+    # Slave-ID discovery
+    # ------------------------------------------------------------------
+
+    async def async_step_discover(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Scan the bus for responsive slave IDs (progress step)."""
+        if self._discover_task is None:
+            self._discover_task = self.hass.async_create_task(self._async_discover())
+
+        if not self._discover_task.done():
+            return self.async_show_progress(
+                step_id="discover",
+                progress_action="discover",
+                progress_task=self._discover_task,
+            )
+
+        try:
+            self._discovered = self._discover_task.result()
+        except Exception as err:
+            _LOGGER.error("Slave discovery failed: %s", err)
+            self._discovered = {}
+        finally:
+            self._discover_task = None
+
+        return self.async_show_progress_done(next_step_id="discovered")
+
+    async def async_step_discovered(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Pick one of the discovered slave IDs."""
+        errors = {}
+
+        if not self._discovered:
+            return self.async_abort(reason="no_slaves_found")
+
+        if user_input is not None:
+            final_data = {**self._data, CONF_SLAVE_ID: int(user_input[CONF_SLAVE_ID])}
+            final_data.pop(CONF_DISCOVER, None)
+            try:
+                await self._async_test_connection(final_data)
+                return self.async_create_entry(title=final_data[CONF_NAME], data=final_data)
+            except Exception as err:
+                _LOGGER.error("Connection test for discovered slave failed: %s", err)
+                errors["base"] = "cannot_connect"
+
+        options = [
+            selector.SelectOptionDict(
+                value=str(slave_id),
+                label=f"ID {slave_id} — " + (", ".join(types) if types else "responds (no data at test address)"),
+            )
+            for slave_id, types in self._discovered.items()
+        ]
+
+        return self.async_show_form(
+            step_id="discovered",
+            data_schema=vol.Schema({
+                vol.Required(CONF_SLAVE_ID, default=options[0]["value"]): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=options, mode=selector.SelectSelectorMode.LIST)
+                ),
+            }),
+            description_placeholders={"count": str(len(self._discovered))},
+            errors=errors,
+        )
+
+    async def _async_discover(self) -> dict[int, list[str]]:
+        """Open probe connection(s) and scan slave IDs 1-247."""
+        data = self._data
+        if data[CONF_CONNECTION_TYPE] == CONNECTION_TYPE_SERIAL:
+            timeout, count = DISCOVERY_TIMEOUT_SERIAL, 1
+        else:
+            timeout, count = DISCOVERY_TIMEOUT_IP, DISCOVERY_CONCURRENCY_IP
+
+        shared = get_shared_client(self.hass, data)
+        if shared is not None and shared.connected:
+            # Probe timeouts are enforced per request, the shared client stays open
+            return await async_discover_slaves(
+                [shared],
+                address=int(data.get(CONF_FIRST_REG, 0)),
+                timeout=timeout,
+                progress_callback=self.async_update_progress,
+            )
+
+        clients = []
+        try:
+            for _ in range(count):
+                client = self._create_client(data, timeout=timeout, retries=0)
+                await client.connect()
+                if client.connected:
+                    clients.append(client)
+                else:
+                    client.close()
+            if not clients:
+                raise ConnectionError("Failed to connect to Modbus device")
+
+            return await async_discover_slaves(
+                clients,
+                address=int(data.get(CONF_FIRST_REG, 0)),
+                timeout=timeout,
+                progress_callback=self.async_update_progress,
+            )
+        finally:
+            for client in clients:
+                try:
+                    client.close()
+                except Exception as err:
+                    _LOGGER.debug("Error closing Modbus client: %s", err)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _create_client(data: dict[str, Any], timeout: float = 5, **kwargs):
+        """Create an (unconnected) client for the given connection data."""
+        if data[CONF_CONNECTION_TYPE] != CONNECTION_TYPE_SERIAL:
+            from pymodbus.framer import FramerType
+
+            kwargs.setdefault("framer", FramerType.RTU)  # future extensions, give options for framer
+        return create_client(data, timeout=timeout, **kwargs)
+
     async def _async_test_connection(self, data: dict[str, Any]) -> None:
-        """Test connection and try reading the first register with all register types."""
-        client = None
+        """Test connection and try reading the first register with all register types.
+
+        An already open Wizard connection with the same key is reused instead of
+        opening a second handle on the port. The four function codes are probed
+        one after another: a client handles one request at a time anyway, and
+        each probe is limited by the client's own (short) timeout rather than
+        cancelled mid-request. The answering register type seeds the
+        auto-detect cache.
+        """
+        from pymodbus.exceptions import ModbusException
+
+        shared = get_shared_client(self.hass, data)
+        client = shared
         try:
-            if data[CONF_CONNECTION_TYPE] == CONNECTION_TYPE_SERIAL:
-                client = AsyncModbusSerialClient(
-                    port=data[CONF_SERIAL_PORT],
-                    baudrate=data[CONF_BAUDRATE],
-                    parity=data.get(CONF_PARITY, DEFAULT_PARITY),
-                    stopbits=data.get(CONF_STOPBITS, DEFAULT_STOPBITS),
-                    bytesize=data.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
-                    timeout=5,
-                )
-            elif data[CONF_CONNECTION_TYPE] == CONNECTION_TYPE_IP and data[CONF_PROTOCOL] == CONNECTION_TYPE_UDP:
-                client = AsyncModbusUdpClient(
-                    host=data[CONF_HOST],
-                    port=data[CONF_PORT],
-                    framer=FramerType.RTU, # future extensions, give options for framer
-                    timeout=5,
-                )
-            else:
-                client = AsyncModbusTcpClient(
-                    host=data[CONF_HOST],
-                    port=data[CONF_PORT],
-                    framer=FramerType.RTU,
-                    timeout=5,
-                )
+            if client is None:
+                client = self._create_client(data, timeout=TEST_TIMEOUT, retries=0)
 
-            await client.connect()
+            if not client.connected:
+                await asyncio.wait_for(client.connect(), TEST_CONNECT_TIMEOUT)
             if not client.connected:
                 raise ConnectionError("Failed to connect to Modbus device")
 
@@ -249,36 +393,40 @@ class ModbusWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             slave_id = int(data[CONF_SLAVE_ID])
 
             methods = [
-                ("holding registers", client.read_holding_registers),
-                ("input registers", client.read_input_registers),
-                ("coils", client.read_coils),
-                ("discrete inputs", client.read_discrete_inputs),
+                ("holding", client.read_holding_registers),
+                ("input", client.read_input_registers),
+                ("coil", client.read_coils),
+                ("discrete", client.read_discrete_inputs),
             ]
 
-            success = False
-            for name, method in methods:
+            async def _probe(name, method) -> bool:
                 try:
-                    if name in ("coils", "discrete inputs"):
-                        result = await method(address=address, count=count, device_id=slave_id)
-                        if not result.isError() and hasattr(result, "bits") and len(result.bits) >= count:
-                            success = True
-                            break
-                    else:
-                        result = await method(address=address, count=count, device_id=slave_id)
-                        if not result.isError() and hasattr(result, "registers") and len(result.registers) == count:
-                            success = True
-                            break
-                except Exception as inner_err:
+                    result = await method(address=address, count=count, device_id=slave_id)
+                except (ModbusException, TimeoutError, OSError) as inner_err:
                     _LOGGER.debug("Test read failed for %s at addr %d: %s", name, address, inner_err)
+                    return False
+                if result.isError():
+                    return False
+                if name in ("coil", "discrete"):
+                    return hasattr(result, "bits") and len(result.bits) >= count
+                return hasattr(result, "registers") and len(result.registers) == count
 
-            if not success:
+            detected = None
+            for name, method in methods:
+                if await _probe(name, method):
+                    detected = name
+                    break
+
+            if detected is None:
                 raise ModbusException(
                     f"Could not read {count} value(s) from address {address} using any register type. "
                     "Check address, size, slave ID, or device compatibility."
                 )
 
+            get_detect_cache(self.hass)[(connection_key(data), slave_id, address)] = detected
+
         finally:
-            if client:
+            if client is not None and client is not shared:
                 try:
                    client.close()
                 except Exception as err:
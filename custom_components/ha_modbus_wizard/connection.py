@@ -0,0 +1,112 @@
+"""Shared Modbus connection helpers for Modbus Wizard."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_BAUDRATE,
+    CONF_BYTESIZE,
+    CONF_CONNECTION_TYPE,
+    CONF_HOST,
+    CONF_PARITY,
+    CONF_PORT,
+    CONF_PROTOCOL,
+    CONF_SERIAL_PORT,
+    CONF_STOPBITS,
+    CONNECTION_TYPE_IP,
+    CONNECTION_TYPE_SERIAL,
+    CONNECTION_TYPE_TCP,
+    CONNECTION_TYPE_UDP,
+    DEFAULT_BAUDRATE,
+    DEFAULT_BYTESIZE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    DOMAIN,
+)
+
+
+def connection_key(config: Mapping[str, Any]) -> str:
+    """Key under which a connection is shared in hass.data[DOMAIN]["connections"]."""
+    connection_type = config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL)
+    protocol = config.get(CONF_PROTOCOL, CONNECTION_TYPE_TCP)
+
+    if connection_type == CONNECTION_TYPE_SERIAL:
+        return (
+            f"serial:"
+            f"{config[CONF_SERIAL_PORT]}:"
+            f"{config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)}:"
+            f"{config.get(CONF_PARITY, DEFAULT_PARITY)}:"
+            f"{config.get(CONF_STOPBITS, DEFAULT_STOPBITS)}:"
+            f"{config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE)}"
+        )
+    if connection_type == CONNECTION_TYPE_IP and protocol == CONNECTION_TYPE_UDP:
+        return f"ip_udp:{config[CONF_HOST]}:{config[CONF_PORT]}"
+    return f"ip_tcp:{config[CONF_HOST]}:{config[CONF_PORT]}"
+
+
+def create_client(config: Mapping[str, Any], timeout: float = 5, **kwargs):
+    """Create an (unconnected) client for the given connection settings.
+
+    pymodbus is imported here rather than at module load, so loading the
+    integration (or opening a config flow) does not pull in pymodbus and its
+    serial stack until an entry is actually set up.
+    """
+    connection_type = config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL)
+    protocol = config.get(CONF_PROTOCOL, CONNECTION_TYPE_TCP)
+
+    if connection_type == CONNECTION_TYPE_SERIAL:
+        from pymodbus.client.serial import AsyncModbusSerialClient
+
+        return AsyncModbusSerialClient(
+            port=config[CONF_SERIAL_PORT],
+            baudrate=config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+            parity=config.get(CONF_PARITY, DEFAULT_PARITY),
+            stopbits=config.get(CONF_STOPBITS, DEFAULT_STOPBITS),
+            bytesize=config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
+            timeout=timeout,
+            **kwargs,
+        )
+    if connection_type == CONNECTION_TYPE_IP and protocol == CONNECTION_TYPE_UDP:
+        from pymodbus.client.udp import AsyncModbusUdpClient
+
+        return AsyncModbusUdpClient(
+            host=config[CONF_HOST],
+            port=config[CONF_PORT],
+            timeout=timeout,
+            **kwargs,
+        )
+
+    from pymodbus.client.tcp import AsyncModbusTcpClient
+
+    return AsyncModbusTcpClient(
+        host=config[CONF_HOST],
+        port=config[CONF_PORT],
+        timeout=timeout,
+        **kwargs,
+    )
+
+
+def get_shared_client(hass: HomeAssistant, config: Mapping[str, Any]):
+    """Return the open client for this connection, if an entry already has one."""
+    return hass.data.get(DOMAIN, {}).get("connections", {}).get(connection_key(config))
+
+
+def get_detect_cache(hass: HomeAssistant) -> dict[tuple[str, int, int], str]:
+    """Register types found by auto-detection, keyed by (connection, slave, address).
+
+    Filled by the config-flow connection test and by polling, so an "auto"
+    register is only probed once per HA run.
+    """
+    return hass.data.setdefault(DOMAIN, {}).setdefault("detected_types", {})
+
+
+def get_function_support(hass: HomeAssistant) -> dict[tuple[str, int, int], bool]:
+    """Optional function codes found (un)supported, keyed by (connection, slave, code).
+
+    Probed on first use so e.g. FC23 is only tried once per device per HA run.
+    """
+    return hass.data.setdefault(DOMAIN, {}).setdefault("function_support", {})
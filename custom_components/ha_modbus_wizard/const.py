@@ -14,6 +14,11 @@ CONF_CONNECTION_TYPE = "connection_type"
 CONF_NAME = "name"
 CONF_FIRST_REG = "first_register"
 CONF_FIRST_REG_SIZE = "first_register_size"
+CONF_DISCOVER = "discover_slaves"
+# Hub mode: one entry per connection, many slaves
+CONF_HUB = "hub"
+CONF_DEVICES = "devices"
+CONF_TEMPLATE = "template"
 # Serial settings
 CONF_SERIAL_PORT = "serial_port"
 CONF_BAUDRATE = "baudrate"
@@ -21,6 +26,8 @@ CONF_PARITY = "parity"
 CONF_STOPBITS = "stopbits"
 CONF_BYTESIZE = "bytesize"
 CONF_UPDATE_INTERVAL = "update_interval"
+# Max bus occupancy of a connection in percent (0 = no limit)
+CONF_BUS_BUDGET = "bus_budget"
 CONF_ENTITIES = "registers"
 # TCP settings
 CONF_HOST = "host"
@@ -4,19 +4,105 @@ from __future__ import annotations
 
 import logging
 import asyncio
-from typing import Any
+import struct
+import time
+from typing import TYPE_CHECKING, Any
 from datetime import timedelta
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
-    CONF_ENTITIES, 
+    CONF_UPDATE_INTERVAL,
+    DOMAIN,
     TYPE_SIZES,
     reg_key,
 )
-from pymodbus.client.mixin import ModbusClientMixin
+from .aggregate import RunningAggregate
+from .capture import DEFAULT_BACKUPS, DEFAULT_MAX_BYTES, CaptureWriter, CapturingClient
+from .connection import get_detect_cache, get_function_support
+from .history import HistoryBuffer
+from .plan import PlannedRegister, compile_plan, plan_keys
+from .register_store import get_register_store
+from .scanner import (
+    MAX_BIT_BLOCK,
+    MAX_REGISTER_BLOCK,
+    SCAN_REGISTER_TYPES,
+    RegisterScanner,
+)
+from .values import ValueStore
+
+if TYPE_CHECKING:
+    from .bus import PollGroup
+    from .profiling import PollProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Last-known values are written at most this often (seconds)
+VALUES_SAVE_DELAY = 60
+
+FC_MASK_WRITE_REGISTER = 22
+FC_READ_WRITE_REGISTERS = 23
+ILLEGAL_FUNCTION = 1
+
+
+Block = tuple[str, int, int]  # (register type, address, count)
+
+READ_METHODS = {
+    "holding": "read_holding_registers",
+    "input": "read_input_registers",
+    "coil": "read_coils",
+    "discrete": "read_discrete_inputs",
+}
+
+
+class SharedReads:
+    """Reads of one poll group cycle, shared by the members due in it.
+
+    Planned blocks of the same register type whose addresses overlap or
+    touch are merged into spans of at most one protocol request. Each span
+    is read once and every member slices its registers out of it, so
+    overlapping register maps cost no extra requests. Registers of a not yet
+    detected "auto" type, and those of a span the device rejected, are read
+    as their own block (still once per cycle).
+    """
+
+    def __init__(self, members: list[ModbusWizardCoordinator]) -> None:
+        # planned block -> span (register type, start, count) containing it
+        self.spans: dict[Block, Block] = {}
+        # span -> words / bits, or None if the span could not be read
+        self.words: dict[Block, list | None] = {}
+        # blocks read on their own -> (resolved type, response) or None
+        self.blocks: dict[Block, tuple[str, Any] | None] = {}
+
+        by_type: dict[str, set[tuple[int, int]]] = {}
+        for member in members:
+            for planned in member.plan:
+                if not member._is_due(planned, member._cycle + 1):
+                    continue
+                reg_type = member._resolved_type(planned)
+                if reg_type != "auto":
+                    by_type.setdefault(reg_type, set()).add((planned.address, planned.count))
+
+        for reg_type, blocks in by_type.items():
+            limit = MAX_BIT_BLOCK if reg_type in ("coil", "discrete") else MAX_REGISTER_BLOCK
+            span: list[tuple[int, int]] = []
+            span_end = -1
+            for address, count in sorted(blocks):
+                end = address + count
+                if span and (address > span_end or max(end, span_end) - span[0][0] > limit):
+                    self._add_span(reg_type, span, span_end)
+                    span = []
+                span.append((address, count))
+                span_end = max(span_end, end) if len(span) > 1 else end
+            if span:
+                self._add_span(reg_type, span, span_end)
+
+    def _add_span(self, reg_type: str, blocks: list[tuple[int, int]], end: int) -> None:
+        start = blocks[0][0]
+        span = (reg_type, start, end - start)
+        for address, count in blocks:
+            self.spans[(reg_type, address, count)] = span
+
 
 class ModbusWizardCoordinator(DataUpdateCoordinator):
     """Modbus Wizard Data Update Coordinator."""
@@ -27,7 +113,10 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
         client,
         slave_id: int,
         config_entry,
-        update_interval: timedelta = timedelta(seconds=10),
+        update_interval: timedelta | None = timedelta(seconds=10),
+        connection_key: str | None = None,
+        plan: list[PlannedRegister] | None = None,
+        storage_key: str | None = None,
     ):
         super().__init__(
             hass,
@@ -39,8 +128,101 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
         self.client = client
         self.slave_id = int(slave_id)
         self.my_config_entry = config_entry
+        self.connection_key = connection_key
+        # Scan results, cached values and captures are kept per storage key
+        self.storage_key = storage_key or config_entry.entry_id
+        self._detect_cache = get_detect_cache(hass)
+        self._function_support = get_function_support(hass)
 
         self._lock = asyncio.Lock()
+        self._plan: list[PlannedRegister] = plan if plan is not None else compile_plan(self.registers)
+        # Updated in place by every poll; also what coordinator.data points to
+        self.values = ValueStore(plan_keys(self._plan))
+
+        # Register-map scanner state
+        self._scanner: RegisterScanner | None = None
+        self._scan_task: asyncio.Task | None = None
+        self._scan_store = Store(hass, 1, f"{DOMAIN}.scan.{self.storage_key}")
+        self.scan_result: dict | None = None
+
+        # Last-known values, used to populate entities before the first poll
+        self._values_store = Store(hass, 1, f"{DOMAIN}.values.{self.storage_key}")
+
+        # Registers with a publish_interval: open windows and last published aggregates
+        self._aggregates: dict[str, RunningAggregate] = {}
+        self.aggregates: dict[str, dict[str, Any]] = {}
+
+        # Recent samples of registers with a history_size
+        self._history: dict[str, HistoryBuffer] = {}
+        self._sync_history()
+
+        # Set by the profile service for the next N refresh cycles
+        self.profiler: PollProfiler | None = None
+
+        # Other entries polling the same slave on the same connection
+        self.poll_group: PollGroup | None = None
+        self.poll_interval = update_interval
+
+        # Set by the bus budget: read registers of a priority every k-th cycle
+        self.stretch: dict[str, int] = {}
+        self._cycle = 0
+
+    # ------------------------------------------------------------------
+    # Register plan
+    # ------------------------------------------------------------------
+
+    @property
+    def plan(self) -> list[PlannedRegister]:
+        return self._plan
+
+    @property
+    def registers(self) -> list[dict]:
+        """Register definitions of this entry (loaded by setup before the coordinator)."""
+        return get_register_store(self.hass, self.my_config_entry.entry_id).registers
+
+    async def async_apply_options(self) -> None:
+        """Apply changed options in place, keeping the connection and data."""
+        interval = self.my_config_entry.options.get(CONF_UPDATE_INTERVAL)
+        if interval:
+            self.poll_interval = timedelta(seconds=interval)
+
+        self._apply_plan(compile_plan(self.registers))
+
+        # Reschedules the bus slot and re-checks the bus budget with the new plan
+        if self.poll_group is not None:
+            self.poll_group.rebalance()
+        else:
+            self.update_interval = self.poll_interval
+
+    def _apply_plan(self, plan: list[PlannedRegister]) -> None:
+        """Switch to a new compiled plan, carrying over values, windows and history."""
+        self._plan = plan
+
+        # New slots; values of registers that still exist are carried over
+        self.values = ValueStore(plan_keys(self._plan), previous=self.values)
+        if self.data is not None:
+            self.data = self.values
+
+        aggregated = {planned.key for planned in self._plan if planned.publish_interval}
+        self._aggregates = {k: v for k, v in self._aggregates.items() if k in aggregated}
+        self.aggregates = {k: v for k, v in self.aggregates.items() if k in aggregated}
+        self._sync_history()
+
+        _LOGGER.debug("Recompiled plan for slave %s: %d registers", self.slave_id, len(self._plan))
+
+    def _sync_history(self) -> None:
+        """Create, resize or drop history buffers to match the plan."""
+        history = {}
+        for planned in self._plan:
+            if not planned.history_size:
+                continue
+            buffer = self._history.get(planned.key)
+            if buffer is None:
+                buffer = HistoryBuffer(planned.history_size)
+            elif buffer.size != planned.history_size:
+                buffer = buffer.resized(planned.history_size)
+            history[planned.key] = buffer
+        self._history = history
 
     # ------------------------------------------------------------------
     # Connection handling
@@ -69,6 +251,7 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
         data_type: str = "uint16",
         byte_order: str = "big",
         word_order: str = "big",
+        reg: dict | None = None,
     ) -> bool:
         try:
             registers = self._encode_value(
@@ -76,19 +259,186 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
                 data_type,
                 byte_order,
                 word_order,
+                reg=reg,
             )
-    
-            result = await self.client.write_registers(
-                address=address,
-                values=registers,
-                device_id=self.slave_id,
-            )
-    
-            return not result.isError()
-    
-        except Exception as err:
+        except (ValueError, TypeError, struct.error) as err:
             _LOGGER.error("Write error at %s: %s", address, err)
             return False
+        if not registers:
+            return False
+
+        return await self._async_write_verified(address, registers) is not None
+
+    async def async_write_value(self, reg: dict, value) -> bool:
+        """Write an entity's register and update its value from the read-back.
+
+        Holding registers are written and read back in one round trip (FC23)
+        where the device supports it, so no full refresh is needed.
+        """
+        data_type = reg.get("data_type", "uint16")
+        byte_order = reg.get("byte_order", "big")
+        word_order = reg.get("word_order", "big")
+        address = int(reg["address"])
+
+        if reg.get("register_type", "auto") not in ("auto", "holding"):
+            ok = await self.async_write_registers(address, value, data_type, byte_order, word_order, reg=reg)
+            await self.async_request_refresh()
+            return ok
+
+        # Scale and offset are reversed here and re-applied to the read-back
+        try:
+            registers = self._encode_value(value, data_type, byte_order, word_order, reg=reg)
+        except (ValueError, TypeError, struct.error) as err:
+            _LOGGER.error("Write error at %s: %s", address, err)
+            return False
+        if not registers:
+            return False
+        confirmed = await self._async_write_verified(address, registers)
+        if confirmed is None:
+            return False
+
+        decoded = self._decode_value(confirmed, data_type, byte_order, word_order, reg=reg)
+        slot = self.values.slot(reg_key(reg["name"]))
+        if decoded is not None and slot is not None:
+            self.values.set(slot, decoded, time.time())
+            self.async_update_listeners()
+        return True
+
+    async def async_write_bit(self, reg: dict, value: bool) -> bool:
+        """Set or clear the single bit an entity's register definition points to.
+
+        Coils are written with FC05. Bits of holding registers use FC22 Mask
+        Write where supported, else a read-modify-write under the
+        coordinator lock, so other bits of the word are never clobbered.
+        """
+        address = int(reg["address"])
+        bit = int(reg.get("bit") or 0)
+        if not await self._async_connect():
+            return False
+
+        async with self._lock:
+            try:
+                if reg.get("register_type") == "coil":
+                    result = await self.client.write_coil(
+                        address=address + bit,
+                        value=bool(value),
+                        device_id=self.slave_id,
+                    )
+                    ok = not result.isError()
+                else:
+                    ok = await self._async_mask_write(address, bit, bool(value))
+            except Exception as err:
+                _LOGGER.error("Bit write error at %s.%s: %s", address, bit, err)
+                return False
+
+        if not ok:
+            _LOGGER.error("Bit write at %s.%s failed", address, bit)
+            return False
+
+        slot = self.values.slot(reg_key(reg["name"]))
+        if slot is not None:
+            self.values.set(slot, bool(value), time.time())
+            self.async_update_listeners()
+        return True
+
+    async def _async_mask_write(self, address: int, bit: int, value: bool) -> bool:
+        """Change one bit of a holding register. Caller holds the lock."""
+        and_mask = ~(1 << bit) & 0xFFFF
+        or_mask = (1 << bit) if value else 0
+
+        support_key = (self.connection_key, self.slave_id, FC_MASK_WRITE_REGISTER)
+        supported = self._function_support.get(support_key)
+        if supported is not False:
+            try:
+                result = await self.client.mask_write_register(
+                    address=address,
+                    and_mask=and_mask,
+                    or_mask=or_mask,
+                    device_id=self.slave_id,
+                )
+            except Exception as err:
+                if supported:
+                    raise
+                _LOGGER.debug("FC22 probe failed for slave %s (%s), using read-modify-write", self.slave_id, err)
+                self._function_support[support_key] = False
+            else:
+                if not result.isError():
+                    self._function_support[support_key] = True
+                    return True
+                if getattr(result, "exception_code", None) != ILLEGAL_FUNCTION:
+                    return False
+                _LOGGER.debug("Slave %s does not support FC22, using read-modify-write", self.slave_id)
+                self._function_support[support_key] = False
+
+        result = await self.client.read_holding_registers(address=address, count=1, device_id=self.slave_id)
+        if result.isError():
+            return False
+        word = (result.registers[0] & and_mask) | or_mask
+        result = await self.client.write_register(address=address, value=word, device_id=self.slave_id)
+        return not result.isError()
+
+    async def _async_write_verified(self, address: int, registers: list[int]) -> list[int] | None:
+        """Write holding registers; return what the device reads back, None on failure.
+
+        Uses FC23 (write + read in one transaction) unless the device has
+        been found not to support it, else FC16 followed by a read.
+        """
+        if not await self._async_connect():
+            return None
+
+        support_key = (self.connection_key, self.slave_id, FC_READ_WRITE_REGISTERS)
+        async with self._lock:
+            supported = self._function_support.get(support_key)
+            if supported is not False:
+                try:
+                    result = await self.client.readwrite_registers(
+                        read_address=address,
+                        read_count=len(registers),
+                        write_address=address,
+                        values=registers,
+                        device_id=self.slave_id,
+                    )
+                except Exception as err:
+                    if supported:
+                        _LOGGER.error("Write error at %s: %s", address, err)
+                        return None
+                    # Some devices silently drop unknown function codes
+                    _LOGGER.debug("FC23 probe failed for slave %s (%s), using FC16", self.slave_id, err)
+                    self._function_support[support_key] = False
+                else:
+                    if not result.isError():
+                        self._function_support[support_key] = True
+                        return list(result.registers[: len(registers)])
+                    if getattr(result, "exception_code", None) != ILLEGAL_FUNCTION:
+                        _LOGGER.error("Write error at %s: %s", address, result)
+                        return None
+                    _LOGGER.debug("Slave %s does not support FC23, using FC16", self.slave_id)
+                    self._function_support[support_key] = False
+
+            try:
+                result = await self.client.write_registers(
+                    address=address,
+                    values=registers,
+                    device_id=self.slave_id,
+                )
+                if result.isError():
+                    _LOGGER.error("Write error at %s: %s", address, result)
+                    return None
+
+                result = await self.client.read_holding_registers(
+                    address=address,
+                    count=len(registers),
+                    device_id=self.slave_id,
+                )
+            except Exception as err:
+                _LOGGER.error("Write error at %s: %s", address, err)
+                return None
+
+        if result.isError():
+            # Written, but the read-back failed: report what was sent
+            _LOGGER.debug("Read-back after write at %s failed: %s", address, result)
+            return list(registers)
+        return list(result.registers[: len(registers)])
 
     async def async_read_registers(self, address: int, size: int = 1):
         """Read holding registers."""
@@ -131,8 +481,13 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
             size = int(TYPE_SIZES.get(data_type.lower(), 1))
         result = None
 
-        # === AUTO DETECTION ===
         if not register_type or register_type == "auto":
+            register_type = self._detect_cache.get(
+                (self.connection_key, self.slave_id, address), "auto"
+            )
+
+        # === AUTO DETECTION ===
+        if register_type == "auto":
             methods = [
                 ("holding", self.client.read_holding_registers),
                 ("input", self.client.read_input_registers),
@@ -149,6 +504,7 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
                     )
                     if not result.isError():
                         register_type = name  # Detected type
+                        self._detect_cache[(self.connection_key, self.slave_id, address)] = name
                         break
                 except Exception as inner_err:
                     _LOGGER.debug("Auto test failed for %s at addr %d: %s", name, address, inner_err)
@@ -208,118 +564,481 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
             word_order,
         )
 
+    async def async_read_range(self, register_type: str, address: int, count: int) -> list[Any]:
+        """Read a contiguous address range in protocol-size blocks.
+
+        Returns one raw value (register word or bit) per address, None where
+        the device refused the address. A block rejected by the device is
+        split in half and retried, like the scanner does; a block that fails
+        for any other reason (timeout, unsupported function) is not split.
+        """
+        if register_type not in SCAN_REGISTER_TYPES:
+            raise ValueError(f"Invalid register_type: {register_type}")
+        if not await self._async_connect():
+            return [None] * count
+
+        bits = register_type in ("coil", "discrete")
+        method = {
+            "holding": self.client.read_holding_registers,
+            "input": self.client.read_input_registers,
+            "coil": self.client.read_coils,
+            "discrete": self.client.read_discrete_inputs,
+        }[register_type]
+        block = MAX_BIT_BLOCK if bits else MAX_REGISTER_BLOCK
+
+        values: list[Any] = [None] * count
+        pending = [(offset, min(block, count - offset)) for offset in range(0, count, block)]
+        while pending:
+            offset, size = pending.pop(0)
+            async with self._lock:
+                try:
+                    result = await method(address=address + offset, count=size, device_id=self.slave_id)
+                except Exception as err:
+                    _LOGGER.debug("Range read %s %d+%d failed: %s", register_type, address + offset, size, err)
+                    continue
+
+            if not result.isError():
+                words = result.bits if bits else result.registers
+                values[offset : offset + size] = [
+                    bool(v) if bits else int(v) for v in words[:size]
+                ]
+            elif size > 1 and getattr(result, "exception_code", None) != ILLEGAL_FUNCTION:
+                half = size // 2
+                pending[:0] = [(offset, half), (offset + half, size - half)]
+        return values
+
+    # ------------------------------------------------------------------
+    # Register-map scan
+    # ------------------------------------------------------------------
+
+    @property
+    def scan_running(self) -> bool:
+        return self._scan_task is not None and not self._scan_task.done()
+
+    @property
+    def scan_progress(self) -> dict | None:
+        return self._scanner.progress if self._scanner else None
+
+    async def async_start_scan(
+        self,
+        start: int = 0,
+        end: int = 65535,
+        register_types: list[str] | None = None,
+    ) -> bool:
+        """Start a register-map scan as a background task."""
+        if self.scan_running:
+            _LOGGER.warning("A register scan is already running for slave %s", self.slave_id)
+            return False
+        if not await self._async_connect():
+            return False
+
+        self._scanner = RegisterScanner(
+            self,
+            start=start,
+            end=end,
+            register_types=register_types or SCAN_REGISTER_TYPES,
+        )
+        self._scan_task = self.my_config_entry.async_create_background_task(
+            self.hass,
+            self._async_run_scan(self._scanner),
+            name=f"{DOMAIN} register scan {self.my_config_entry.entry_id}",
+        )
+        return True
+
+    async def async_cancel_scan(self) -> bool:
+        """Cancel a running scan; the partial map is kept."""
+        if not self.scan_running:
+            return False
+        self._scan_task.cancel()
+        try:
+            await self._scan_task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def _async_run_scan(self, scanner: RegisterScanner) -> None:
+        try:
+            result = await scanner.async_run()
+        except asyncio.CancelledError:
+            result = {
+                "slave_id": self.slave_id,
+                "start": scanner.start,
+                "end": scanner.end,
+                "register_types": scanner.register_types,
+                "complete": False,
+                "requests": scanner.requests,
+                "ranges": scanner.ranges,
+            }
+            self.scan_result = result
+            await self._scan_store.async_save(result)
+            raise
+        self.scan_result = result
+        await self._scan_store.async_save(result)
+
+    async def async_load_scan_result(self) -> dict | None:
+        """Return the last scan result, loading it from storage if needed."""
+        if self.scan_result is None:
+            self.scan_result = await self._scan_store.async_load()
+        return self.scan_result
+
+    # ------------------------------------------------------------------
+    # Bus capture
+    # ------------------------------------------------------------------
+
+    @property
+    def capture_path(self) -> str:
+        return self.hass.config.path(DOMAIN, "captures", f"{self.storage_key}.mbcap")
+
+    @property
+    def capture_running(self) -> bool:
+        return isinstance(self.client, CapturingClient)
+
+    async def async_start_capture(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> bool:
+        """Record every request of this entry until async_stop_capture."""
+        if self.capture_running:
+            return False
+        writer = CaptureWriter(self.hass, self.capture_path, max_bytes=max_bytes, backups=backups)
+        async with self._lock:
+            self.client = CapturingClient(self.client, writer)
+        _LOGGER.info("Capturing Modbus traffic of slave %s to %s", self.slave_id, writer.path)
+        return True
+
+    async def async_stop_capture(self) -> dict[str, Any] | None:
+        """Remove the capture wrapper and flush the file."""
+        if not self.capture_running:
+            return None
+        async with self._lock:
+            wrapper = self.client
+            self.client = wrapper.wrapped
+        await wrapper.writer.async_close()
+        _LOGGER.info("Captured %d requests to %s", wrapper.writer.records, wrapper.writer.path)
+        return {"path": wrapper.writer.path, "records": wrapper.writer.records}
+
+    # ------------------------------------------------------------------
+    # In-memory history
+    # ------------------------------------------------------------------
+
+    def get_history(
+        self,
+        keys: list[str] | None = None,
+        samples: int | None = None,
+        since: float | None = None,
+    ) -> dict[str, dict[str, list[float]]]:
+        """Return {key: {"t": [...], "v": [...]}} of the buffered samples.
+
+        ``samples`` limits each register to its newest N samples, ``since``
+        (epoch seconds) to a time window. Unknown keys are ignored.
+        """
+        selected = self._history if keys is None else {
+            key: self._history[key] for key in keys if key in self._history
+        }
+        result = {}
+        for key, buffer in selected.items():
+            times, values = buffer.samples(limit=samples, since=since)
+            result[key] = {"t": times, "v": values}
+        return result
+
+    # ------------------------------------------------------------------
+    # Last-known values
+    # ------------------------------------------------------------------
+
+    async def async_load_cached_values(self) -> None:
+        """Seed the value store with the values stored by the previous run."""
+        cached = await self._values_store.async_load()
+        if isinstance(cached, dict):
+            self.values.load(cached)
+        self.data = self.values
+        _LOGGER.debug("Loaded %d cached values for slave %s", len(self.values), self.slave_id)
+
+    def _schedule_values_save(self) -> None:
+        # The snapshot is taken when the delayed save runs
+        self._values_store.async_delay_save(self.values.as_dict, VALUES_SAVE_DELAY)
+
     # ------------------------------------------------------------------
     # Polling
     # ------------------------------------------------------------------
 
-    async def _async_update_data(self) -> dict:
-        """Fetch latest data from configured entities."""
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        profiler = self.profiler
+        if profiler is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+        # Covers the read, decode and entity-update phases of this cycle
+        profiler.enter()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.exit(self)
+
+    def polled_coordinators(self) -> list[ModbusWizardCoordinator]:
+        """Coordinators whose plans this one reads when its bus slot fires."""
+        group = self.poll_group
+        if group is not None and group.leader is self:
+            return list(group.members)
+        return [self]
+
+    async def async_request_refresh(self) -> None:
+        # A poll group member is only ever polled by its leader; a request makes it due
+        group = self.poll_group
+        if group is not None:
+            await group.async_request_refresh(self)
+            return
+        await super().async_request_refresh()
+
+    async def _async_update_data(self) -> ValueStore:
+        """Poll all registers and update the value store in place.
+
+        The leader of a poll group polls the members that are due (itself
+        included), sharing every block read between them, and pushes their
+        updated values.
+        """
+        group = self.poll_group
+        if group is None or len(group.members) == 1:
+            return await self._async_poll()
+        if group.leader is not self:
+            # A refresh scheduled before it became a follower, or a manual one;
+            # the leader polls this coordinator's plan
+            return self.values
+
+        due = group.due_members(self.hass.loop.time())
+        if not due:
+            return self.values
+
+        if not await self._async_connect():
+            for member in due:
+                if member is not self:
+                    member.values.mark_all_failed()
+                    member.async_set_updated_data(member.values)
+            return await self._async_poll() if self in due else self.values
+
+        reads = SharedReads(due)
+        for member in due:
+            if member is self:
+                continue
+            profiler = member.profiler
+            if profiler is not None:
+                profiler.enter()
+            try:
+                member.async_set_updated_data(await member._async_poll(reads))
+            finally:
+                if profiler is not None:
+                    profiler.exit(member)
+        return await self._async_poll(reads) if self in due else self.values
+
+    async def _async_poll(self, reads: SharedReads | None = None) -> ValueStore:
+        """Read this coordinator's plan, reusing what was already read in ``reads``."""
+        store = self.values
         if not await self._async_connect():
             _LOGGER.warning("Could not connect to Modbus device")
-            return {}
+            store.mark_all_failed()
+            return store
     
-        entities = self.my_config_entry.options.get(CONF_ENTITIES, [])
-        if not entities:
-            return {}
-        
-        updated_entities = [dict(reg) for reg in entities]
-        options_changed = False
-        new_data = {}
+        if not self._plan:
+            return store
+
+        updated = 0
+        now = time.monotonic()
+        timestamp = time.time()
+        self._cycle += 1
+        stretch = self.stretch
     
         async with self._lock:
-            for idx, reg in enumerate(updated_entities):
-                key = reg_key(reg["name"])
-                address = int(reg["address"])
-                count = int(TYPE_SIZES.get(reg["data_type"].lower(), 1))
-                reg_type = reg.get("register_type", "holding")
-    
-                result = None
+            for planned in self._plan:
+                if stretch and not self._is_due(planned, self._cycle):
+                    # Stretched by the bus budget: only read every k-th cycle
+                    continue
                 try:
-                    # -------- AUTO DETECT --------
-                    if reg_type == "auto":
-                        methods = [
-                            ("holding", self.client.read_holding_registers),
-                            ("input", self.client.read_input_registers),
-                        ]
-                        if reg.get("allow_bits", False):
-                            methods += [
-                                ("coil", self.client.read_coils),
-                                ("discrete", self.client.read_discrete_inputs),
-                            ]
-                        for name, method in methods:
-                            try:
-                                result = await method(
-                                    address=address,
-                                    count=count,
-                                    device_id=self.slave_id,
-                                )
-                                if not result.isError():
-                                    if name in ("holding", "input") and not hasattr(result, "registers"):
-                                        continue
-                                    if name in ("coil", "discrete") and not hasattr(result, "bits"):
-                                        continue                              
-                                    reg_type = name
-                                    updated_entities[idx]["register_type"] = name
-                                    options_changed = True
-                                    break
-                            except Exception:
-                                continue
-    
-                        if reg_type == "auto":
-                            _LOGGER.warning("Auto-detect failed for register '%s' at address %s", reg["name"], address)
-                            continue
-    
-                    # -------- DIRECT READ --------
-                    if result is None:
-                        if reg_type == "holding":
-                            result = await self.client.read_holding_registers(address=address, count=count, device_id=self.slave_id)
-                        elif reg_type == "input":
-                            result = await self.client.read_input_registers(address=address, count=count, device_id=self.slave_id)
-                        elif reg_type == "coil":
-                            result = await self.client.read_coils(address=address, count=count, device_id=self.slave_id)
-                        elif reg_type == "discrete":
-                            result = await self.client.read_discrete_inputs(address=address, count=count, device_id=self.slave_id)
-                        else:
-                            _LOGGER.error("Unknown register_type '%s' for register '%s'", reg_type, reg["name"])
-                            continue
-    
-                    if result.isError():
-                        _LOGGER.warning("Read failed for '%s' (type=%s, addr=%s): %s", reg["name"], reg_type, address, result)
-                        continue
-    
-                    # Extract values based on type
-                    if reg_type in ("coil", "discrete"):
-                        values = result.bits[:count]
-                    else:
-                        values = result.registers[:count]
-    
-                    if not values:
-                        _LOGGER.warning("No values returned for register '%s'", reg["name"])
-                        continue
-    
-                    # Decode the values
-                    decoded = self._decode_value(
-                        values,
-                        reg.get("data_type", "uint16"),
-                        reg.get("byte_order", "big"),
-                        reg.get("word_order", "big"),
-                        reg=reg,
-                    )
-                    
-                    if decoded is not None:
-                        new_data[key] = decoded
-                    else:
-                        _LOGGER.warning("Decode returned None for register '%s'", reg["name"])
-    
+                    decoded = await self._async_read_planned(planned, reads)
                 except Exception as err:
-                    _LOGGER.error("Error updating register '%s': %s", reg.get("name"), err, exc_info=True)
-    
-        if options_changed:
-            _LOGGER.info("Detected register types updated; will take effect after options reload")
+                    _LOGGER.error("Error updating register '%s': %s", planned.name, err, exc_info=True)
+                    decoded = None
+
+                if decoded is None:
+                    # Keep the last good value, flagged stale
+                    store.mark_failed(planned.slot)
+                    continue
+                updated += 1
+
+                history = self._history.get(planned.key)
+                if history is not None and isinstance(decoded, (int, float)):
+                    history.append(timestamp, float(decoded))
+
+                if planned.publish_interval and isinstance(decoded, (int, float)) and not isinstance(decoded, bool):
+                    self._aggregate(planned, decoded, timestamp, now)
+                else:
+                    store.set(planned.slot, decoded, timestamp)
     
-        if not new_data:
+        if not updated:
             _LOGGER.debug("No register values produced in this update cycle")
-        return new_data
+        else:
+            self._schedule_values_save()
+        return store
+
+    def _is_due(self, planned: PlannedRegister, cycle: int) -> bool:
+        """Whether a register is read in the given poll cycle (see the bus budget)."""
+        return not self.stretch or (cycle - 1) % self.stretch.get(planned.priority, 1) == 0
+
+    def _resolved_type(self, planned: PlannedRegister) -> str:
+        """Register type of a planned register, "auto" while not detected yet."""
+        reg_type = planned.register_type
+        if reg_type == "auto":
+            reg_type = self._detect_cache.get((self.connection_key, self.slave_id, planned.address), "auto")
+            if reg_type in ("coil", "discrete") and not planned.allow_bits:
+                reg_type = "auto"
+        return reg_type
+
+    async def _async_read_span(self, span: Block) -> list | None:
+        """Read a merged span of a poll group cycle: its words / bits, or None."""
+        reg_type, address, count = span
+        method = getattr(self.client, READ_METHODS[reg_type])
+        try:
+            result = await method(address=address, count=count, device_id=self.slave_id)
+        except Exception as err:
+            _LOGGER.debug("Shared read %s %d+%d failed: %s", reg_type, address, count, err)
+            return None
+        if result.isError():
+            return None
+        return list(result.bits[:count] if reg_type in ("coil", "discrete") else result.registers[:count])
+
+    async def _async_read_planned(
+        self,
+        planned: PlannedRegister,
+        reads: SharedReads | None = None,
+    ) -> Any | None:
+        """Read and decode one planned register; None if it could not be read.
+
+        With ``reads``, the register is sliced out of its group's merged span,
+        or a block read earlier in the same cycle is reused, instead of going
+        on the bus again.
+        """
+        count = planned.count
+        block = (self._resolved_type(planned), planned.address, count)
+        span = reads.spans.get(block) if reads is not None else None
+        if span is not None and span not in reads.words:
+            reads.words[span] = await self._async_read_span(span)
+            if reads.words[span] is None:
+                _LOGGER.debug("Shared read of %s failed, reading its registers one by one", span)
+        words = reads.words[span] if span is not None else None
+
+        if words is not None:
+            offset = planned.address - span[1]
+            reg_type, values = span[0], words[offset:offset + count]
+        else:
+            if reads is not None and block in reads.blocks:
+                read = reads.blocks[block]
+            else:
+                read = await self._async_read_block(planned)
+                if reads is not None:
+                    reads.blocks[block] = read
+            if read is None:
+                return None
+            reg_type, result = read
+
+            if result.isError():
+                # Failures are in the connection's transaction trace
+                _LOGGER.debug("Read failed for '%s' (type=%s, addr=%s): %s", planned.name, reg_type, planned.address, result)
+                return None
+
+            # Extract values based on type
+            if reg_type in ("coil", "discrete"):
+                values = result.bits[:count]
+            else:
+                values = result.registers[:count]
+
+        if not values:
+            _LOGGER.warning("No values returned for register '%s'", planned.name)
+            return None
+
+        # Decode the values
+        decoded = self._decode_value(
+            values,
+            planned.data_type,
+            planned.byte_order,
+            planned.word_order,
+            reg=planned.info,
+        )
+        if decoded is None:
+            _LOGGER.warning("Decode returned None for register '%s'", planned.name)
+        elif planned.bit is not None:
+            decoded = bool((int(decoded) >> planned.bit) & 1)
+        return decoded
+
+    async def _async_read_block(self, planned: PlannedRegister) -> tuple[str, Any] | None:
+        """Issue the read of one planned register: (resolved type, response) or None."""
+        address = planned.address
+        count = planned.count
+        reg_type = self._resolved_type(planned)
+
+        result = None
+        # -------- AUTO DETECT --------
+        if reg_type == "auto":
+            methods = [
+                ("holding", self.client.read_holding_registers),
+                ("input", self.client.read_input_registers),
+            ]
+            if planned.allow_bits:
+                methods += [
+                    ("coil", self.client.read_coils),
+                    ("discrete", self.client.read_discrete_inputs),
+                ]
+            for name, method in methods:
+                try:
+                    result = await method(
+                        address=address,
+                        count=count,
+                        device_id=self.slave_id,
+                    )
+                    if not result.isError():
+                        if name in ("holding", "input") and not hasattr(result, "registers"):
+                            continue
+                        if name in ("coil", "discrete") and not hasattr(result, "bits"):
+                            continue
+                        reg_type = name
+                        self._detect_cache[(self.connection_key, self.slave_id, address)] = name
+                        _LOGGER.debug("Detected %s register for '%s' at %s", name, planned.name, address)
+                        break
+                except Exception:
+                    continue
+
+            if reg_type == "auto":
+                _LOGGER.warning("Auto-detect failed for register '%s' at address %s", planned.name, address)
+                return None
+
+        # -------- DIRECT READ --------
+        if result is None:
+            if reg_type == "holding":
+                result = await self.client.read_holding_registers(address=address, count=count, device_id=self.slave_id)
+            elif reg_type == "input":
+                result = await self.client.read_input_registers(address=address, count=count, device_id=self.slave_id)
+            elif reg_type == "coil":
+                result = await self.client.read_coils(address=address, count=count, device_id=self.slave_id)
+            elif reg_type == "discrete":
+                result = await self.client.read_discrete_inputs(address=address, count=count, device_id=self.slave_id)
+            else:
+                _LOGGER.error("Unknown register_type '%s' for register '%s'", reg_type, planned.name)
+                return None
+
+        return reg_type, result
+
+    def _aggregate(self, planned: PlannedRegister, value: float, timestamp: float, now: float) -> None:
+        """Fold a sample into the register's window; publish the mean when it closes."""
+        key = planned.key
+        window = self._aggregates.get(key)
+        if window is None:
+            window = self._aggregates[key] = RunningAggregate(started=now)
+        window.add(value)
+
+        if window.due(now, planned.publish_interval):
+            self.aggregates[key] = window.snapshot()
+            self.values.set(planned.slot, self.aggregates[key]["mean"], timestamp)
+            window.reset(now)
+        elif self.values.values[planned.slot] is None:
+            # Nothing published yet: show the first sample right away
+            self.values.set(planned.slot, value, timestamp)
 
     # ------------------------------------------------------------------
     # De/encoding (Using Pymodbus Mixin String-based Endianness)
@@ -376,16 +1095,16 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
                 # For multi-register types, use convert_from_registers
                 # Map data_type to DATATYPE enum
                 dt_map = {
-                    "uint16": ModbusClientMixin.DATATYPE.UINT16,
-                    "int16": ModbusClientMixin.DATATYPE.INT16,
-                    "uint32": ModbusClientMixin.DATATYPE.UINT32,
-                    "int32": ModbusClientMixin.DATATYPE.INT32,
-                    "float32": ModbusClientMixin.DATATYPE.FLOAT32,
-                    "uint64": ModbusClientMixin.DATATYPE.UINT64,
-                    "int64": ModbusClientMixin.DATATYPE.INT64,
-                    "string": ModbusClientMixin.DATATYPE.STRING,
+                    "uint16": self.client.DATATYPE.UINT16,
+                    "int16": self.client.DATATYPE.INT16,
+                    "uint32": self.client.DATATYPE.UINT32,
+                    "int32": self.client.DATATYPE.INT32,
+                    "float32": self.client.DATATYPE.FLOAT32,
+                    "uint64": self.client.DATATYPE.UINT64,
+                    "int64": self.client.DATATYPE.INT64,
+                    "string": self.client.DATATYPE.STRING,
                 }
-                target_type = dt_map.get(dt, ModbusClientMixin.DATATYPE.UINT16)
+                target_type = dt_map.get(dt, self.client.DATATYPE.UINT16)
             
                 try:
                     # pymodbus 3.10+ uses word_order parameter
@@ -444,7 +1163,7 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
         # For uint16/int16, handle directly
         if dt in ("uint16", "int16"):
             if isinstance(value, float):
-                value = int(round(value))
+                value = round(value)
             
             # Convert int16 to uint16 if negative
             if dt == "int16" and value < 0:
@@ -456,17 +1175,17 @@ class ModbusWizardCoordinator(DataUpdateCoordinator):
         
         # For multi-register types, use convert_to_registers
         dt_map = {
-            "uint32": ModbusClientMixin.DATATYPE.UINT32,
-            "int32": ModbusClientMixin.DATATYPE.INT32,
-            "float32": ModbusClientMixin.DATATYPE.FLOAT32,
-            "uint64": ModbusClientMixin.DATATYPE.UINT64,
-            "int64": ModbusClientMixin.DATATYPE.INT64,
+            "uint32": self.client.DATATYPE.UINT32,
+            "int32": self.client.DATATYPE.INT32,
+            "float32": self.client.DATATYPE.FLOAT32,
+            "uint64": self.client.DATATYPE.UINT64,
+            "int64": self.client.DATATYPE.INT64,
         }
-        target_type = dt_map.get(dt, ModbusClientMixin.DATATYPE.UINT16)
+        target_type = dt_map.get(dt, self.client.DATATYPE.UINT16)
     
-        if target_type != ModbusClientMixin.DATATYPE.FLOAT32:
+        if target_type != self.client.DATATYPE.FLOAT32:
             if isinstance(value, float):
-                value = int(round(value))
+                value = round(value)
         else:
             value = float(value)    
     
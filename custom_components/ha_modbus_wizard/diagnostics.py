@@ -0,0 +1,69 @@
+"""Diagnostics support for Modbus Wizard."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .bus import get_bus_schedule
+from .const import CONF_HOST, DOMAIN
+from .register_store import get_register_store
+from .trace import get_trace
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including its connection trace."""
+    domain_data = hass.data.get(DOMAIN, {})
+    hub = domain_data.get("hubs", {}).get(entry.entry_id)
+    coordinator = hub or domain_data.get("coordinators", {}).get(entry.entry_id)
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+    }
+    if coordinator is None:
+        return diagnostics
+
+    if hub is not None:
+        diagnostics["hub"] = {
+            "last_update_success": hub.last_update_success,
+            "update_interval": _seconds(get_bus_schedule(hass, hub.connection_key).interval(hub)),
+            "connected": hub.client.connected,
+            "devices": {
+                slave_id: {
+                    "template": device.template.template_id,
+                    "last_update_success": device.last_update_success,
+                    "values": device.values.describe(),
+                }
+                for slave_id, device in hub.devices.items()
+            },
+        }
+    else:
+        diagnostics["coordinator"] = {
+            "slave_id": coordinator.slave_id,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": _seconds(coordinator.poll_interval),
+            "connected": coordinator.client.connected,
+            "registers": get_register_store(hass, entry.entry_id).registers,
+            "values": coordinator.values.describe(),
+            "poll_group": [
+                member.my_config_entry.entry_id for member in coordinator.poll_group.members
+            ] if coordinator.poll_group is not None else None,
+        }
+    if coordinator.connection_key is not None:
+        diagnostics["bus_schedule"] = get_bus_schedule(hass, coordinator.connection_key).describe()
+        trace = get_trace(hass, coordinator.connection_key)
+        diagnostics["trace"] = {
+            "summary": trace.summary(),
+            "transactions": trace.entries(),
+        }
+    return diagnostics
+
+
+def _seconds(interval: timedelta | None) -> float | None:
+    return interval.total_seconds() if interval else None
@@ -0,0 +1,106 @@
+"""Slave-ID discovery for Modbus Wizard."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_SLAVE_ID = 1
+MAX_SLAVE_ID = 247
+
+# Short probe timeouts: a silent ID costs exactly one timeout
+DISCOVERY_TIMEOUT_SERIAL = 0.2
+DISCOVERY_TIMEOUT_IP = 0.5
+# Parallel connections opened to a TCP/UDP gateway during discovery
+DISCOVERY_CONCURRENCY_IP = 4
+
+PROBE_METHODS = (
+    ("holding", "read_holding_registers"),
+    ("input", "read_input_registers"),
+    ("coil", "read_coils"),
+    ("discrete", "read_discrete_inputs"),
+)
+
+
+def _answered(result: Any) -> bool:
+    """True when the device sent any reply, including a Modbus exception."""
+    if result is None:
+        return False
+    if not result.isError():
+        return True
+    return getattr(result, "exception_code", None) is not None
+
+
+async def _async_probe(client, method: str, slave_id: int, address: int, timeout: float):
+    from pymodbus.exceptions import ModbusException
+
+    try:
+        return await asyncio.wait_for(
+            getattr(client, method)(address=address, count=1, device_id=slave_id),
+            timeout,
+        )
+    except (ModbusException, TimeoutError, OSError) as err:
+        _LOGGER.debug("Discovery probe %s on ID %d: %s", method, slave_id, err)
+        return None
+
+
+async def async_probe_slave(client, slave_id: int, address: int, timeout: float) -> list[str] | None:
+    """Probe one slave ID.
+
+    Returns None when nothing answered, otherwise the register types that
+    returned data at ``address`` (possibly empty when the device only sent
+    exception replies).
+    """
+    answered = False
+    types: list[str] = []
+    for name, method in PROBE_METHODS:
+        result = await _async_probe(client, method, slave_id, address, timeout)
+        if not _answered(result):
+            if not answered:
+                # First function code got no reply at all: nobody is home
+                return None
+            continue
+        answered = True
+        if not result.isError():
+            types.append(name)
+    return types
+
+
+async def async_discover_slaves(
+    clients: list,
+    address: int = 0,
+    slave_ids: Iterable[int] = range(MIN_SLAVE_ID, MAX_SLAVE_ID + 1),
+    timeout: float = DISCOVERY_TIMEOUT_SERIAL,
+    progress_callback: Callable[[float], None] | None = None,
+) -> dict[int, list[str]]:
+    """Scan slave IDs and return {slave_id: [answered register types]}.
+
+    Each client works through a shared queue of IDs, so passing several
+    connections to a TCP/UDP gateway probes that many IDs concurrently. A
+    serial line gets a single client and is scanned in sequence.
+    """
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for slave_id in slave_ids:
+        queue.put_nowait(slave_id)
+    total = queue.qsize()
+    found: dict[int, list[str]] = {}
+
+    async def _worker(client) -> None:
+        while True:
+            try:
+                slave_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            types = await async_probe_slave(client, slave_id, address, timeout)
+            if types is not None:
+                _LOGGER.debug("Discovered slave %d (%s)", slave_id, ", ".join(types) or "exceptions only")
+                found[slave_id] = types
+            if progress_callback and total:
+                progress_callback(1 - queue.qsize() / total)
+
+    await asyncio.gather(*(_worker(client) for client in clients))
+    return dict(sorted(found.items()))
@@ -0,0 +1,199 @@
+"""Incremental entity management shared by the Modbus Wizard platforms."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def register_id(reg: dict[str, Any]) -> str:
+    """Stable identity of a register definition, independent of its name."""
+    rid = f"{int(reg['address'])}_{reg.get('register_type', 'auto')}"
+    if reg.get("bit") is not None:
+        rid += f"_b{int(reg['bit'])}"
+    return rid
+
+
+class _PlatformHandler:
+    """Entities of one platform for one config entry."""
+
+    def __init__(
+        self,
+        suffix: str,
+        async_add_entities: AddEntitiesCallback,
+        wants: Callable[[dict[str, Any]], bool],
+        factory: Callable[[str, dict[str, Any]], Entity],
+    ) -> None:
+        self.suffix = suffix
+        self.async_add_entities = async_add_entities
+        self.wants = wants
+        self.factory = factory
+        self.entities: dict[str, Entity] = {}
+
+
+class ModbusWizardEntityManager:
+    """Keep the entities of a config entry in sync with its register definitions.
+
+    The register list is diffed once per options change, keyed by register_id.
+    Each platform then gets its additions in a single async_add_entities call,
+    changed definitions are pushed into the existing entities, and removals
+    go through the entity registry in bulk.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        device_id: str | None = None,
+        name: str | None = None,
+        model: str = "Wizard",
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self._platforms: dict[str, _PlatformHandler] = {}
+        self._registers: dict[str, dict[str, Any]] = {}
+
+        if device_id is None:
+            # Single-device entry: the entry is the device
+            self.device_id = entry.entry_id
+            self.device_info = DeviceInfo(
+                identifiers={(DOMAIN, entry.entry_id)},
+                name=entry.title or "Modbus Wizard",
+                manufacturer="Partach",
+                model=model,
+            )
+        else:
+            # Slave of a hub entry, linked to the hub device
+            self.device_id = device_id
+            self.device_info = DeviceInfo(
+                identifiers={(DOMAIN, device_id)},
+                name=name or device_id,
+                manufacturer="Partach",
+                model=model,
+                via_device=(DOMAIN, entry.entry_id),
+            )
+
+    def unique_id(self, rid: str, suffix: str) -> str:
+        return f"{self.device_id}_{rid}_{suffix}"
+
+    @staticmethod
+    def _index(registers: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        indexed = {}
+        for reg in registers:
+            try:
+                indexed[register_id(reg)] = reg
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.error("Skipping register without valid address: %s", reg)
+        return indexed
+
+    # ------------------------------------------------------------------
+    # Platforms
+    # ------------------------------------------------------------------
+
+    @callback
+    def async_register_platform(
+        self,
+        suffix: str,
+        async_add_entities: AddEntitiesCallback,
+        wants: Callable[[dict[str, Any]], bool],
+        factory: Callable[[str, dict[str, Any]], Entity],
+        registers: list[dict[str, Any]],
+    ) -> None:
+        """Attach a platform and create its entities for the current registers."""
+        handler = _PlatformHandler(suffix, async_add_entities, wants, factory)
+        self._platforms[suffix] = handler
+        self._registers = self._index(registers)
+
+        new_entities = []
+        for rid, reg in self._registers.items():
+            if wants(reg):
+                entity = factory(self.unique_id(rid, suffix), reg)
+                handler.entities[rid] = entity
+                new_entities.append(entity)
+
+        if new_entities:
+            async_add_entities(new_entities)
+        _LOGGER.debug("Platform %s: added %d entities", suffix, len(new_entities))
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def async_apply(self, registers: list[dict[str, Any]]) -> None:
+        """Apply a new register list to all platforms."""
+        new = self._index(registers)
+        old = self._registers
+        self._registers = new
+
+        added = new.keys() - old.keys()
+        removed = old.keys() - new.keys()
+        changed = {rid for rid in new.keys() & old.keys() if new[rid] != old[rid]}
+        if not (added or removed or changed):
+            return
+
+        to_remove: list[Entity] = []
+        counts = {"added": 0, "updated": 0, "removed": 0}
+
+        for handler in self._platforms.values():
+            new_entities = []
+
+            for rid in removed:
+                entity = handler.entities.pop(rid, None)
+                if entity is not None:
+                    to_remove.append(entity)
+
+            for rid in added | changed:
+                reg = new[rid]
+                entity = handler.entities.get(rid)
+                wanted = handler.wants(reg)
+
+                if entity is None:
+                    if wanted:
+                        entity = handler.factory(self.unique_id(rid, handler.suffix), reg)
+                        handler.entities[rid] = entity
+                        new_entities.append(entity)
+                elif wanted:
+                    entity.async_update_info(reg)
+                    counts["updated"] += 1
+                else:
+                    to_remove.append(handler.entities.pop(rid))
+
+            if new_entities:
+                handler.async_add_entities(new_entities)
+                counts["added"] += len(new_entities)
+
+        if to_remove:
+            await self._async_remove_entities(to_remove)
+            counts["removed"] = len(to_remove)
+
+        _LOGGER.info(
+            "Entity sync complete — added=%d, updated=%d, removed=%d, defined=%d",
+            counts["added"],
+            counts["updated"],
+            counts["removed"],
+            len(new),
+        )
+
+    async def _async_remove_entities(self, entities: list[Entity]) -> None:
+        ent_reg = er.async_get(self.hass)
+        pending = []
+        for entity in entities:
+            if entity.entity_id and ent_reg.async_get(entity.entity_id):
+                # Registry removal also removes the entity from its platform
+                ent_reg.async_remove(entity.entity_id)
+            elif entity.hass is not None:
+                pending.append(entity.async_remove())
+        if pending:
+            await asyncio.gather(*pending)
@@ -1,5 +1,11 @@
 import { LitElement, html, css } from "https://unpkg.com/lit?module";
 
+// Register table: fixed row height so rows can be positioned without measuring
+const TABLE_ROW_HEIGHT = 28;
+const TABLE_HEIGHT = 420;
+const TABLE_OVERSCAN = 10; // rows rendered (and read) above and below the viewport
+const TABLE_FETCH_DELAY = 150; // ms of scroll quiet before reading the window
+
 class ModbusWizardCard extends LitElement {
   static get properties() {
     return {
@@ -21,6 +27,12 @@ class ModbusWizardCard extends LitElement {
       _writeByteOrder: { type: String },
       _writeWordOrder: { type: String },
       _rawMode: { type: Boolean },
+      _tableMode: { type: Boolean },
+      _tableType: { type: String },
+      _tableStart: { type: Number },
+      _tableEnd: { type: Number },
+      _tableFirstRow: { type: Number },
+      _tableStatus: { type: String },
     };
   }
 
@@ -42,6 +54,15 @@ class ModbusWizardCard extends LitElement {
     this._writeByteOrder = "big";
     this._writeWordOrder = "big";
     this._rawMode = false;
+    this._tableMode = false;
+    this._tableType = "holding";
+    this._tableStart = 0;
+    this._tableEnd = 9999;
+    this._tableFirstRow = 0;
+    this._tableStatus = "";
+    this._tableValues = new Map(); // address -> register word / bit, null if refused
+    this._tableGeneration = 0;
+    this._tableTimer = null;
   }
 
   static getConfigElement() {
@@ -56,61 +77,87 @@ class ModbusWizardCard extends LitElement {
   }
 
   getCardSize() {
-    return 10;
+    return this._tableMode ? 18 : 10;
   }
 
-  updated(changedProps) {
-    super.updated(changedProps);
-
-    if (changedProps.has("hass")) {
-      this._resolveDeviceEntities();
-    }
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    clearTimeout(this._tableTimer);
   }
 
-  _resolveDeviceEntities() {
-    if (!this.hass) return;
+  shouldUpdate(changedProps) {
+    if (!changedProps.has("hass")) return true;
 
-    this._allEntities = [];
-    const deviceId = this.config.device_id;
+    const entitiesBefore = this._allEntities;
+    this._resolveDeviceEntities();
 
-    const entityRegistry = this.hass.entities;
+    // hass changes several times a second on big installs; only re-render
+    // when something this card shows has changed
+    const oldHass = changedProps.get("hass");
+    if (!oldHass || changedProps.size > 1 || this._allEntities !== entitiesBefore) {
+      return true;
+    }
+    const deviceId = this.config?.device_id;
+    if (deviceId && oldHass.devices?.[deviceId] !== this.hass.devices?.[deviceId]) {
+      return true;
+    }
+    return this._allEntities.some(eid => oldHass.states[eid] !== this.hass.states[eid]);
+  }
 
-    // Preferred: entities belonging to selected device
-    if (deviceId && entityRegistry) {
-      const deviceEntities = Object.values(entityRegistry)
-        .filter(e => e.device_id === deviceId)
-        .map(e => e.entity_id)
-        .sort();
+  _getEntityIndex() {
+    // Memoised per entity registry object; HA replaces it on registry changes
+    const registry = this.hass.entities;
+    if (registry ? registry === this._indexedRegistry : this._entityIndex?.all.length) {
+      return this._entityIndex;
+    }
 
-      if (deviceEntities.length > 0) {
-        this._allEntities = deviceEntities;
+    const byDevice = new Map();
+    const all = [];
+    const add = (entityId, deviceId) => {
+      all.push(entityId);
+      if (!deviceId) return;
+      if (!byDevice.has(deviceId)) byDevice.set(deviceId, []);
+      byDevice.get(deviceId).push(entityId);
+    };
 
-        if (
-          !this._selectedEntity ||
-          !this._allEntities.includes(this._selectedEntity)
-        ) {
-          this._selectedEntity = this._allEntities[0];
+    if (registry) {
+      for (const entry of Object.values(registry)) {
+        if (entry.platform === "ha_modbus_wizard") add(entry.entity_id, entry.device_id);
+      }
+    } else {
+      // Fallback: states (legacy / early-load safety)
+      for (const [entityId, state] of Object.entries(this.hass.states)) {
+        if (state?.attributes?.integration === "ha_modbus_wizard") {
+          add(entityId, state.attributes.device_id);
         }
-        return;
       }
     }
 
-    // Fallback: all Modbus Wizard entities (registry-based)
-    if (entityRegistry) {
-      this._allEntities = Object.values(entityRegistry)
-        .filter(e => e.platform === "ha_modbus_wizard")
-        .map(e => e.entity_id)
-        .sort();
+    all.sort();
+    byDevice.forEach(entities => entities.sort());
+    this._indexedRegistry = registry;
+    this._entityIndex = { all, byDevice };
+    return this._entityIndex;
+  }
+
+  _resolveDeviceEntities() {
+    if (!this.hass || !this.config) return;
+
+    const index = this._getEntityIndex();
+    const deviceEntities = this.config.device_id && index.byDevice.get(this.config.device_id);
+
+    // Preferred: entities belonging to selected device, else all Modbus Wizard entities.
+    // The index hands out the same arrays until the registry changes.
+    const entities = deviceEntities || index.all;
+    if (entities !== this._allEntities) {
+      this._allEntities = entities;
     }
 
-    // Final fallback: states (legacy / early-load safety)
-    if (this._allEntities.length === 0) {
-      this._allEntities = Object.keys(this.hass.states)
-        .filter(eid => {
-          const state = this.hass.states[eid];
-          return state?.attributes?.integration === "ha_modbus_wizard";
-        })
-        .sort();
+    if (
+      deviceEntities &&
+      (!this._selectedEntity || !deviceEntities.includes(this._selectedEntity))
+    ) {
+      this._selectedEntity = deviceEntities[0];
     }
   }
 
@@ -128,19 +175,11 @@ class ModbusWizardCard extends LitElement {
       }
     }
 
-    // Priority 2: Use first entity from device
+    // Priority 2: Use first entity from device (or of the integration)
     if (this._allEntities.length > 0) {
       return this._allEntities[0];
     }
 
-    // Priority 3: Search by device_id
-    if (this.config.device_id) {
-      const eid = Object.keys(this.hass.states).find(
-        eid => this.hass.states[eid]?.attributes?.device_id === this.config.device_id
-      );
-      return eid || null;
-    }
-
     return null;
   }
 
@@ -302,6 +341,185 @@ class ModbusWizardCard extends LitElement {
     this.requestUpdate();
   }
   
+  // ------------------------------------------------------------------
+  // Register table
+  // ------------------------------------------------------------------
+
+  _tableWindow() {
+    // Row indexes [first, last) to render: the viewport plus overscan
+    const total = Math.max(0, this._tableEnd - this._tableStart + 1);
+    const visibleRows = Math.ceil(TABLE_HEIGHT / TABLE_ROW_HEIGHT);
+    return {
+      total,
+      first: Math.max(0, this._tableFirstRow - TABLE_OVERSCAN),
+      last: Math.min(total, this._tableFirstRow + visibleRows + TABLE_OVERSCAN),
+    };
+  }
+
+  _resetTable() {
+    this._tableValues = new Map();
+    this._tableGeneration += 1;
+    this._tableFirstRow = 0;
+    const viewport = this.shadowRoot?.querySelector(".table-viewport");
+    if (viewport) viewport.scrollTop = 0;
+    this._scheduleTableFetch();
+  }
+
+  _setTableOption(option, value) {
+    this[option] = value;
+    this._resetTable();
+  }
+
+  _handleTableScroll(e) {
+    const firstRow = Math.floor(e.target.scrollTop / TABLE_ROW_HEIGHT);
+    if (firstRow !== this._tableFirstRow) {
+      this._tableFirstRow = firstRow;
+    }
+    this._scheduleTableFetch();
+  }
+
+  _scheduleTableFetch() {
+    clearTimeout(this._tableTimer);
+    this._tableTimer = setTimeout(() => this._fetchTableWindow(), TABLE_FETCH_DELAY);
+  }
+
+  async _fetchTableWindow() {
+    if (!this._tableMode || !this.hass) return;
+
+    const targetEntity = this._getTargetEntity();
+    if (!targetEntity) {
+      this._tableStatus = "No Modbus hub available";
+      return;
+    }
+
+    // One block read covering the rows of the window that are not loaded yet
+    const { first, last } = this._tableWindow();
+    let start = this._tableStart + first;
+    let end = this._tableStart + last - 1;
+    while (start <= end && this._tableValues.has(start)) start++;
+    while (end >= start && this._tableValues.has(end)) end--;
+    if (start > end) return;
+
+    const generation = this._tableGeneration;
+    this._tableStatus = `Reading ${start}-${end}...`;
+
+    try {
+      const result = await this.hass.callWS({
+        type: "call_service",
+        domain: "ha_modbus_wizard",
+        service: "read_range",
+        service_data: {
+          entity_id: targetEntity,
+          address: start,
+          count: end - start + 1,
+          register_type: this._tableType,
+        },
+        return_response: true,
+      });
+
+      // Discard the answer if the type or range changed meanwhile
+      if (generation !== this._tableGeneration) return;
+
+      const values = result?.response?.values ?? result?.values ?? [];
+      values.forEach((value, i) => this._tableValues.set(start + i, value));
+      this._tableStatus = "";
+    } catch (err) {
+      console.error("Range read error:", err);
+      this._tableStatus = `Read failed: ${err.message || err}`;
+    }
+
+    this.requestUpdate();
+  }
+
+  _renderTableRow(address) {
+    const value = this._tableValues.get(address);
+    let dec = "…";
+    let hex = "";
+    if (value === null) {
+      dec = "—";
+    } else if (typeof value === "boolean") {
+      dec = value ? "1" : "0";
+    } else if (value !== undefined) {
+      dec = String(value);
+      hex = `0x${value.toString(16).toUpperCase().padStart(4, "0")}`;
+    }
+
+    return html`
+      <div class="table-row" style="height: ${TABLE_ROW_HEIGHT}px">
+        <span>${address}</span>
+        <span>${dec}</span>
+        <span>${hex}</span>
+      </div>
+    `;
+  }
+
+  _renderTable() {
+    const { total, first, last } = this._tableWindow();
+    const addresses = [];
+    for (let row = first; row < last; row++) {
+      addresses.push(this._tableStart + row);
+    }
+
+    return html`
+      <div class="section">
+        <div class="section-title">Register Table</div>
+
+        <div class="field-row">
+          <span class="label">Register Category:</span>
+          <select .value=${this._tableType} @change=${e => this._setTableOption("_tableType", e.target.value)}>
+            <option value="holding">Holding Register</option>
+            <option value="input">Input Register</option>
+            <option value="coil">Coil</option>
+            <option value="discrete">Discrete Input</option>
+          </select>
+        </div>
+
+        <div class="field-row">
+          <span class="label">Address Range:</span>
+          <input
+            type="number"
+            min="0"
+            max="65535"
+            .value=${this._tableStart}
+            @change=${e => this._setTableOption("_tableStart", Math.max(0, Number(e.target.value)))}
+          />
+          <input
+            type="number"
+            min="0"
+            max="65535"
+            .value=${this._tableEnd}
+            @change=${e => this._setTableOption("_tableEnd", Math.min(65535, Number(e.target.value)))}
+          />
+        </div>
+
+        <div class="button-row">
+          <button @click=${this._resetTable}>Refresh</button>
+        </div>
+
+        <div class="table-row table-header">
+          <span>Address</span>
+          <span>Value</span>
+          <span>Hex</span>
+        </div>
+        <div
+          class="table-viewport"
+          style="height: ${TABLE_HEIGHT}px"
+          @scroll=${this._handleTableScroll}
+        >
+          <div style="height: ${total * TABLE_ROW_HEIGHT}px; position: relative">
+            <div class="table-rows" style="transform: translateY(${first * TABLE_ROW_HEIGHT}px)">
+              ${addresses.map(address => this._renderTableRow(address))}
+            </div>
+          </div>
+        </div>
+
+        ${this._tableStatus ? html`
+          <div class="status">${this._tableStatus}</div>
+        ` : ""}
+      </div>
+    `;
+  }
+
   render() {
     if (!this.hass || !this.config) return html``;
 
@@ -425,8 +643,25 @@ class ModbusWizardCard extends LitElement {
             ${this._writeStatus ? html`
               <div class="status">${this._writeStatus}</div>
             ` : ""}
+
+            <div class="field-row checkbox-row">
+              <span class="label">Browse Registers:</span>
+              <label>
+                <input
+                  type="checkbox"
+                  ?checked=${this._tableMode}
+                  @change=${e => {
+                    this._tableMode = e.target.checked;
+                    if (this._tableMode) this._resetTable();
+                  }}
+                />
+                Show Register Table
+              </label>
+            </div>
           </div>
         </div>
+
+        ${this._tableMode ? this._renderTable() : ""}
       </ha-card>
     `;
   }
@@ -524,6 +759,35 @@ class ModbusWizardCard extends LitElement {
         align-items: center;
         cursor: pointer;
       }
+
+      .table-viewport {
+        overflow-y: auto;
+        border: 1px solid var(--divider-color);
+        border-radius: 4px;
+        margin-top: 4px;
+      }
+
+      .table-rows {
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+      }
+
+      .table-row {
+        display: grid;
+        grid-template-columns: 1fr 1fr 1fr;
+        align-items: center;
+        padding: 0 8px;
+        font-family: monospace;
+        box-sizing: border-box;
+      }
+
+      .table-header {
+        margin-top: 12px;
+        font-weight: bold;
+        font-family: inherit;
+      }
     `;
   }
 }
@@ -0,0 +1,61 @@
+"""Fixed-size in-memory sample history for Modbus Wizard registers."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+
+
+class HistoryBuffer:
+    """Ring buffer of (timestamp, value) samples backed by two array('d').
+
+    Appends are O(1) and allocation free: samples live in preallocated C
+    doubles, not in per-sample Python objects.
+    """
+
+    __slots__ = ("_count", "_next", "_times", "_values", "size")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+
+    def _ordered(self, data: array) -> array:
+        """Stored samples of one array, oldest first."""
+        if self._count < self.size:
+            return data[: self._count]
+        return data[self._next :] + data[: self._next]
+
+    def samples(self, limit: int | None = None, since: float | None = None) -> tuple[list[float], list[float]]:
+        """Return (timestamps, values), oldest first.
+
+        ``since`` keeps samples at or after that timestamp, ``limit`` then
+        keeps only the newest N of those.
+        """
+        times = self._ordered(self._times)
+        values = self._ordered(self._values)
+
+        start = bisect_left(times, since) if since is not None else 0
+        if limit is not None:
+            start = max(start, len(times) - limit)
+        return times[start:].tolist(), values[start:].tolist()
+
+    def resized(self, size: int) -> HistoryBuffer:
+        """Return a buffer of another size holding the newest samples of this one."""
+        buffer = HistoryBuffer(size)
+        times, values = self.samples(limit=size)
+        for timestamp, value in zip(times, values):
+            buffer.append(timestamp, value)
+        return buffer
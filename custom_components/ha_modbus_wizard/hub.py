@@ -0,0 +1,261 @@
+"""Hub mode for Modbus Wizard: one config entry polling many slaves on a bus."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import CONF_DEVICES, CONF_NAME, CONF_SLAVE_ID, CONF_TEMPLATE, DOMAIN
+from .coordinator import ModbusWizardCoordinator
+from .entity_manager import ModbusWizardEntityManager
+from .plan import PlannedRegister, compile_plan
+from .template_catalog import get_catalog
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class TemplatePlan:
+    """A template's registers and compiled plan, shared by all slaves using it."""
+
+    template_id: str
+    digest: str
+    model: str
+    registers: list[dict[str, Any]]
+    plan: list[PlannedRegister]
+
+
+async def async_get_template_plans(hass: HomeAssistant, template_ids: set[str]) -> dict[str, TemplatePlan]:
+    """Return the compiled plans of some templates, compiling each at most once.
+
+    Plans are cached per template for the whole HA run and recompiled only
+    when the template file changed. Unknown or invalid templates are left out.
+    """
+    cache: dict[str, TemplatePlan] = hass.data.setdefault(DOMAIN, {}).setdefault("template_plans", {})
+    catalog = get_catalog(hass)
+    entries = await catalog.async_get_catalog()
+
+    plans = {}
+    for template_id in template_ids:
+        entry = entries.get(template_id)
+        if entry is None:
+            _LOGGER.error("Device template %s not found", template_id)
+            continue
+
+        cached = cache.get(template_id)
+        if cached is None or cached.digest != entry["sha256"]:
+            try:
+                registers = await catalog.async_load(template_id)
+            except (OSError, ValueError) as err:
+                # Missing / unreadable file, or invalid JSON / TemplateError
+                _LOGGER.error("Failed to load device template %s: %s", template_id, err)
+                continue
+            cached = cache[template_id] = TemplatePlan(
+                template_id=template_id,
+                digest=entry["sha256"],
+                model=" ".join(filter(None, (entry["vendor"], entry["model"]))) or entry["name"],
+                registers=registers,
+                plan=compile_plan(registers),
+            )
+        plans[template_id] = cached
+    return plans
+
+
+class ModbusWizardHubDevice(ModbusWizardCoordinator):
+    """One slave of a hub entry.
+
+    Has no update timer of its own; the hub refreshes it as part of the bus
+    cycle. Its registers and compiled plan are the template's shared ones,
+    only the values, history and aggregates are per slave.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        config_entry: ConfigEntry,
+        device: dict[str, Any],
+        template: TemplatePlan,
+        connection_key: str,
+    ) -> None:
+        self.device = device
+        self.template = template
+        super().__init__(
+            hass=hass,
+            client=client,
+            slave_id=int(device[CONF_SLAVE_ID]),
+            config_entry=config_entry,
+            update_interval=None,
+            connection_key=connection_key,
+            plan=template.plan,
+            storage_key=f"{config_entry.entry_id}_{int(device[CONF_SLAVE_ID])}",
+        )
+
+    @property
+    def registers(self) -> list[dict]:
+        """Register definitions of this slave's template."""
+        return self.template.registers
+
+    async def async_apply_options(self) -> None:
+        """Registers come from the template; nothing to apply from the options."""
+
+
+class ModbusWizardHub(DataUpdateCoordinator):
+    """Poll all slaves of a hub entry as one pipeline on its connection.
+
+    The hub has the entry's only slot on the bus schedule. Each cycle
+    connects once and then refreshes the slaves one after another, so timers
+    and bus contention scale with the number of buses, not of devices.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        config_entry: ConfigEntry,
+        connection_key: str,
+        update_interval: timedelta = timedelta(seconds=10),
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Modbus Wizard hub",
+            update_interval=update_interval,
+        )
+        self.client = client
+        self.my_config_entry = config_entry
+        self.connection_key = connection_key
+        self.devices: dict[int, ModbusWizardHubDevice] = {}
+        self.managers: dict[int, ModbusWizardEntityManager] = {}
+        # Device list the hub was set up with; a change needs a reload
+        self._device_config = list(config_entry.options.get(CONF_DEVICES, []))
+
+    def polled_coordinators(self) -> list[ModbusWizardHubDevice]:
+        """Coordinators whose plans the hub reads when its bus slot fires."""
+        return list(self.devices.values())
+
+    def device_identifier(self, slave_id: int) -> str:
+        return f"{self.my_config_entry.entry_id}_{slave_id}"
+
+    @property
+    def devices_changed(self) -> bool:
+        return list(self.my_config_entry.options.get(CONF_DEVICES, [])) != self._device_config
+
+    def add_device(self, device: dict[str, Any], template: TemplatePlan) -> ModbusWizardHubDevice:
+        slave_id = int(device[CONF_SLAVE_ID])
+        coordinator = ModbusWizardHubDevice(
+            self.hass, self.client, self.my_config_entry, device, template, self.connection_key
+        )
+        self.devices[slave_id] = coordinator
+        self.managers[slave_id] = ModbusWizardEntityManager(
+            self.hass,
+            self.my_config_entry,
+            device_id=self.device_identifier(slave_id),
+            name=device.get(CONF_NAME) or f"Slave {slave_id}",
+            model=template.model,
+        )
+        return coordinator
+
+    def device_for_identifiers(self, identifiers: set[tuple[str, str]]) -> ModbusWizardHubDevice | None:
+        """Return the slave whose device registry identifiers are given."""
+        for slave_id, coordinator in self.devices.items():
+            if (DOMAIN, self.device_identifier(slave_id)) in identifiers:
+                return coordinator
+        return None
+
+    @callback
+    def async_remove_stale_devices(self) -> None:
+        """Detach registry devices of slaves that were removed from the hub."""
+        entry_id = self.my_config_entry.entry_id
+        wanted = {(DOMAIN, entry_id)} | {(DOMAIN, self.device_identifier(s)) for s in self.devices}
+        dev_reg = dr.async_get(self.hass)
+        for device_entry in dr.async_entries_for_config_entry(dev_reg, entry_id):
+            if not device_entry.identifiers & wanted:
+                dev_reg.async_update_device(device_entry.id, remove_config_entry_id=entry_id)
+
+    async def _async_update_data(self) -> dict[int, bool]:
+        """Refresh every slave in turn; returns {slave_id: last_update_success}."""
+        if not self.client.connected:
+            from pymodbus.exceptions import ModbusException
+
+            try:
+                await self.client.connect()
+            except (ModbusException, OSError) as err:
+                _LOGGER.error("Failed to connect to Modbus hub: %s", err)
+
+        if not self.client.connected:
+            _LOGGER.warning("Could not connect to Modbus hub")
+            error = ConnectionError("Modbus hub not connected")
+            for coordinator in self.devices.values():
+                coordinator.values.mark_all_failed()
+                coordinator.async_set_update_error(error)
+            return {slave_id: False for slave_id in self.devices}
+
+        for coordinator in list(self.devices.values()):
+            await coordinator.async_refresh()
+        return {slave_id: c.last_update_success for slave_id, c in self.devices.items()}
+
+
+async def async_setup_hub(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client,
+    connection_key: str,
+    update_interval: timedelta,
+) -> ModbusWizardHub:
+    """Create the hub of an entry and its slaves from the options."""
+    hub = ModbusWizardHub(hass, client, entry, connection_key, update_interval)
+
+    devices = entry.options.get(CONF_DEVICES, [])
+    templates = await async_get_template_plans(hass, {device[CONF_TEMPLATE] for device in devices})
+    for device in devices:
+        slave_id = int(device[CONF_SLAVE_ID])
+        template = templates.get(device[CONF_TEMPLATE])
+        if template is None or slave_id in hub.devices:
+            _LOGGER.error("Skipping hub device %s (slave %s)", device.get(CONF_NAME), slave_id)
+            continue
+        hub.add_device(device, template)
+
+    await asyncio.gather(*(c.async_load_cached_values() for c in hub.devices.values()))
+    hub.async_remove_stale_devices()
+    _LOGGER.debug(
+        "Hub %s: %d slave(s) sharing %d compiled template(s)",
+        entry.entry_id,
+        len(hub.devices),
+        len(templates),
+    )
+    return hub
+
+
+def entry_devices(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> list[tuple[ModbusWizardCoordinator, ModbusWizardEntityManager]]:
+    """(coordinator, entity manager) of every device of an entry, for the platforms."""
+    hub = hass.data[DOMAIN].get("hubs", {}).get(entry.entry_id)
+    if hub is not None:
+        return [(hub.devices[slave_id], hub.managers[slave_id]) for slave_id in hub.devices]
+    return [(
+        hass.data[DOMAIN]["coordinators"][entry.entry_id],
+        hass.data[DOMAIN]["entity_managers"][entry.entry_id],
+    )]
+
+
+def get_entry_coordinator(
+    hass: HomeAssistant, entry_id: str, slave_id: int | None = None
+) -> ModbusWizardCoordinator | None:
+    """Coordinator of a single-device entry, or of one slave of a hub entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    hub = domain_data.get("hubs", {}).get(entry_id)
+    if hub is not None:
+        if slave_id is None and len(hub.devices) == 1:
+            return next(iter(hub.devices.values()))
+        return hub.devices.get(slave_id)
+    return domain_data.get("coordinators", {}).get(entry_id)
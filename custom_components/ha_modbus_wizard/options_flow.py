@@ -2,34 +2,87 @@
 from __future__ import annotations
 import logging
 import json
-from datetime import timedelta
 import voluptuous as vol
-import os
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
 from .const import (
     DOMAIN,
+    CONF_BUS_BUDGET,
+    CONF_DEVICES,
+    CONF_NAME,
+    CONF_SLAVE_ID,
+    CONF_TEMPLATE,
     CONF_UPDATE_INTERVAL,
-    CONF_ENTITIES,
 )
+from .register_import import parse_register_import
+from .register_store import get_register_store
+from .template_catalog import SOURCE_USER, TemplateError, get_catalog
+
 _LOGGER = logging.getLogger(__name__)
 
+MAX_SLAVE_ID = 247
+# Registers shown per page in the list / edit selectors
+ENTITY_PAGE_SIZE = 50
+# Row errors shown in the import form; the rest are only logged
+MAX_IMPORT_ERRORS_SHOWN = 10
+
+
+def _template_options(templates: dict[str, dict]) -> list[selector.SelectOptionDict]:
+    """Template picker entries, sorted by vendor and model."""
+    return [
+        selector.SelectOptionDict(
+            value=template_id,
+            label=" ".join(filter(None, (entry["vendor"], entry["model"])))
+            + f" ({entry['registers']} registers)"
+            + (" [user]" if entry["source"] == SOURCE_USER else ""),
+        )
+        for template_id, entry in sorted(
+            templates.items(),
+            key=lambda item: (item[1]["vendor"].lower(), item[1]["model"].lower()),
+        )
+    ]
+
+
 class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
     """Handle options flow for Modbus Wizard."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry):
         # self.config_entry = config_entry
-        self._entities: list[dict] = list(config_entry.options.get(CONF_ENTITIES, []))
+        # Loaded from the entry's register store by the first step
+        self._entities: list[dict] = []
+        self._loaded = False
         self._edit_index: int | None = None
+        # Register edits are staged and committed together via "save_changes"
+        self._pending_changes = 0
+        # Search text and page of the list / edit selectors
+        self._search = ""
+        self._page = 1
         
     async def async_step_init(self, user_input=None):
-            menu_options = {
+            if not self._loaded:
+                registers = await get_register_store(self.hass, self.config_entry.entry_id).async_load()
+                self._entities = [dict(r) for r in registers]
+                self._loaded = True
+
+            menu_options = {}
+            if self._pending_changes:
+                # Staged edits only live in this dialog until saved
+                menu_options["save_changes"] = (
+                    f"Save changes ({self._pending_changes} unsaved, lost if this dialog is closed)"
+                )
+                menu_options["discard_changes"] = "Discard unsaved changes"
+            menu_options |= {
                 "settings": "Settings",
                 "add_entity": "Add Entity",
+                "import_registers": "Import registers (CSV / JSON)",
                 "load_template": "Load device template",
             }
+            coordinator = self._get_coordinator()
+            if coordinator and await coordinator.async_load_scan_result():
+                menu_options["add_from_scan"] = "Add from register scan"
             if len(self._entities) > 0:
                 menu_options["list_entities"] = f"Entities ({len(self._entities)})"
                 menu_options["edit_entity"] = "Edit Entity"
@@ -38,34 +91,56 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
                 menu_options=menu_options,
             )
 
+    # ------------------------------------------------------------------
+    # Commit staged changes
+    # ------------------------------------------------------------------
+    async def async_step_save_changes(self, user_input=None):
+        """Write all staged register changes in one options update."""
+        self._save_registers()
+        _LOGGER.info("Saved %d staged register change(s)", self._pending_changes)
+        self._pending_changes = 0
+        return self.async_abort(reason="changes_saved")
+
+    async def async_step_discard_changes(self, user_input=None):
+        """Drop all staged register changes."""
+        _LOGGER.info("Discarded %d staged register change(s)", self._pending_changes)
+        self._pending_changes = 0
+        return self.async_abort(reason="changes_discarded")
+
+    @callback
+    def async_remove(self) -> None:
+        """Called when the flow ends, also when the dialog is just closed."""
+        if self._pending_changes:
+            _LOGGER.warning(
+                "Options of %s closed without saving; %d staged register change(s) were discarded",
+                self.config_entry.title,
+                self._pending_changes,
+            )
+
     # ------------------------------------------------------------------
     # Edit
     # ------------------------------------------------------------------
     async def async_step_edit_entity(self, user_input=None):
-        """Select which register to edit."""
+        """Select which register to edit (searchable, one page at a time)."""
         if user_input is not None:
-            self._edit_index = int(user_input["register"])
-            return await self.async_step_edit_entity_form()
-    
-        # Create dropdown options: index -> display label
-        options = [
-            selector.SelectOptionDict(
-                value=str(i),
-                label=f"{r['name']} (Address {r['address']}, {r.get('data_type', 'uint16')})"
-            )
-            for i, r in enumerate(self._entities)
-        ]
-    
+            if user_input.get("register"):
+                self._edit_index = int(user_input["register"])
+                return await self.async_step_edit_entity_form()
+            if not self._set_page(user_input):
+                return await self.async_step_init()
+
+        options, placeholders = self._entity_page()
         return self.async_show_form(
             step_id="edit_entity",
-            data_schema=vol.Schema({
-                vol.Required("register"): selector.SelectSelector(
+            data_schema=self._page_schema().extend({
+                vol.Optional("register"): selector.SelectSelector(
                     selector.SelectSelectorConfig(
                         options=options,
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 )
             }),
+            description_placeholders=placeholders,
         )
         
     # ------------------------------------------------------------------
@@ -103,8 +178,8 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
     
             if not errors:
                 self._entities[self._edit_index] = user_input
-                self._save_options({CONF_ENTITIES: self._entities})
-                _LOGGER.info("Register '%s' updated", user_input.get("name"))
+                self._pending_changes += 1
+                _LOGGER.info("Register '%s' updated (staged)", user_input.get("name"))
                 return await self.async_step_init()
     
         # Prepare defaults from existing register
@@ -124,6 +199,10 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
             "min": reg.get("min"),
             "max": reg.get("max"),
             "step": reg.get("step", 1),
+            "publish_interval": reg.get("publish_interval", 0),
+            "history_size": reg.get("history_size", 0),
+            "bit": reg.get("bit"),
+            "priority": reg.get("priority", "normal"),
         }
 
         return self.async_show_form(
@@ -138,18 +217,12 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             interval = user_input[CONF_UPDATE_INTERVAL]
 
-            coordinator = (
-                self.hass.data
-                .get(DOMAIN, {})
-                .get("coordinators", {})
-                .get(self.config_entry.entry_id)
-            )
-            if coordinator:
-                coordinator.update_interval = timedelta(seconds=interval)
-                _LOGGER.debug("Updated coordinator interval to %d seconds", interval)
-
-            # Save settings - preserve ALL existing options
-            self._save_options({CONF_UPDATE_INTERVAL: interval})
+            # The entry update listener reschedules the coordinator on its bus.
+            # Save settings - preserve ALL existing options, include staged registers
+            if self._pending_changes:
+                self._save_registers()
+                self._pending_changes = 0
+            self._save_options({CONF_UPDATE_INTERVAL: interval, CONF_BUS_BUDGET: user_input[CONF_BUS_BUDGET]})
             
             return self.async_abort(reason="settings_updated")
 
@@ -161,7 +234,11 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required(CONF_UPDATE_INTERVAL, default=current): vol.All(
                     vol.Coerce(int), vol.Range(min=5, max=300)
-                )
+                ),
+                # Shared by all entries on the connection; the lowest one set applies
+                vol.Required(CONF_BUS_BUDGET, default=self.config_entry.options.get(CONF_BUS_BUDGET, 0)): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=100)
+                ),
             }),
         )
 
@@ -201,8 +278,8 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
             if not errors:
                 _LOGGER.debug("Adding register: %s", user_input)
                 self._entities.append(user_input)
-                self._save_options({CONF_ENTITIES: self._entities})
-                _LOGGER.info("Register added. Total: %d", len(self._entities))
+                self._pending_changes += 1
+                _LOGGER.info("Register added (staged). Total: %d", len(self._entities))
                 return await self.async_step_init()
 
         return self.async_show_form(
@@ -216,7 +293,12 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
     # ------------------------------------------------------------------
 
     async def async_step_list_entities(self, user_input=None):
-        """List and optionally delete registers."""
+        """List and optionally delete registers (searchable, one page at a time).
+
+        Submitting with a new search or page shows that page; submitting
+        without changing them deletes the ticked registers and returns to
+        the menu.
+        """
         if user_input is not None:
             delete = set(user_input.get("delete", []))
             if delete:
@@ -225,23 +307,139 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
                     r for i, r in enumerate(self._entities)
                     if str(i) not in delete
                 ]
-                self._save_options({CONF_ENTITIES: self._entities})
-                _LOGGER.info("Deleted %d registers. Remaining: %d", len(delete), len(self._entities))
+                self._pending_changes += len(delete)
+                _LOGGER.info("Deleted %d registers (staged). Remaining: %d", len(delete), len(self._entities))
+                self._page = 1
+                return await self.async_step_init()
+            if not self._set_page(user_input):
+                return await self.async_step_init()
+
+        options, placeholders = self._entity_page()
+        return self.async_show_form(
+            step_id="list_entities",
+            data_schema=self._page_schema().extend({
+                vol.Optional("delete"): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                )
+            }),
+            description_placeholders=placeholders,
+        )
+
+    # ------------------------------------------------------------------
+    # BULK IMPORT
+    # ------------------------------------------------------------------
+
+    async def async_step_import_registers(self, user_input=None):
+        """Add many registers from pasted or uploaded CSV / JSON.
+
+        All rows are validated (and checked for address overlaps) before any
+        is added; they are then staged together like any other change.
+        """
+        errors = {}
+        placeholders = {"row_errors": ""}
+
+        if user_input is not None:
+            text = user_input.get("registers", "")
+            if user_input.get("file"):
+                try:
+                    text = await self.hass.async_add_executor_job(
+                        _read_uploaded_file, self.hass, user_input["file"]
+                    )
+                except (OSError, UnicodeDecodeError, ValueError) as err:
+                    _LOGGER.error("Failed to read uploaded register file: %s", err)
+                    errors["file"] = "import_file_unreadable"
+
+            if not errors:
+                registers, row_errors = parse_register_import(text, self._entities)
+                if row_errors:
+                    _LOGGER.warning("Register import rejected: %s", "; ".join(row_errors))
+                    errors["base"] = "import_invalid"
+                    shown = row_errors[:MAX_IMPORT_ERRORS_SHOWN]
+                    if len(row_errors) > len(shown):
+                        shown.append(f"... and {len(row_errors) - len(shown)} more (see log)")
+                    placeholders["row_errors"] = "\n".join(f"- {line}" for line in shown)
+                else:
+                    self._entities.extend(registers)
+                    self._pending_changes += len(registers)
+                    _LOGGER.info("Imported %d registers (staged)", len(registers))
+                    return await self.async_step_init()
+
+        return self.async_show_form(
+            step_id="import_registers",
+            data_schema=vol.Schema({
+                vol.Optional("registers", default=(user_input or {}).get("registers", "")):
+                    selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+                vol.Optional("file"): selector.FileSelector(
+                    selector.FileSelectorConfig(accept=".csv,.json,text/csv,application/json")
+                ),
+            }),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+    # ------------------------------------------------------------------
+    # ADD FROM SCAN
+    # ------------------------------------------------------------------
+
+    async def async_step_add_from_scan(self, user_input=None):
+        """Create registers from the ranges found by the last register scan."""
+        coordinator = self._get_coordinator()
+        scan = await coordinator.async_load_scan_result() if coordinator else None
+        if not scan:
+            return self.async_abort(reason="no_scan_result")
+
+        ranges = [
+            (reg_type, int(first), int(last))
+            for reg_type, found in scan.get("ranges", {}).items()
+            for first, last in found
+        ]
+
+        if user_input is not None:
+            chosen = {ranges[int(i)] for i in user_input.get("ranges", [])}
+            existing_keys = {
+                (r.get("register_type"), int(r.get("address", -1)))
+                for r in self._entities
+            }
+            added = 0
+            for reg_type, first, last in sorted(chosen, key=lambda r: (r[0], r[1])):
+                for address in range(first, last + 1):
+                    if (reg_type, address) in existing_keys:
+                        continue
+                    self._entities.append({
+                        "name": f"{reg_type.title()} {address}",
+                        "address": address,
+                        "data_type": "uint16",
+                        "register_type": reg_type,
+                        "rw": "read",
+                        "size": 1,
+                        "allow_bits": reg_type in ("coil", "discrete"),
+                    })
+                    existing_keys.add((reg_type, address))
+                    added += 1
+
+            if added:
+                self._pending_changes += added
+                _LOGGER.info("Added %d registers from scan (staged)", added)
             return await self.async_step_init()
 
-        # Create selection options with index as value
+        if not ranges:
+            return self.async_abort(reason="scan_found_nothing")
+
         options = [
             selector.SelectOptionDict(
                 value=str(i),
-                label=f"{r['name']} (Address {r['address']}, {r.get('data_type', 'uint16')})"
+                label=f"{reg_type} {first}–{last} ({last - first + 1} addresses)",
             )
-            for i, r in enumerate(self._entities)
+            for i, (reg_type, first, last) in enumerate(ranges)
         ]
 
         return self.async_show_form(
-            step_id="list_entities",
+            step_id="add_from_scan",
             data_schema=vol.Schema({
-                vol.Optional("delete"): selector.SelectSelector(
+                vol.Optional("ranges"): selector.SelectSelector(
                     selector.SelectSelectorConfig(
                         options=options,
                         multiple=True,
@@ -249,108 +447,73 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
                     )
                 )
             }),
+            description_placeholders={
+                "complete": "complete" if scan.get("complete") else "partial",
+            },
         )
-    # ------------------------------------------------------------------
-    # template HELPERS
-    # ------------------------------------------------------------------
-    @staticmethod
-    def _load_template_file(path: str):
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+
     # ------------------------------------------------------------------
     # Load Template
     # ------------------------------------------------------------------
     async def async_step_load_template(self, user_input=None):
+        catalog = get_catalog(self.hass)
+
         if user_input and "template" in user_input:
-            template_name = user_input["template"]
-            template_path = self.hass.config.path(
-                "custom_components", DOMAIN, "templates", f"{template_name}.json"
-            )
-    
+            template_id = user_input["template"]
             try:
-                template_data = await self.hass.async_add_executor_job(
-                    self._load_template_file, template_path
-                )
-    
-                if not isinstance(template_data, list):
-                    raise ValueError("Template must be a list")
-    
-                existing_keys = {
-                    (r.get("name"), r.get("address"))
-                    for r in self._entities
-                }
-    
-                added = 0
-                for reg in template_data:
-                    if not isinstance(reg, dict):
-                        continue
-                    if "name" not in reg or "address" not in reg:
-                        continue
-    
-                    key = (reg["name"], reg["address"])
-                    if key in existing_keys:
-                        continue
-                    reg["address"] = int(reg["address"]) # make sure these are integers
-                    reg["size"] = int(reg.get("size", 1))
-                    self._entities.append(reg)
-                    existing_keys.add(key)
-                    added += 1
-    
-                if not added:
-                    return self.async_show_form(
-                        step_id="load_template",
-                        errors={"base": "template_empty_or_duplicate"},
-                    )
-    
-                self._save_options({CONF_ENTITIES: self._entities})
-                return await self.async_step_init()
-    
+                # Already validated and normalised by the catalog
+                template_regs = await catalog.async_load(template_id)
             except FileNotFoundError:
                 return self.async_show_form(
                     step_id="load_template",
                     errors={"base": "template_not_found"},
                 )
-            except json.JSONDecodeError:
+            except TemplateError:
                 return self.async_show_form(
                     step_id="load_template",
                     errors={"base": "invalid_template"},
                 )
             except Exception as err:
-                _LOGGER.error("Failed to load template %s: %s", template_name, err)
+                _LOGGER.error("Failed to load template %s: %s", template_id, err)
                 return self.async_show_form(
                     step_id="load_template",
                     errors={"base": "load_failed"},
                 )
-    
-        # ---- List templates ----
-        templates_dir = self.hass.config.path(
-            "custom_components", DOMAIN, "templates"
-        )
-    
-        try:
-            templates = sorted(
-                f[:-5]
-                for f in os.listdir(templates_dir)
-                if f.endswith(".json")
-            )
-        except Exception:
-            templates = []
-    
+
+            existing_keys = {
+                (r.get("name"), int(r.get("address", -1)))
+                for r in self._entities
+            }
+
+            added = 0
+            for reg in template_regs:
+                key = (reg["name"], reg["address"])
+                if key in existing_keys:
+                    continue
+                self._entities.append(reg)
+                existing_keys.add(key)
+                added += 1
+
+            if not added:
+                return self.async_show_form(
+                    step_id="load_template",
+                    errors={"base": "template_empty_or_duplicate"},
+                )
+
+            self._pending_changes += added
+            return await self.async_step_init()
+
+        # ---- List templates (from the cached index) ----
+        templates = await catalog.async_get_catalog()
         if not templates:
             return self.async_abort(reason="no_templates")
-    
+
         return self.async_show_form(
             step_id="load_template",
             data_schema=vol.Schema({
                 vol.Required("template"): selector.SelectSelector(
                     selector.SelectSelectorConfig(
-                        options=[
-                            selector.SelectOptionDict(
-                                value=t,
-                                label=t.replace("_", " ").title(),
-                            )
-                            for t in templates
-                        ],
+                        options=_template_options(templates),
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 )
@@ -414,21 +577,227 @@ class ModbusWizardOptionsFlow(config_entries.OptionsFlow):
             vol.Optional("min", default=defaults.get("min")): vol.Any(None,vol.Coerce(float)),
             vol.Optional("max", default=defaults.get("max")): vol.Any(None,vol.Coerce(float)),
             vol.Optional("step", default=defaults.get("step", 1)): vol.Coerce(float),
+            # Seconds; > 0 samples every poll but publishes min/avg/max once per interval
+            vol.Optional("publish_interval", default=defaults.get("publish_interval", 0)):
+                vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+            # Number of recent samples kept in memory for get_history (0 = off)
+            vol.Optional("history_size", default=defaults.get("history_size", 0)):
+                vol.All(vol.Coerce(int), vol.Range(min=0, max=100000)),
+            # Single bit of the register; writable bit registers become switches
+            vol.Optional("bit", default=defaults.get("bit")):
+                vol.Any(None, vol.All(vol.Coerce(int), vol.Range(min=0, max=15))),
+            # Low priority registers are read less often first when the bus budget is exceeded
+            vol.Optional("priority", default=defaults.get("priority", "normal")):
+                selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=["high", "normal", "low"])
+                ),
         })
 
+    def _page_schema(self) -> vol.Schema:
+        """Search and page fields of the list / edit selectors."""
+        return vol.Schema({
+            vol.Optional("search", default=self._search): str,
+            vol.Optional("page", default=self._page): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        })
+
+    def _set_page(self, user_input: dict) -> bool:
+        """Take search and page from a submitted form; True if either changed."""
+        search = user_input.get("search", "").strip()
+        page = int(user_input.get("page", self._page))
+        if search != self._search:
+            # A new search starts on its first page
+            page = 1
+        changed = (search, page) != (self._search, self._page)
+        self._search, self._page = search, page
+        return changed
+
+    def _entity_page(self) -> tuple[list[selector.SelectOptionDict], dict[str, str]]:
+        """Selector options for the current search and page.
+
+        The search matches a part of the name or the exact address. Option
+        values are indexes into the full register list.
+        """
+        needle = self._search.casefold()
+        matches = [
+            (i, r) for i, r in enumerate(self._entities)
+            if not needle
+            or needle in r["name"].casefold()
+            or needle == str(r.get("address"))
+        ]
+        pages = max(1, -(-len(matches) // ENTITY_PAGE_SIZE))
+        self._page = min(self._page, pages)
+        first = (self._page - 1) * ENTITY_PAGE_SIZE
+
+        options = [
+            selector.SelectOptionDict(
+                value=str(i),
+                label=f"{r['name']} (Address {r['address']}, {r.get('data_type', 'uint16')})"
+            )
+            for i, r in matches[first:first + ENTITY_PAGE_SIZE]
+        ]
+        return options, {
+            "page": str(self._page),
+            "pages": str(pages),
+            "matches": str(len(matches)),
+            "total": str(len(self._entities)),
+        }
+
+    def _get_coordinator(self):
+        return (
+            self.hass.data
+            .get(DOMAIN, {})
+            .get("coordinators", {})
+            .get(self.config_entry.entry_id)
+        )
+
     def _save_options(self, updates: dict) -> None:
-        """Save the current registers list, preserving other options."""
+        """Save settings, preserving other options."""
         new_options = dict(self.config_entry.options)  # full copy
         # Update only the specified keys
         new_options.update(updates)
-        for r in self._entities:
-            r["address"] = int(r["address"])  # make sure we have integers for those, no floats creep through
-            r["size"] = int(r.get("size", 1))
+        # The entry update listener applies the change in place (no reload)
         self.hass.config_entries.async_update_entry(
             self.config_entry,
             options=new_options,
         )
-        # Trigger reload so entities are recreated
-        self.hass.async_create_task(
-            self.hass.config_entries.async_reload(self.config_entry.entry_id)
+
+    def _save_registers(self) -> None:
+        """Save the current registers list to the entry's register store."""
+        for r in self._entities:
+            r["address"] = int(r["address"])  # make sure we have integers for those, no floats creep through
+            r["size"] = int(r.get("size", 1))
+        # Written to disk shortly after; the entry applies the change in place (no reload)
+        get_register_store(self.hass, self.config_entry.entry_id).async_set(self._entities)
+
+
+def _read_uploaded_file(hass, file_id: str) -> str:
+    """Content of a file from the form's file selector (blocking)."""
+    from homeassistant.components.file_upload import process_uploaded_file
+
+    with process_uploaded_file(hass, file_id) as path:
+        return path.read_text(encoding="utf-8")
+
+
+class ModbusWizardHubOptionsFlow(config_entries.OptionsFlow):
+    """Manage the slaves of a hub entry.
+
+    Each slave only stores its ID, name and template; the registers come
+    from the template, so 40 identical meters share one register list.
+    Saving the device list reloads the hub.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        self._devices: list[dict] = [dict(d) for d in config_entry.options.get(CONF_DEVICES, [])]
+
+    async def async_step_init(self, user_input=None):
+        menu_options = {
+            "settings": "Settings",
+            "add_devices": "Add devices",
+        }
+        if self._devices:
+            menu_options["remove_devices"] = f"Remove devices ({len(self._devices)})"
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    async def async_step_settings(self, user_input=None):
+        if user_input is not None:
+            self._save_options({
+                CONF_UPDATE_INTERVAL: user_input[CONF_UPDATE_INTERVAL],
+                CONF_BUS_BUDGET: user_input[CONF_BUS_BUDGET],
+            })
+            return self.async_abort(reason="settings_updated")
+
+        current = self.config_entry.options.get(CONF_UPDATE_INTERVAL, 10)
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema({
+                vol.Required(CONF_UPDATE_INTERVAL, default=current): vol.All(
+                    vol.Coerce(int), vol.Range(min=5, max=300)
+                ),
+                # Shared by all entries on the connection; the lowest one set applies
+                vol.Required(CONF_BUS_BUDGET, default=self.config_entry.options.get(CONF_BUS_BUDGET, 0)): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=100)
+                ),
+            }),
         )
+
+    async def async_step_add_devices(self, user_input=None):
+        """Add one slave, or a run of consecutive slave IDs using the same template."""
+        errors = {}
+        templates = await get_catalog(self.hass).async_get_catalog()
+        if not templates:
+            return self.async_abort(reason="no_templates")
+
+        if user_input is not None:
+            first = int(user_input[CONF_SLAVE_ID])
+            count = int(user_input["count"])
+            slave_ids = range(first, first + count)
+            in_use = {int(d[CONF_SLAVE_ID]) for d in self._devices}
+
+            if slave_ids[-1] > MAX_SLAVE_ID:
+                errors["base"] = "slave_out_of_range"
+            elif in_use.intersection(slave_ids):
+                errors["base"] = "slave_in_use"
+            else:
+                name = user_input[CONF_NAME].strip()
+                for slave_id in slave_ids:
+                    self._devices.append({
+                        CONF_SLAVE_ID: slave_id,
+                        CONF_NAME: f"{name} {slave_id}" if count > 1 else name,
+                        CONF_TEMPLATE: user_input[CONF_TEMPLATE],
+                    })
+                self._save_options({CONF_DEVICES: self._devices})
+                return self.async_abort(reason="devices_updated")
+
+        return self.async_show_form(
+            step_id="add_devices",
+            data_schema=vol.Schema({
+                vol.Required(CONF_NAME, default="Meter"): str,
+                vol.Required(CONF_SLAVE_ID, default=1): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_SLAVE_ID)
+                ),
+                vol.Required("count", default=1): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_SLAVE_ID)
+                ),
+                vol.Required(CONF_TEMPLATE): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=_template_options(templates),
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+            }),
+            errors=errors,
+        )
+
+    async def async_step_remove_devices(self, user_input=None):
+        if user_input is not None:
+            remove = {int(slave_id) for slave_id in user_input["devices"]}
+            if remove:
+                self._devices = [d for d in self._devices if int(d[CONF_SLAVE_ID]) not in remove]
+                self._save_options({CONF_DEVICES: self._devices})
+            return self.async_abort(reason="devices_updated")
+
+        options = [
+            selector.SelectOptionDict(
+                value=str(d[CONF_SLAVE_ID]),
+                label=f"{d[CONF_NAME]} (ID {d[CONF_SLAVE_ID]})",
+            )
+            for d in sorted(self._devices, key=lambda d: int(d[CONF_SLAVE_ID]))
+        ]
+        return self.async_show_form(
+            step_id="remove_devices",
+            data_schema=vol.Schema({
+                vol.Optional("devices", default=[]): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+            }),
+        )
+
+    def _save_options(self, updates: dict) -> None:
+        new_options = dict(self.config_entry.options)
+        new_options.update(updates)
+        # The entry update listener reloads the hub when its devices changed
+        self.hass.config_entries.async_update_entry(self.config_entry, options=new_options)
@@ -0,0 +1,98 @@
+"""Compiled poll plan for Modbus Wizard."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .const import TYPE_SIZES, reg_key
+
+_LOGGER = logging.getLogger(__name__)
+
+REGISTER_TYPES = ("auto", "holding", "input", "coil", "discrete")
+# Highest first; the bus budget stretches the last ones first
+PRIORITIES = ("high", "normal", "low")
+
+
+@dataclass(slots=True, frozen=True)
+class PlannedRegister:
+    """One register definition, validated and resolved for polling."""
+
+    key: str
+    name: str
+    address: int
+    count: int
+    register_type: str
+    data_type: str
+    byte_order: str
+    word_order: str
+    allow_bits: bool
+    publish_interval: float
+    history_size: int
+    # Single bit of the word (holding/input) or of the coils read (coil/discrete)
+    bit: int | None
+    priority: str
+    info: dict[str, Any]
+    # Index into the coordinator's ValueStore, assigned by compile_plan
+    slot: int = -1
+
+
+def compile_register(reg: dict[str, Any]) -> PlannedRegister:
+    """Resolve a register definition from the options into a plan entry."""
+    data_type = str(reg.get("data_type", "uint16")).lower()
+    register_type = str(reg.get("register_type", "holding")).lower()
+    if register_type not in REGISTER_TYPES:
+        raise ValueError(f"unknown register_type '{register_type}'")
+
+    priority = str(reg.get("priority") or "normal").lower()
+    if priority not in PRIORITIES:
+        raise ValueError(f"unknown priority '{priority}'")
+
+    bit = reg.get("bit")
+    count = int(TYPE_SIZES.get(data_type, 1))
+    if bit is not None:
+        bit = int(bit)
+        if not 0 <= bit <= 15:
+            raise ValueError(f"bit {bit} out of range")
+        if register_type in ("coil", "discrete"):
+            count = max(count, bit + 1)
+
+    return PlannedRegister(
+        key=reg_key(reg["name"]),
+        name=reg["name"],
+        address=int(reg["address"]),
+        count=count,
+        register_type=register_type,
+        data_type=data_type,
+        byte_order=reg.get("byte_order", "big"),
+        word_order=reg.get("word_order", "big"),
+        allow_bits=bool(reg.get("allow_bits", False)),
+        publish_interval=float(reg.get("publish_interval") or 0),
+        history_size=max(0, int(reg.get("history_size") or 0)),
+        bit=bit,
+        priority=priority,
+        info=reg,
+    )
+
+
+def compile_plan(registers: list[dict[str, Any]]) -> list[PlannedRegister]:
+    """Compile all register definitions; invalid ones are logged and skipped.
+
+    Registers get value slots in order of first appearance of their key.
+    """
+    plan: list[PlannedRegister] = []
+    slots: dict[str, int] = {}
+    for reg in registers:
+        try:
+            planned = compile_register(reg)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.error("Skipping invalid register definition %s: %s", reg, err)
+            continue
+        plan.append(replace(planned, slot=slots.setdefault(planned.key, len(slots))))
+    return plan
+
+
+def plan_keys(plan: list[PlannedRegister]) -> list[str]:
+    """Value keys of a plan, in slot order."""
+    return list(dict.fromkeys(planned.key for planned in plan))
@@ -0,0 +1,133 @@
+"""On-demand profiling of the Modbus Wizard poll path."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import ModbusWizardCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_PROFILE_COMPLETE = f"{DOMAIN}_profile_complete"
+
+DEFAULT_PROFILE_CYCLES = 10
+DEFAULT_PROFILE_TOP = 30
+
+
+class PollProfiler:
+    """cProfile (and optionally tracemalloc) over the next N polls of some coordinators.
+
+    One profiler is shared by all coordinators being profiled, since only one
+    profiler can be active per thread. It is enabled while at least one of
+    their refresh cycles (read, decode and entity updates) is running.
+    Coordinators only check their ``profiler`` attribute per cycle, so
+    nothing is paid when no profiling session is active.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[ModbusWizardCoordinator],
+        cycles: int = DEFAULT_PROFILE_CYCLES,
+        memory: bool = False,
+        top: int = DEFAULT_PROFILE_TOP,
+    ) -> None:
+        self.hass = hass
+        self.cycles = cycles
+        self.memory = memory
+        self.top = top
+        self._remaining = {id(c): cycles for c in coordinators}
+        self._coordinators = coordinators
+        self._profile = cProfile.Profile()
+        self._active = 0
+        self._started_tracemalloc = False
+
+    @callback
+    def async_start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for coordinator in self._coordinators:
+            coordinator.profiler = self
+        _LOGGER.info(
+            "Profiling %d poll cycles of %d Modbus Wizard coordinator(s)",
+            self.cycles,
+            len(self._coordinators),
+        )
+
+    def enter(self) -> None:
+        if self._active == 0:
+            self._profile.enable()
+        self._active += 1
+
+    def exit(self, coordinator: ModbusWizardCoordinator) -> None:
+        self._active -= 1
+        if self._active == 0:
+            self._profile.disable()
+
+        self._remaining[id(coordinator)] -= 1
+        if self._remaining[id(coordinator)] <= 0:
+            coordinator.profiler = None
+            self._check_done()
+
+    def discard(self, coordinator: ModbusWizardCoordinator) -> None:
+        """Stop waiting for a coordinator that is being unloaded."""
+        coordinator.profiler = None
+        self._remaining[id(coordinator)] = 0
+        self._check_done()
+
+    def _check_done(self) -> None:
+        if self._remaining and all(left <= 0 for left in self._remaining.values()):
+            self._remaining = {}
+            self.hass.async_create_background_task(
+                self._async_finish(), name=f"{DOMAIN} profile report"
+            )
+
+    async def _async_finish(self) -> None:
+        snapshot = None
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        base = self.hass.config.path(DOMAIN, "profiles", time.strftime("poll_%Y%m%d_%H%M%S"))
+        result = await self.hass.async_add_executor_job(self._write_report, base, snapshot)
+        _LOGGER.info("Poll profile written to %s", result["profile"])
+        self.hass.bus.async_fire(EVENT_PROFILE_COMPLETE, result)
+
+    def _write_report(self, base: str, snapshot: tracemalloc.Snapshot | None) -> dict[str, Any]:
+        """Blocking: write the .prof file and a top-N text summary."""
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        self._profile.dump_stats(f"{base}.prof")
+
+        out = io.StringIO()
+        out.write(f"Modbus Wizard poll profile: {self.cycles} cycles of {len(self._coordinators)} coordinator(s)\n\n")
+        try:
+            stats = pstats.Stats(self._profile, stream=out)
+        except TypeError:
+            # No cycle ran (e.g. the device was unloaded first)
+            out.write("No poll cycles were profiled.\n")
+        else:
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+
+        if snapshot is not None:
+            out.write(f"\nTop {self.top} allocations by line:\n")
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                out.write(f"{stat}\n")
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+        return {"profile": f"{base}.prof", "summary": f"{base}.txt"}
@@ -0,0 +1,132 @@
+"""Bulk register import for the Modbus Wizard options flow."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any
+
+from .template_catalog import TemplateError, normalize_register
+
+# CSV columns holding JSON (select options) rather than plain text
+JSON_COLUMNS = ("options",)
+BIT_TYPES = ("coil", "discrete")
+
+
+def _parse_rows(text: str) -> list[tuple[int, Any]]:
+    """Split pasted text into (row number, raw register) pairs.
+
+    JSON is a register list, or an object with a "registers" list as in
+    template files; rows are numbered from 1. Anything else is CSV with a
+    header line, rows numbered as the line they are on.
+    """
+    text = text.strip().lstrip("\ufeff")
+    if not text:
+        return []
+    if text[:1] in ("[", "{"):
+        try:
+            content = json.loads(text)
+        except ValueError as err:
+            raise TemplateError(f"invalid JSON: {err}") from err
+        if isinstance(content, dict):
+            content = content.get("registers")
+        if not isinstance(content, list):
+            raise TemplateError("JSON must be a list of registers or an object with 'registers'")
+        return list(enumerate(content, start=1))
+
+    reader = csv.DictReader(io.StringIO(text), skipinitialspace=True)
+    if not reader.fieldnames or "name" not in reader.fieldnames or "address" not in reader.fieldnames:
+        raise TemplateError("CSV needs a header line with at least 'name' and 'address'")
+
+    rows = []
+    for row in reader:
+        # Empty cells fall back to the register defaults
+        reg: dict[str, Any] = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and isinstance(value, str) and value.strip()
+        }
+        if not reg:
+            continue
+        for column in JSON_COLUMNS:
+            if column in reg:
+                try:
+                    reg[column] = json.loads(reg[column])
+                except ValueError:
+                    pass  # left as text; validation reports it
+        if "allow_bits" in reg:
+            reg["allow_bits"] = reg["allow_bits"].lower() in ("1", "true", "yes", "on")
+        rows.append((reader.line_num, reg))
+    return rows
+
+
+def _span(reg: dict[str, Any]) -> tuple[int, int]:
+    return reg["address"], reg["address"] + int(reg.get("size", 1))
+
+
+def _overlaps(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    """Whether two registers read the same data.
+
+    "auto" may resolve to any register table, so it overlaps every type.
+    A single-bit register may share its word with the whole-word register
+    and with other bits; only the same bit twice overlaps.
+    """
+    type_a, type_b = a.get("register_type", "auto"), b.get("register_type", "auto")
+    if type_a != type_b and "auto" not in (type_a, type_b):
+        return False
+    if a.get("bit") != b.get("bit"):
+        return False
+    start_a, end_a = _span(a)
+    start_b, end_b = _span(b)
+    return start_a < end_b and start_b < end_a
+
+
+def _find_overlaps(
+    rows: list[tuple[int, dict[str, Any]]], existing: list[dict[str, Any]]
+) -> list[str]:
+    """Report rows overlapping an existing register or an earlier row."""
+    errors = []
+    placed: list[tuple[str, dict[str, Any]]] = [
+        (f"existing '{reg['name']}'", {**reg, "address": int(reg["address"])}) for reg in existing
+    ]
+    for line, reg in rows:
+        clash = next((label for label, other in placed if _overlaps(reg, other)), None)
+        if clash is not None:
+            errors.append(f"row {line}: '{reg['name']}' at {reg['address']} overlaps {clash}")
+            continue
+        placed.append((f"row {line}", reg))
+    return errors
+
+
+def parse_register_import(
+    text: str, existing: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Validate pasted or uploaded CSV/JSON registers in one pass.
+
+    Returns the normalised registers and one error message per bad row;
+    callers should import nothing unless the error list is empty. Besides
+    the per-register validation of templates, every row is checked for
+    address overlaps with the existing registers and the other rows.
+    """
+    try:
+        raw_rows = _parse_rows(text)
+    except TemplateError as err:
+        return [], [str(err)]
+
+    errors = []
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for line, raw in raw_rows:
+        try:
+            reg = normalize_register(raw)
+        except TemplateError as err:
+            errors.append(f"row {line}: {err}")
+            continue
+        if reg["register_type"] in BIT_TYPES:
+            reg["allow_bits"] = True
+        valid.append((line, reg))
+
+    errors.extend(_find_overlaps(valid, existing))
+    if not raw_rows:
+        errors.append("no registers found")
+    return [reg for _, reg in valid], errors
@@ -0,0 +1,95 @@
+"""Per-entry storage of register maps for Modbus Wizard."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Edits within this many seconds are written to disk together
+REGISTERS_SAVE_DELAY = 10
+
+SIGNAL_REGISTERS_UPDATED = f"{DOMAIN}_registers_updated_{{}}"
+
+
+def pack_registers(registers: list[dict[str, Any]]) -> dict[str, Any]:
+    """Columnar form of a register list: field names once, one row per register.
+
+    Fields a register does not have (or has set to None) are stored as null
+    and left out again by unpack_registers.
+    """
+    fields = list(dict.fromkeys(field for reg in registers for field in reg))
+    return {
+        "fields": fields,
+        "rows": [[reg.get(field) for field in fields] for reg in registers],
+    }
+
+
+def unpack_registers(data: dict[str, Any]) -> list[dict[str, Any]]:
+    fields = data.get("fields", [])
+    return [
+        {field: value for field, value in zip(fields, row) if value is not None}
+        for row in data.get("rows", [])
+    ]
+
+
+class RegisterStore:
+    """Register map of one config entry, kept out of the entry options.
+
+    Options are stored in core.config_entries together with every other
+    integration, so large register maps there rewrite that file on each
+    edit. Here each entry has its own file, written in compact columnar form
+    and with bursts of edits coalesced into one delayed write.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self.entry_id = entry_id
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.registers.{entry_id}")
+        self.registers: list[dict[str, Any]] = []
+        self.loaded = False
+
+    async def async_load(self) -> list[dict[str, Any]]:
+        """Load the register map once; later calls return the one in memory."""
+        if not self.loaded:
+            data = await self._store.async_load()
+            self.registers = unpack_registers(data) if isinstance(data, dict) else []
+            self.loaded = True
+        return self.registers
+
+    @callback
+    def async_set(self, registers: list[dict[str, Any]]) -> None:
+        """Replace the register map, schedule the write and notify the entry."""
+        self.registers = [dict(reg) for reg in registers]
+        self.loaded = True
+        self._store.async_delay_save(self._data_to_save, REGISTERS_SAVE_DELAY)
+        async_dispatcher_send(self.hass, SIGNAL_REGISTERS_UPDATED.format(self.entry_id))
+
+    async def async_save(self, registers: list[dict[str, Any]]) -> None:
+        """Replace the register map and write it now (used by the migration)."""
+        self.registers = [dict(reg) for reg in registers]
+        self.loaded = True
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return pack_registers(self.registers)
+
+
+def get_register_store(hass: HomeAssistant, entry_id: str) -> RegisterStore:
+    """Return the register store of an entry, shared by setup and the options flow."""
+    stores = hass.data.setdefault(DOMAIN, {}).setdefault("register_stores", {})
+    store = stores.get(entry_id)
+    if store is None:
+        store = stores[entry_id] = RegisterStore(hass, entry_id)
+    return store
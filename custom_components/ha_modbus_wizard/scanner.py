@@ -0,0 +1,210 @@
+"""Register-map scanner for Modbus Wizard."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import ModbusWizardCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_SCAN_PROGRESS = f"{DOMAIN}_scan_progress"
+
+SCAN_REGISTER_TYPES = ("holding", "input", "coil", "discrete")
+SCAN_READ_METHODS = {
+    "holding": "read_holding_registers",
+    "input": "read_input_registers",
+    "coil": "read_coils",
+    "discrete": "read_discrete_inputs",
+}
+
+# Protocol limits per request (Modbus spec)
+MAX_REGISTER_BLOCK = 125
+MAX_BIT_BLOCK = 2000
+
+PROGRESS_INTERVAL = 0.5  # seconds between progress events
+
+# Modbus exception code 01: function code not supported by the device
+ILLEGAL_FUNCTION = 1
+
+# Requests in a row without any reply before the device is given up on
+MAX_CONSECUTIVE_TIMEOUTS = 5
+
+
+class RegisterScanner:
+    """Sweep an address range with binary-split block reads.
+
+    Each register type is read in maximum-size blocks. A block the device
+    answers with an exception reply (e.g. illegal data address) is split in
+    half and both halves are retried, so large readable areas cost a single
+    request and only the edges of readable ranges are narrowed down. A block
+    without any reply is taken as unreadable rather than split, and the scan
+    stops after MAX_CONSECUTIVE_TIMEOUTS of those in a row.
+    The coordinator lock is taken per request, so normal polling interleaves
+    with the scan instead of waiting for it to finish.
+    """
+
+    def __init__(
+        self,
+        coordinator: ModbusWizardCoordinator,
+        start: int,
+        end: int,
+        register_types: list[str] | tuple[str, ...] = SCAN_REGISTER_TYPES,
+    ) -> None:
+        self.coordinator = coordinator
+        self.start = max(0, int(start))
+        self.end = min(65535, int(end))
+        self.register_types = [t for t in register_types if t in SCAN_REGISTER_TYPES]
+
+        span = self.end - self.start + 1
+        self.total = span * len(self.register_types)
+        self.done = 0
+        self.requests = 0
+        self.current_type: str | None = None
+        self.ranges: dict[str, list[list[int]]] = {t: [] for t in self.register_types}
+        self._last_progress = 0.0
+        self._timeouts = 0
+        # Set when the device stopped answering
+        self.aborted: str | None = None
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    @property
+    def progress(self) -> dict[str, Any]:
+        """Snapshot of the scan progress."""
+        return {
+            "entry_id": self.coordinator.my_config_entry.entry_id,
+            "slave_id": self.coordinator.slave_id,
+            "register_type": self.current_type,
+            "done": self.done,
+            "total": self.total,
+            "percent": round(100 * self.done / self.total, 1) if self.total else 100.0,
+            "requests": self.requests,
+            "ranges": self.ranges,
+        }
+
+    def _report_progress(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.coordinator.hass.bus.async_fire(EVENT_SCAN_PROGRESS, self.progress)
+
+    # ------------------------------------------------------------------
+    # Scan
+    # ------------------------------------------------------------------
+
+    async def async_run(self) -> dict[str, Any]:
+        """Run the scan and return the resulting register map."""
+        started = datetime.now(UTC).isoformat()
+        complete = False
+        try:
+            for reg_type in self.register_types:
+                self.current_type = reg_type
+                await self._async_scan_type(reg_type)
+                if self.aborted:
+                    break
+            else:
+                complete = True
+        finally:
+            self.current_type = None
+            self._report_progress(force=True)
+            _LOGGER.info(
+                "Register scan %s: %d requests, ranges=%s",
+                "finished" if complete else "stopped",
+                self.requests,
+                {t: len(r) for t, r in self.ranges.items()},
+            )
+
+        return {
+            "slave_id": self.coordinator.slave_id,
+            "start": self.start,
+            "end": self.end,
+            "register_types": self.register_types,
+            "started": started,
+            "finished": datetime.now(UTC).isoformat(),
+            "complete": complete,
+            "aborted": self.aborted,
+            "requests": self.requests,
+            "ranges": self.ranges,
+        }
+
+    async def _async_scan_type(self, reg_type: str) -> None:
+        """Find the readable ranges for one register type."""
+        block = MAX_BIT_BLOCK if reg_type in ("coil", "discrete") else MAX_REGISTER_BLOCK
+        pending = deque(
+            (address, min(block, self.end - address + 1))
+            for address in range(self.start, self.end + 1, block)
+        )
+        found = self.ranges[reg_type]
+
+        while pending:
+            address, count = pending.popleft()
+            ok, code = await self._async_probe(reg_type, address, count)
+            self._timeouts = 0 if ok or code is not None else self._timeouts + 1
+
+            if ok:
+                # Merge with the previous range when adjacent
+                last = address + count - 1
+                if found and found[-1][1] + 1 == address:
+                    found[-1][1] = last
+                else:
+                    found.append([address, last])
+                self.done += count
+            elif code == ILLEGAL_FUNCTION:
+                _LOGGER.debug("Device does not support %s reads, skipping type", reg_type)
+                self.done += count + sum(c for _, c in pending)
+                pending.clear()
+            elif code is None:
+                # No reply: splitting would only multiply the timeouts
+                self.done += count
+                if self._timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
+                    self.aborted = f"no reply to {self._timeouts} requests in a row"
+                    _LOGGER.warning("Stopping register scan of slave %s: %s", self.coordinator.slave_id, self.aborted)
+                    return
+            elif count > 1:
+                half = count // 2
+                pending.appendleft((address + half, count - half))
+                pending.appendleft((address, half))
+            else:
+                self.done += 1
+
+            self._report_progress()
+
+    async def _async_probe(self, reg_type: str, address: int, count: int) -> tuple[bool, int | None]:
+        """Read one block; return (success, modbus exception code).
+
+        The code is None when there was no reply at all (timeout, connection
+        error). The wait is bounded by the client's own timeout, so a request
+        is never cancelled halfway through a frame on the bus.
+        """
+        from pymodbus.exceptions import ModbusException
+
+        method = getattr(self.coordinator.client, SCAN_READ_METHODS[reg_type])
+
+        self.requests += 1
+        async with self.coordinator._lock:
+            try:
+                result = await method(address=address, count=count, device_id=self.coordinator.slave_id)
+            except (ModbusException, TimeoutError) as err:
+                _LOGGER.debug("Scan read %s %d+%d failed: %s", reg_type, address, count, err)
+                result = None
+
+        # Give queued polls a chance to take the lock before the next block
+        await asyncio.sleep(0)
+
+        if result is None:
+            return False, None
+        if result.isError():
+            return False, getattr(result, "exception_code", None)
+        return True, None
@@ -4,81 +4,38 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers import entity_registry as er
-from .const import DOMAIN, CONF_ENTITIES, reg_key
+from .const import reg_key
+from .entity_manager import ModbusWizardEntityManager
+from .hub import entry_devices
+from .values import SlotRef
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    coordinator = hass.data[DOMAIN]["coordinators"][entry.entry_id]
-
-    device_info = DeviceInfo(
-        identifiers={(DOMAIN, entry.entry_id)},
-        name=entry.title or "Modbus Wizard",
-        manufacturer="Partach",
-        model="Wizard",
-    )
-
-    entities: dict[str, ModbusWizardSelect] = {}
-    ent_reg = er.async_get(hass)
-
-    def _unique_id(reg: dict[str, Any]) -> str:
-        return f"{entry.entry_id}_{reg['address']}_{reg.get('register_type', 'auto')}_select"
-
-    async def _sync_entities() -> None:
-        current_regs = entry.options.get(CONF_ENTITIES, [])
-        desired_ids = set()
-        new_entities: list[Entity] = []
-
-        for reg in current_regs:
-            options = reg.get("options")
-            if not options:
-                continue
-
-            uid = _unique_id(reg)
-            desired_ids.add(uid)
-
-            if uid in entities:
-                continue
-
-            entity = ModbusWizardSelect(
+    def _register(coordinator, manager: ModbusWizardEntityManager) -> None:
+        manager.async_register_platform(
+            "select",
+            async_add_entities,
+            wants=lambda reg: bool(reg.get("options")) and reg.get("bit") is None,
+            factory=lambda unique_id, reg: ModbusWizardSelect(
                 coordinator=coordinator,
                 entry=entry,
-                unique_id=uid,
-                key=reg_key(reg["name"]),
+                unique_id=unique_id,
                 info=reg,
-                device_info=device_info,
-            )
-            entities[uid] = entity
-            new_entities.append(entity)
-
-        if new_entities:
-            async_add_entities(new_entities)
-
-        for uid in list(entities):
-            if uid not in desired_ids:
-                entity = entities.pop(uid)
-                if entity.entity_id:
-                    ent_reg.async_remove(entity.entity_id)
-                    _LOGGER.debug("Removed entity registry entry %s", entity.entity_id)
-                await entity.async_remove()
-
-       # _LOGGER.debug("Select sync complete — active=%d", len(entities))
+                device_info=manager.device_info,
+            ),
+            registers=coordinator.registers,
+        )
 
-    async def _handle_options_update(hass: HomeAssistant, entry: ConfigEntry) -> None:
-        await _sync_entities()
-    
-    # only happens on init:   
-    await _sync_entities()
-    
-    remove_listener = entry.add_update_listener(_handle_options_update)
-    entry.async_on_unload(remove_listener)
+    # One device for a single-slave entry, one per slave for a hub entry
+    for coordinator, manager in entry_devices(hass, entry):
+        _register(coordinator, manager)
 
 
 class ModbusWizardSelect(CoordinatorEntity, SelectEntity):
@@ -90,17 +47,20 @@ class ModbusWizardSelect(CoordinatorEntity, SelectEntity):
         coordinator,
         entry: ConfigEntry,
         unique_id: str,
-        key: str,
         info: dict[str, Any],
         device_info: DeviceInfo,
     ):
         super().__init__(coordinator)
-        self._key = key
+        self._attr_unique_id = unique_id
+        self._attr_device_info = device_info
+        self._apply_info(info)
+
+    def _apply_info(self, info: dict[str, Any]) -> None:
+        self._key = reg_key(info["name"])
+        self._slot = SlotRef(self._key)
         self._info = info
 
-        self._attr_unique_id = unique_id
         self._attr_name = info.get("name")
-        self._attr_device_info = device_info
 
         # options expected as mapping {"0": "Off", "1": "On"}
         self._value_map = {str(k): v for k, v in info.get("options", {}).items()}
@@ -112,10 +72,22 @@ class ModbusWizardSelect(CoordinatorEntity, SelectEntity):
             self._attr_suggested_display_precision = info.get("precision", 2)
         elif info.get("data_type") in ("uint16", "int16", "uint32", "int32"):
             self._attr_suggested_display_precision = 0  # No decimals for integers
-            
+        else:
+            self._attr_suggested_display_precision = None
+
+    @callback
+    def async_update_info(self, info: dict[str, Any]) -> None:
+        """Apply a changed register definition without recreating the entity."""
+        self._apply_info(info)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @property
     def current_option(self):
-        raw = self.coordinator.data.get(self._key)
+        raw = self._slot.value(self.coordinator.values)
+        if isinstance(raw, float) and raw.is_integer():
+            # Scale is applied on decode, so integer registers read back as floats
+            raw = int(raw)
         return self._value_map.get(str(raw))
 
     async def async_select_option(self, option: str) -> None:
@@ -128,14 +100,13 @@ class ModbusWizardSelect(CoordinatorEntity, SelectEntity):
                 self._info.get("name"),
             )
             return
-        dt = self._info.get("data_type", "uint16").lower()
-        if not dt.startswith("float"):
-            value = int(round(value))
-        await self.coordinator.async_write_registers(
-            address=int(self._info["address"]),
-            value=int(value),
-            data_type=self._info.get("data_type", "uint16"),
-            byte_order=self._info.get("byte_order", "big"),
-            word_order=self._info.get("word_order", "big"),
-        )
-        await self.coordinator.async_request_refresh()
+        # Option keys are the register values as text
+        try:
+            number = float(value)
+        except ValueError:
+            _LOGGER.warning("Option %s of register %s has no numeric value %r", option, self._info.get("name"), value)
+            return
+        # Scale and offset are reversed, and integer types rounded, when encoding.
+        # Updates the entity from the device's read-back, no full refresh
+        if not await self.coordinator.async_write_value(self._info, int(number) if number.is_integer() else number):
+            _LOGGER.warning("Write to register %s failed", self._info.get("name"))
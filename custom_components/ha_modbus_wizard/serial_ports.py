@@ -0,0 +1,106 @@
+"""Cached serial port enumeration for Modbus Wizard."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Enumeration results are reused for this long before a background refresh
+PORT_CACHE_TTL = 30
+
+
+def _enumerate_ports() -> list[dict[str, Any]]:
+    """Blocking: list serial ports (walks sysfs on Linux)."""
+    import serial.tools.list_ports
+
+    return sorted(
+        (
+            {
+                "device": port.device,
+                "description": port.description,
+                "manufacturer": port.manufacturer,
+            }
+            for port in serial.tools.list_ports.comports()
+        ),
+        key=lambda port: port["device"],
+    )
+
+
+class SerialPortCache:
+    """Serial ports, enumerated in the executor and cached with a short TTL.
+
+    A stale cache is returned immediately while a refresh runs in the
+    background, and USB hotplug events (when HA's usb integration is loaded)
+    trigger a refresh, so the serial step never waits on enumeration after
+    the first call.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._ports: list[dict[str, Any]] | None = None
+        self._updated = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._async_listen_hotplug()
+
+    async def async_get_ports(self) -> list[dict[str, Any]]:
+        """Return the known serial ports."""
+        if self._ports is None:
+            await self._async_refresh()
+        elif time.monotonic() - self._updated > PORT_CACHE_TTL:
+            self._async_schedule_refresh()
+        return self._ports or []
+
+    async def _async_refresh(self) -> None:
+        try:
+            self._ports = await self.hass.async_add_executor_job(_enumerate_ports)
+            self._updated = time.monotonic()
+            _LOGGER.debug("Enumerated %d serial ports", len(self._ports))
+        except OSError as err:
+            # Also serial.SerialException, a subclass of OSError
+            _LOGGER.error("Serial port enumeration failed: %s", err)
+            if self._ports is None:
+                self._ports = []
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_background_task(
+                self._async_refresh(), name=f"{DOMAIN} serial port refresh"
+            )
+
+    @callback
+    def _async_listen_hotplug(self) -> None:
+        """Refresh on USB add/remove events when the usb integration supports it."""
+        try:
+            from homeassistant.components import usb
+
+            register = getattr(usb, "async_register_port_event_callback", None)
+            if register is None:
+                return
+
+            @callback
+            def _port_event(added, removed) -> None:
+                _LOGGER.debug("USB ports changed, refreshing serial port cache")
+                self._async_schedule_refresh()
+
+            register(self.hass, _port_event)
+        except (ImportError, KeyError) as err:
+            # usb not available on this platform (import) or not set up (no
+            # discovery data yet): TTL only
+            _LOGGER.debug("USB hotplug events unavailable: %s", err)
+
+
+def get_port_cache(hass: HomeAssistant) -> SerialPortCache:
+    """Return the shared serial port cache."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "serial_ports" not in domain_data:
+        domain_data["serial_ports"] = SerialPortCache(hass)
+    return domain_data["serial_ports"]
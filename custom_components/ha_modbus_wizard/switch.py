@@ -0,0 +1,88 @@
+"""Dynamic Switch entities for single register bits in Modbus Wizard."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import reg_key
+from .entity_manager import ModbusWizardEntityManager
+from .hub import entry_devices
+from .values import SlotRef
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    def _register(coordinator, manager: ModbusWizardEntityManager) -> None:
+        manager.async_register_platform(
+            "switch",
+            async_add_entities,
+            wants=lambda reg: reg.get("bit") is not None and reg.get("rw") in ("write", "rw"),
+            factory=lambda unique_id, reg: ModbusWizardSwitch(
+                coordinator=coordinator,
+                entry=entry,
+                unique_id=unique_id,
+                info=reg,
+                device_info=manager.device_info,
+            ),
+            registers=coordinator.registers,
+        )
+
+    # One device for a single-slave entry, one per slave for a hub entry
+    for coordinator, manager in entry_devices(hass, entry):
+        _register(coordinator, manager)
+
+
+class ModbusWizardSwitch(CoordinatorEntity, SwitchEntity):
+    """One bit of a holding register, or one coil."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator,
+        entry: ConfigEntry,
+        unique_id: str,
+        info: dict[str, Any],
+        device_info: DeviceInfo,
+    ):
+        super().__init__(coordinator)
+        self._attr_unique_id = unique_id
+        self._attr_device_info = device_info
+        self._apply_info(info)
+
+    def _apply_info(self, info: dict[str, Any]) -> None:
+        self._key = reg_key(info["name"])
+        self._slot = SlotRef(self._key)
+        self._info = info
+
+        self._attr_name = info.get("name")
+
+    @callback
+    def async_update_info(self, info: dict[str, Any]) -> None:
+        """Apply a changed register definition without recreating the entity."""
+        self._apply_info(info)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool | None:
+        value = self._slot.value(self.coordinator.values)
+        return None if value is None else bool(value)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_set(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_set(False)
+
+    async def _async_set(self, value: bool) -> None:
+        if not await self.coordinator.async_write_bit(self._info, value):
+            _LOGGER.warning("Write to register %s failed", self._info.get("name"))
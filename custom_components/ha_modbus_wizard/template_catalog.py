@@ -0,0 +1,320 @@
+"""Indexed device-template catalog for Modbus Wizard."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN, TYPE_SIZES
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+SOURCE_BUILTIN = "builtin"
+SOURCE_USER = "user"
+
+DATA_TYPES = ("uint16", "int16", "uint32", "int32", "float32", "uint64", "int64")
+REGISTER_TYPES = ("auto", "holding", "input", "coil", "discrete")
+RW_MODES = ("read", "write", "rw")
+PRIORITIES = ("high", "normal", "low")
+
+# Normalised templates kept in memory (most recently used)
+LOADED_CACHE_SIZE = 16
+
+
+class TemplateError(ValueError):
+    """A template file failed validation."""
+
+
+# ----------------------------------------------------------------------
+# Validation / normalisation
+# ----------------------------------------------------------------------
+
+def normalize_register(reg: Any) -> dict[str, Any]:
+    """Validate one register definition and return it in canonical form."""
+    if not isinstance(reg, dict):
+        raise TemplateError("register must be an object")
+
+    name = reg.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise TemplateError("register needs a non-empty name")
+
+    try:
+        address = int(reg["address"])
+    except (KeyError, TypeError, ValueError) as err:
+        raise TemplateError(f"'{name}': invalid or missing address") from err
+    if not 0 <= address <= 65535:
+        raise TemplateError(f"'{name}': address {address} out of range")
+
+    data_type = str(reg.get("data_type", "uint16")).lower()
+    if data_type not in DATA_TYPES:
+        raise TemplateError(f"'{name}': unknown data_type '{data_type}'")
+
+    register_type = str(reg.get("register_type", "input")).lower()
+    if register_type not in REGISTER_TYPES:
+        raise TemplateError(f"'{name}': unknown register_type '{register_type}'")
+
+    rw = str(reg.get("rw", "read")).lower()
+    if rw not in RW_MODES:
+        raise TemplateError(f"'{name}': unknown rw mode '{rw}'")
+
+    options = reg.get("options")
+    if options is not None and not isinstance(options, dict):
+        raise TemplateError(f"'{name}': options must be an object")
+
+    try:
+        normalized = {
+            **reg,
+            "name": name.strip(),
+            "address": address,
+            "data_type": data_type,
+            "register_type": register_type,
+            "rw": rw,
+            "size": TYPE_SIZES[data_type],
+            "scale": float(reg.get("scale", 1.0)),
+            "offset": float(reg.get("offset", 0.0)),
+            "byte_order": reg.get("byte_order", "big"),
+            "word_order": reg.get("word_order", "big"),
+            "allow_bits": bool(reg.get("allow_bits", False)),
+        }
+        for field in ("min", "max", "step", "publish_interval"):
+            if reg.get(field) is not None:
+                normalized[field] = float(reg[field])
+        if reg.get("history_size") is not None:
+            normalized["history_size"] = int(reg["history_size"])
+        if reg.get("bit") is not None:
+            normalized["bit"] = int(reg["bit"])
+            if not 0 <= normalized["bit"] <= 15:
+                raise TemplateError(f"'{name}': bit must be 0-15")
+        if reg.get("priority") is not None:
+            normalized["priority"] = str(reg["priority"]).lower()
+            if normalized["priority"] not in PRIORITIES:
+                raise TemplateError(f"'{name}': priority must be one of {', '.join(PRIORITIES)}")
+    except (TypeError, ValueError) as err:
+        raise TemplateError(f"'{name}': {err}") from err
+
+    if normalized["byte_order"] not in ("big", "little") or normalized["word_order"] not in ("big", "little"):
+        raise TemplateError(f"'{name}': byte_order/word_order must be 'big' or 'little'")
+    if options is None:
+        normalized.pop("options", None)
+    return normalized
+
+
+def parse_template(raw: bytes, name: str) -> dict[str, Any]:
+    """Parse and validate template file content.
+
+    Accepts the plain register list or an object with optional "vendor" and
+    "model" next to a "registers" list.
+    """
+    try:
+        content = json.loads(raw)
+    except ValueError as err:
+        raise TemplateError(f"invalid JSON: {err}") from err
+
+    if isinstance(content, list):
+        meta: dict[str, Any] = {}
+        registers = content
+    elif isinstance(content, dict) and isinstance(content.get("registers"), list):
+        meta = content
+        registers = content["registers"]
+    else:
+        raise TemplateError("template must be a list of registers or an object with 'registers'")
+
+    normalized = []
+    seen = set()
+    for reg in registers:
+        reg = normalize_register(reg)
+        key = (reg["name"], reg["address"])
+        if key in seen:
+            raise TemplateError(f"duplicate register '{reg['name']}' at {reg['address']}")
+        seen.add(key)
+        normalized.append(reg)
+
+    if not normalized:
+        raise TemplateError("template has no registers")
+
+    return {
+        "vendor": str(meta.get("vendor", "")),
+        "model": str(meta.get("model") or name.replace("_", " ").title()),
+        "registers": normalized,
+    }
+
+
+# ----------------------------------------------------------------------
+# Index (blocking, runs in the executor)
+# ----------------------------------------------------------------------
+
+def build_index(
+    directory: str,
+    previous: dict[str, Any] | None = None,
+    stats: dict[str, tuple[int, int]] | None = None,
+) -> tuple[dict[str, Any], dict[str, list]]:
+    """(Re)build the index of one template directory.
+
+    Entries are keyed on content: a file whose size and sha256 match the
+    previous index is hashed but not re-parsed. ``stats`` maps file names to
+    the (mtime, size) seen in this process; files whose stat still matches are
+    not read at all. It is updated in place and only ever kept in memory,
+    since mtimes do not survive an install. Returns the index and the
+    normalised registers of every file parsed in this pass.
+    """
+    old_entries = (previous or {}).get("templates", {})
+    if (previous or {}).get("version") != INDEX_VERSION:
+        old_entries = {}
+    if stats is None:
+        stats = {}
+    entries: dict[str, Any] = {}
+    parsed: dict[str, list] = {}
+
+    try:
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".json") and f != INDEX_FILE)
+    except FileNotFoundError:
+        stats.clear()
+        return {"version": INDEX_VERSION, "templates": {}}, parsed
+
+    for filename in files:
+        name = filename[:-5]
+        path = os.path.join(directory, filename)
+        stat = os.stat(path)
+        old = old_entries.get(name)
+        seen = (stat.st_mtime_ns, stat.st_size)
+
+        if old and stats.get(name) == seen and old.get("size") == stat.st_size:
+            entries[name] = old
+            continue
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        stats[name] = seen
+
+        if old and old.get("sha256") == digest and old.get("size") == len(raw):
+            entries[name] = old
+            continue
+
+        entry = {"file": filename, "sha256": digest, "size": len(raw)}
+        try:
+            template = parse_template(raw, name)
+        except TemplateError as err:
+            _LOGGER.warning("Template %s is invalid and will be hidden: %s", path, err)
+            entry["error"] = str(err)
+        else:
+            entry.update(
+                vendor=template["vendor"],
+                model=template["model"],
+                registers=len(template["registers"]),
+            )
+            parsed[digest] = template["registers"]
+        entries[name] = entry
+
+    for name in set(stats) - set(entries):
+        del stats[name]
+    return {"version": INDEX_VERSION, "templates": entries}, parsed
+
+
+def write_index(directory: str) -> dict[str, Any]:
+    """Build and write index.json of a template directory (for maintainers).
+
+    Used when adding built-in templates; the integration itself never writes
+    into its own directory at runtime.
+    """
+    index, _ = build_index(directory)
+    with open(os.path.join(directory, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return index
+
+
+def _read_index(directory: str) -> dict[str, Any] | None:
+    try:
+        with open(os.path.join(directory, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# Catalog
+# ----------------------------------------------------------------------
+
+class TemplateCatalog:
+    """Lazily loaded, cached catalog of built-in and user templates.
+
+    The index of each directory is kept in memory, seeded from a shipped
+    index.json if there is one. A refresh only stats the files and re-reads
+    those whose mtime or size changed since the last one; unchanged content
+    is recognised by its hash and not parsed again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.directories = {
+            SOURCE_BUILTIN: hass.config.path("custom_components", DOMAIN, "templates"),
+            SOURCE_USER: hass.config.path(DOMAIN, "templates"),
+        }
+        self._indexes: dict[str, dict[str, Any]] = {}
+        self._stats: dict[str, dict[str, tuple[int, int]]] = {source: {} for source in self.directories}
+        self._loaded: OrderedDict[str, list] = OrderedDict()
+
+    def _refresh(self) -> dict[str, dict[str, Any]]:
+        """Blocking: refresh stale directory indexes, return all usable entries."""
+        for source, directory in self.directories.items():
+            previous = self._indexes.get(source) or _read_index(directory)
+            index, parsed = build_index(directory, previous, self._stats[source])
+            self._indexes[source] = index
+            for digest, registers in parsed.items():
+                self._remember(digest, registers)
+
+        catalog = {}
+        for source, index in self._indexes.items():
+            for name, entry in index["templates"].items():
+                if "error" not in entry:
+                    catalog[f"{source}:{name}"] = {**entry, "name": name, "source": source}
+        return catalog
+
+    def _remember(self, digest: str, registers: list) -> None:
+        self._loaded[digest] = registers
+        self._loaded.move_to_end(digest)
+        while len(self._loaded) > LOADED_CACHE_SIZE:
+            self._loaded.popitem(last=False)
+
+    def _load(self, template_id: str) -> list[dict[str, Any]]:
+        """Blocking: return the normalised registers of one template."""
+        catalog = self._refresh()
+        entry = catalog.get(template_id)
+        if entry is None:
+            raise FileNotFoundError(template_id)
+
+        registers = self._loaded.get(entry["sha256"])
+        if registers is None:
+            path = os.path.join(self.directories[entry["source"]], entry["file"])
+            with open(path, "rb") as f:
+                raw = f.read()
+            registers = parse_template(raw, entry["name"])["registers"]
+            self._remember(entry["sha256"], registers)
+        return [dict(reg) for reg in registers]
+
+    async def async_get_catalog(self) -> dict[str, dict[str, Any]]:
+        """Return {template_id: index entry} for all valid templates."""
+        return await self.hass.async_add_executor_job(self._refresh)
+
+    async def async_load(self, template_id: str) -> list[dict[str, Any]]:
+        """Return a copy of the normalised registers of a template."""
+        return await self.hass.async_add_executor_job(self._load, template_id)
+
+
+def get_catalog(hass: HomeAssistant) -> TemplateCatalog:
+    """Return the shared template catalog."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "template_catalog" not in domain_data:
+        domain_data["template_catalog"] = TemplateCatalog(hass)
+    return domain_data["template_catalog"]
@@ -0,0 +1,156 @@
+"""Per-connection transaction trace for Modbus Wizard."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .capture import CAPTURED_METHODS, request_info
+from .const import DOMAIN
+
+DEFAULT_TRACE_SIZE = 4096
+
+OUTCOME_OK = 0
+OUTCOME_EXCEPTION = 1
+OUTCOME_FAILED = 2
+OUTCOMES = ("ok", "exception", "failed")
+
+
+class TransactionTrace:
+    """Ring buffer of the last N transactions on one connection.
+
+    Every field lives in its own preallocated array, so recording a
+    transaction is a handful of C-level stores and allocates nothing.
+    """
+
+    __slots__ = (
+        "_address", "_count", "_exception", "_function", "_latency", "_next",
+        "_outcome", "_slave", "_time", "size", "total",
+    )
+
+    def __init__(self, size: int = DEFAULT_TRACE_SIZE) -> None:
+        self.size = size
+        self.total = 0
+        self._next = 0
+        self._time = array("d", bytes(8 * size))
+        self._latency = array("f", bytes(4 * size))
+        self._function = array("B", bytes(size))
+        self._slave = array("B", bytes(size))
+        self._address = array("H", bytes(2 * size))
+        self._count = array("H", bytes(2 * size))
+        self._outcome = array("B", bytes(size))
+        self._exception = array("B", bytes(size))
+
+    def record(
+        self,
+        started: float,
+        latency: float,
+        function_code: int,
+        slave: int,
+        address: int,
+        count: int,
+        outcome: int,
+        exception_code: int = 0,
+    ) -> None:
+        i = self._next
+        self._time[i] = started
+        self._latency[i] = latency
+        self._function[i] = function_code
+        self._slave[i] = slave & 0xFF
+        self._address[i] = address & 0xFFFF
+        self._count[i] = count & 0xFFFF
+        self._outcome[i] = outcome
+        self._exception[i] = exception_code & 0xFF
+        self._next = (i + 1) % self.size
+        self.total += 1
+
+    def entries(self, limit: int | None = None, slave: int | None = None) -> list[dict[str, Any]]:
+        """Recorded transactions, oldest first, optionally the newest N of one slave."""
+        stored = min(self.total, self.size)
+        first = (self._next - stored) % self.size
+        result = []
+        for n in range(stored):
+            i = (first + n) % self.size
+            if slave is not None and self._slave[i] != slave:
+                continue
+            result.append({
+                "t": self._time[i],
+                "latency_ms": round(self._latency[i] * 1000, 2),
+                "function": self._function[i],
+                "slave": self._slave[i],
+                "address": self._address[i],
+                "count": self._count[i],
+                "outcome": OUTCOMES[self._outcome[i]],
+                "exception_code": self._exception[i],
+            })
+        return result[-limit:] if limit else result
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate counts and bus time over the buffered transactions."""
+        stored = min(self.total, self.size)
+        outcomes = [0, 0, 0]
+        busy = 0.0
+        for i in range(stored):
+            outcomes[self._outcome[i]] += 1
+            busy += self._latency[i]
+        return {
+            # Transaction timestamps are time.monotonic(); "now" gives their age
+            "now": time.monotonic(),
+            "total": self.total,
+            "buffered": stored,
+            "ok": outcomes[OUTCOME_OK],
+            "exception": outcomes[OUTCOME_EXCEPTION],
+            "failed": outcomes[OUTCOME_FAILED],
+            "bus_time_s": round(busy, 3),
+            "mean_latency_ms": round(busy / stored * 1000, 2) if stored else None,
+        }
+
+
+class TracingClient:
+    """Connection client wrapper that records every request in a TransactionTrace."""
+
+    def __init__(self, client, trace: TransactionTrace) -> None:
+        self.wrapped = client
+        self.trace = trace
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+
+def _traced(name: str, function_code: int, write: bool):
+    async def method(self: TracingClient, *args, **kwargs):
+        address, count, _ = request_info(name, write, args, kwargs)
+        slave = kwargs.get("device_id", 1)
+
+        started = time.monotonic()
+        try:
+            result = await getattr(self.wrapped, name)(*args, **kwargs)
+        except BaseException:
+            self.trace.record(started, time.monotonic() - started, function_code, slave, address, count, OUTCOME_FAILED)
+            raise
+        if result.isError():
+            self.trace.record(
+                started, time.monotonic() - started, function_code, slave, address, count,
+                OUTCOME_EXCEPTION, getattr(result, "exception_code", 0) or 0,
+            )
+        else:
+            self.trace.record(started, time.monotonic() - started, function_code, slave, address, count, OUTCOME_OK)
+        return result
+
+    method.__name__ = name
+    return method
+
+
+for _name, (_fc, _bits, _write) in CAPTURED_METHODS.items():
+    setattr(TracingClient, _name, _traced(_name, _fc, _write))
+
+
+def get_trace(hass: HomeAssistant, key: str) -> TransactionTrace:
+    """Return the trace of a connection, creating it on first use."""
+    traces = hass.data.setdefault(DOMAIN, {}).setdefault("traces", {})
+    if key not in traces:
+        traces[key] = TransactionTrace()
+    return traces[key]
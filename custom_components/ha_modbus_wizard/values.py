@@ -0,0 +1,114 @@
+"""Slot-indexed register values for Modbus Wizard."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+QUALITY_NONE = 0  # never read
+QUALITY_GOOD = 1  # read in the last cycle that polled it
+QUALITY_STALE = 2  # last read failed, value is the last good one
+QUALITIES = ("none", "good", "stale")
+
+
+class ValueStore:
+    """Values of one compiled plan, one slot per register.
+
+    Allocated once per plan and updated in place every cycle, so polling
+    creates no per-cycle dicts and a failed read keeps the last good value
+    (flagged stale). Each slot also carries the time of its last good read.
+    Read-only mapping access by key is kept for callers that want it.
+    """
+
+    __slots__ = ("_slots", "keys", "quality", "timestamps", "values")
+
+    def __init__(self, keys: list[str], previous: ValueStore | None = None) -> None:
+        self.keys = keys
+        self._slots = {key: slot for slot, key in enumerate(keys)}
+        size = len(keys)
+        self.values: list[Any] = [None] * size
+        self.timestamps = array("d", bytes(8 * size))
+        self.quality = array("B", bytes(size))
+
+        if previous is not None:
+            for slot, key in enumerate(keys):
+                old = previous.slot(key)
+                if old is not None:
+                    self.values[slot] = previous.values[old]
+                    self.timestamps[slot] = previous.timestamps[old]
+                    self.quality[slot] = previous.quality[old]
+
+    def slot(self, key: str) -> int | None:
+        return self._slots.get(key)
+
+    def set(self, slot: int, value: Any, timestamp: float) -> None:
+        self.values[slot] = value
+        self.timestamps[slot] = timestamp
+        self.quality[slot] = QUALITY_GOOD
+
+    def mark_failed(self, slot: int) -> None:
+        if self.quality[slot] == QUALITY_GOOD:
+            self.quality[slot] = QUALITY_STALE
+
+    def mark_all_failed(self) -> None:
+        for slot in range(len(self.keys)):
+            self.mark_failed(slot)
+
+    def load(self, values: Mapping[str, Any]) -> None:
+        """Seed last-known values (quality stays "none" until read)."""
+        for key, value in values.items():
+            slot = self._slots.get(key)
+            if slot is not None:
+                self.values[slot] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {key: value for key, value in zip(self.keys, self.values) if value is not None}
+
+    def describe(self) -> dict[str, dict[str, Any]]:
+        """Value, quality and last good read (epoch seconds) per key, for diagnostics."""
+        return {
+            key: {
+                "value": self.values[slot],
+                "quality": QUALITIES[self.quality[slot]],
+                "timestamp": self.timestamps[slot] or None,
+            }
+            for slot, key in enumerate(self.keys)
+        }
+
+    # Mapping-style read access
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slots.get(key)
+        if slot is None or self.values[slot] is None:
+            return default
+        return self.values[slot]
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, value in zip(self.keys, self.values) if value is not None)
+
+    def __len__(self) -> int:
+        return len(self.values) - self.values.count(None)
+
+
+class SlotRef:
+    """An entity's cached slot in its coordinator's current ValueStore.
+
+    The slot is resolved once per store; a recompiled plan brings a new
+    store and the slot is looked up again on the next read.
+    """
+
+    __slots__ = ("_slot", "_store", "key")
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._store: ValueStore | None = None
+        self._slot: int | None = None
+
+    def value(self, store: ValueStore) -> Any:
+        if store is not self._store:
+            self._store = store
+            self._slot = store.slot(self.key)
+        return None if self._slot is None else store.values[self._slot]
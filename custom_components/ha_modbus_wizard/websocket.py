@@ -0,0 +1,90 @@
+"""WebSocket commands for the Modbus Wizard card."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, reg_key
+from .hub import get_entry_coordinator
+from .trace import get_trace
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's WebSocket commands (once per HA run)."""
+    websocket_api.async_register_command(hass, websocket_get_history)
+    websocket_api.async_register_command(hass, websocket_get_trace)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entry_id"): str,
+        vol.Optional("slave_id"): vol.Coerce(int),
+        vol.Optional("registers"): [str],
+        vol.Optional("samples"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("since"): vol.Coerce(float),
+    }
+)
+@callback
+def websocket_get_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the in-memory sample history of an entry's registers."""
+    coordinator = get_entry_coordinator(hass, msg["entry_id"], msg.get("slave_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown Modbus Wizard entry")
+        return
+
+    registers = msg.get("registers")
+    connection.send_result(
+        msg["id"],
+        {
+            "registers": coordinator.get_history(
+                keys=[reg_key(name) for name in registers] if registers else None,
+                samples=msg.get("samples"),
+                since=msg.get("since"),
+            )
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/trace",
+        vol.Required("entry_id"): str,
+        vol.Optional("slave_id"): vol.Coerce(int),
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("all_slaves", default=False): bool,
+    }
+)
+@callback
+def websocket_get_trace(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the recent transactions on an entry's connection."""
+    coordinator = get_entry_coordinator(hass, msg["entry_id"], msg.get("slave_id"))
+    if coordinator is None or coordinator.connection_key is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown Modbus Wizard entry")
+        return
+
+    trace = get_trace(hass, coordinator.connection_key)
+    connection.send_result(
+        msg["id"],
+        {
+            "connection": coordinator.connection_key,
+            "summary": trace.summary(),
+            "transactions": trace.entries(
+                limit=msg.get("limit"),
+                slave=None if msg["all_slaves"] else coordinator.slave_id,
+            ),
+        },
+    )
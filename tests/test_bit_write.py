@@ -0,0 +1,90 @@
+"""Single-bit writes: FC22 Mask Write and its read-modify-write fallback."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.ha_modbus_wizard.coordinator import (
+    ILLEGAL_FUNCTION,
+    ModbusWizardCoordinator,
+)
+from custom_components.ha_modbus_wizard.register_store import get_register_store
+
+ALARM = {"name": "Alarm", "address": 40, "register_type": "holding", "bit": 3}
+
+
+class Response:
+    def __init__(self, registers=(), exception_code=0) -> None:
+        self.registers = list(registers)
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+
+class BitClient:
+    """Holding registers in memory; FC22 answered as configured."""
+
+    connected = True
+
+    def __init__(self, mask_write: str = "ok") -> None:
+        self.mask_write = mask_write
+        self.words = {40: 0b1000_0001}
+        self.calls: list[str] = []
+
+    async def mask_write_register(self, address, and_mask, or_mask, device_id):
+        self.calls.append("mask_write_register")
+        if self.mask_write == "illegal":
+            return Response(exception_code=ILLEGAL_FUNCTION)
+        if self.mask_write == "timeout":
+            raise TimeoutError("no reply")
+        self.words[address] = (self.words[address] & and_mask) | (or_mask & ~and_mask)
+        return Response()
+
+    async def read_holding_registers(self, address, count, device_id):
+        self.calls.append("read_holding_registers")
+        return Response([self.words[address]])
+
+    async def write_register(self, address, value, device_id):
+        self.calls.append("write_register")
+        self.words[address] = value
+        return Response()
+
+
+def _coordinator(hass, client) -> ModbusWizardCoordinator:
+    entry = SimpleNamespace(entry_id="bits", options={}, data={})
+    get_register_store(hass, entry.entry_id).registers = [ALARM]
+    return ModbusWizardCoordinator(hass, client, 1, entry, update_interval=None, connection_key="test")
+
+
+async def test_mask_write_changes_only_the_bit(hass):
+    client = BitClient()
+    coordinator = _coordinator(hass, client)
+
+    assert await coordinator.async_write_bit(ALARM, True)
+    assert client.words[40] == 0b1000_1001
+    assert await coordinator.async_write_bit(ALARM, False)
+    assert client.words[40] == 0b1000_0001
+    assert client.calls == ["mask_write_register"] * 2
+    assert coordinator.values.get("alarm") is False
+
+
+@pytest.mark.parametrize("mask_write", ["illegal", "timeout"])
+async def test_unsupported_mask_write_falls_back_to_read_modify_write(hass, mask_write):
+    client = BitClient(mask_write)
+    coordinator = _coordinator(hass, client)
+
+    assert await coordinator.async_write_bit(ALARM, True)
+    assert client.words[40] == 0b1000_1001
+    assert client.calls == ["mask_write_register", "read_holding_registers", "write_register"]
+    assert coordinator.values.get("alarm") is True
+
+    # FC22 is remembered as unsupported and not probed again
+    client.calls.clear()
+    assert await coordinator.async_write_bit(ALARM, False)
+    assert client.words[40] == 0b1000_0001
+    assert client.calls == ["read_holding_registers", "write_register"]
@@ -0,0 +1,68 @@
+"""Bus budget: fair shares per slot, only oversized slots are stretched."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.ha_modbus_wizard.bus import (
+    LineTiming,
+    async_unschedule,
+    cycle_costs,
+    fair_shares,
+    get_bus_schedule,
+)
+from custom_components.ha_modbus_wizard.plan import compile_plan
+
+SERIAL = {"connection_type": "serial", "baudrate": 9600, "parity": "N", "stopbits": 1, "bytesize": 8}
+
+
+class Owner:
+    """Stand-in for a coordinator owning a bus slot."""
+
+    def __init__(self, name: str, registers: int, budget: int = 0) -> None:
+        self.slave_id = 1
+        self.plan = compile_plan([
+            {"name": f"{name}{i}", "address": i * 2, "data_type": "float32", "priority": "low" if i % 2 else "normal"}
+            for i in range(registers)
+        ])
+        self.stretch: dict[str, int] = {}
+        self.update_interval = None
+        self.my_config_entry = SimpleNamespace(entry_id=name, title=name, data=SERIAL, options={"bus_budget": budget})
+
+    def polled_coordinators(self) -> list[Owner]:
+        return [self]
+
+
+def test_fair_shares_give_small_slots_what_they_need():
+    shares = fair_shares({"a": 0.1, "b": 0.5, "c": 0.6}, 0.6)
+    assert shares == pytest.approx({"a": 0.1, "b": 0.25, "c": 0.25})
+    assert fair_shares({"a": 0.1, "b": 0.2}, 0.6) == {"a": 0.1, "b": 0.2}
+
+
+async def test_oversized_entry_does_not_stretch_the_others(hass):
+    big, small = Owner("big", 40, budget=30), Owner("small", 4)
+    timing = LineTiming.from_config(SERIAL)
+    small_load = sum(cycle_costs([small], timing).values())
+    big_load = sum(cycle_costs([big], timing).values())
+    # Over budget in total, but the small entry stays below an equal share
+    assert small_load < 0.3 / 2
+    assert small_load + big_load > 0.3
+
+    schedule = get_bus_schedule(hass, "test")
+    try:
+        schedule.set(big, timedelta(seconds=1))
+        schedule.set(small, timedelta(seconds=1))
+
+        assert small.stretch == {}
+        assert big.stretch["low"] > 1
+        assert list(schedule.stretch) == ["big"]
+        big_share = 0.3 - small_load
+        assert sum(cost / big.stretch[p] for p, cost in cycle_costs([big], timing).items()) <= big_share
+    finally:
+        async_unschedule(hass, "test", big)
+        async_unschedule(hass, "test", small)
@@ -0,0 +1,104 @@
+"""Hub mode: one refresh cycle polls every slave in turn on one client."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from pymodbus.exceptions import ConnectionException
+
+from custom_components.ha_modbus_wizard.hub import ModbusWizardHub, TemplatePlan
+from custom_components.ha_modbus_wizard.plan import compile_plan
+
+REGISTERS = [
+    {"name": "Temperature", "address": 0, "register_type": "input", "data_type": "int16", "scale": 0.1},
+    {"name": "Humidity", "address": 1, "register_type": "input", "data_type": "uint16", "scale": 0.1},
+]
+TEMPLATE = TemplatePlan(
+    template_id="builtin:th",
+    digest="0" * 64,
+    model="Test TH",
+    registers=REGISTERS,
+    plan=compile_plan(REGISTERS),
+)
+DEVICES = [
+    {"name": "Kitchen", "slave_id": 1, "template": "builtin:th"},
+    {"name": "Cellar", "slave_id": 2, "template": "builtin:th"},
+    {"name": "Attic", "slave_id": 3, "template": "builtin:th"},
+]
+
+
+class Response:
+    def __init__(self, registers=(), exception_code=0) -> None:
+        self.registers = list(registers)
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+
+class BusClient:
+    """One client for all slaves; records the order of requests and overlap."""
+
+    def __init__(self, silent: set[int] = frozenset(), connect_error: bool = False) -> None:
+        self.connected = not connect_error
+        self.connect_error = connect_error
+        self.silent = silent
+        self.reads: list[tuple[int, int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def connect(self) -> bool:
+        if self.connect_error:
+            raise ConnectionException("port busy")
+        self.connected = True
+        return True
+
+    async def read_input_registers(self, address, count, device_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self.reads.append((device_id, address))
+            if device_id in self.silent:
+                return Response(exception_code=4)
+            # Temperature 20.<id> °C, humidity 50.<id> %
+            return Response([200 + device_id if address == 0 else 500 + device_id])
+        finally:
+            self.in_flight -= 1
+
+
+def _hub(hass, client) -> ModbusWizardHub:
+    entry = SimpleNamespace(entry_id="hub", title="Hub", options={"devices": DEVICES}, data={})
+    hub = ModbusWizardHub(hass, client, entry, "test")
+    for device in DEVICES:
+        hub.add_device(device, TEMPLATE)
+    return hub
+
+
+async def test_hub_refreshes_slaves_one_after_another(hass):
+    client = BusClient(silent={2})
+    hub = _hub(hass, client)
+
+    result = await hub._async_update_data()
+
+    assert result == {1: True, 2: True, 3: True}
+    assert client.reads == [(1, 0), (1, 1), (2, 0), (2, 1), (3, 0), (3, 1)]
+    assert client.max_in_flight == 1
+    assert hub.devices[1].values.get("temperature") == pytest.approx(20.1)
+    assert hub.devices[3].values.get("humidity") == pytest.approx(50.3)
+    # A slave answering with errors does not hold up the others
+    assert hub.devices[2].values.describe()["temperature"]["value"] is None
+
+
+async def test_hub_without_connection_fails_every_slave(hass):
+    client = BusClient(connect_error=True)
+    hub = _hub(hass, client)
+
+    result = await hub._async_update_data()
+
+    assert result == {1: False, 2: False, 3: False}
+    assert client.reads == []
+    assert not any(device.last_update_success for device in hub.devices.values())
@@ -0,0 +1,50 @@
+"""Import-time checks for the Modbus Wizard integration.
+
+Runs ``python -X importtime`` in a fresh interpreter so modules imported by
+earlier tests do not hide what loading the integration pulls in.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.ha_modbus_wizard"
+
+# Transport stacks that only an entry of that type (or the serial flow step)
+# may load
+TRANSPORT_MODULES = ("pymodbus", "serial")
+
+
+def _import_times(*modules: str) -> dict[str, int]:
+    """Return {module: cumulative microseconds} for importing the given modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            times[name] = int(cumulative)
+    return times
+
+
+def test_loading_integration_skips_transport_stacks():
+    times = _import_times(PACKAGE, f"{PACKAGE}.config_flow", f"{PACKAGE}.coordinator")
+
+    assert PACKAGE in times
+    loaded = sorted(name for name in times if name.split(".")[0] in TRANSPORT_MODULES)
+    assert loaded == []
+    print(f"{PACKAGE}: {times[PACKAGE] / 1000:.1f} ms cumulative")
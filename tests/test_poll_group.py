@@ -0,0 +1,151 @@
+"""Poll groups: merged reads shared by the members, each polled at its own interval."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from pymodbus.client.mixin import ModbusClientMixin
+
+from custom_components.ha_modbus_wizard.bus import join_poll_group, leave_poll_group
+from custom_components.ha_modbus_wizard.coordinator import (
+    ModbusWizardCoordinator,
+    SharedReads,
+)
+from custom_components.ha_modbus_wizard.register_store import get_register_store
+
+FIRST = [
+    {"name": "A", "address": 0, "register_type": "holding", "data_type": "uint32"},
+    {"name": "B", "address": 5, "register_type": "holding"},
+    {"name": "Far", "address": 300, "register_type": "holding"},
+]
+SECOND = [
+    # Touches A; D touches C and B
+    {"name": "C", "address": 2, "register_type": "holding", "data_type": "uint32"},
+    {"name": "D", "address": 4, "register_type": "holding"},
+]
+
+
+class Response:
+    def __init__(self, registers=(), exception_code=0) -> None:
+        self.registers = list(registers)
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+
+class WordClient:
+    """Every holding register holds its own address; some blocks are rejected."""
+
+    connected = True
+    DATATYPE = ModbusClientMixin.DATATYPE
+    convert_from_registers = staticmethod(ModbusClientMixin.convert_from_registers)
+
+    def __init__(self) -> None:
+        self.reads: list[tuple[int, int]] = []
+        self.rejected: set[tuple[int, int]] = set()
+
+    async def read_holding_registers(self, address, count, device_id):
+        self.reads.append((address, count))
+        if (address, count) in self.rejected:
+            return Response(exception_code=2)
+        return Response(range(address, address + count))
+
+
+def _coordinator(hass, client, entry_id, registers, seconds) -> ModbusWizardCoordinator:
+    entry = SimpleNamespace(entry_id=entry_id, title=entry_id, options={}, data={})
+    get_register_store(hass, entry_id).registers = registers
+    return ModbusWizardCoordinator(
+        hass, client, 1, entry, update_interval=timedelta(seconds=seconds), connection_key="test"
+    )
+
+
+async def test_shared_reads_merge_overlapping_and_touching_blocks(hass):
+    client = WordClient()
+    first = _coordinator(hass, client, "first", FIRST, 10)
+    second = _coordinator(hass, client, "second", SECOND, 10)
+
+    reads = SharedReads([first, second])
+    assert set(reads.spans.values()) == {("holding", 0, 6), ("holding", 300, 1)}
+
+    await second._async_poll(reads)
+    await first._async_poll(reads)
+
+    # Each span is read once, whichever member needed it first
+    assert sorted(client.reads) == [(0, 6), (300, 1)]
+    assert first.values.get("a") == 1
+    assert second.values.get("c") == (2 << 16) + 3
+    assert second.values.get("d") == 4
+    assert first.values.get("far") == 300
+
+
+async def test_rejected_span_falls_back_to_block_reads(hass):
+    client = WordClient()
+    client.rejected = {(0, 6)}
+    first = _coordinator(hass, client, "first", FIRST, 10)
+    second = _coordinator(hass, client, "second", SECOND, 10)
+
+    reads = SharedReads([first, second])
+    await second._async_poll(reads)
+    await first._async_poll(reads)
+
+    assert client.reads[0] == (0, 6)
+    # The rejected span is not retried; its blocks are read on their own, once each
+    assert sorted(client.reads[1:]) == [(0, 2), (2, 2), (4, 1), (5, 1), (300, 1)]
+    assert first.values.get("b") == 5
+    assert second.values.get("d") == 4
+
+
+async def test_members_are_polled_at_their_own_interval(hass):
+    client = WordClient()
+    fast = _coordinator(hass, client, "fast", FIRST, 5)
+    slow = _coordinator(hass, client, "slow", SECOND, 10)
+    odd = _coordinator(hass, client, "odd", SECOND, 7)
+    group = join_poll_group(hass, fast)
+    try:
+        join_poll_group(hass, slow)
+        join_poll_group(hass, odd)
+        assert group.cycle == 5
+
+        polled = {fast: [], slow: [], odd: []}
+        for now in range(0, 70, 5):
+            for member in group.due_members(float(now)):
+                polled[member].append(now)
+
+        assert polled[fast] == list(range(0, 70, 5))
+        assert polled[slow] == [0, 10, 20, 30, 40, 50, 60]
+        # Never early; late by less than one group cycle, so 7 s on average
+        assert polled[odd] == [0, 10, 15, 25, 30, 35, 45, 50, 60, 65]
+    finally:
+        for member in (odd, slow, fast):
+            leave_poll_group(hass, member)
+
+
+async def test_leader_cycle_reads_only_for_due_members(hass):
+    client = WordClient()
+    fast = _coordinator(hass, client, "fast", [FIRST[2]], 5)
+    slow = _coordinator(hass, client, "slow", SECOND, 60)
+    join_poll_group(hass, fast)
+    try:
+        join_poll_group(hass, slow)
+
+        await fast._async_update_data()
+        assert sorted(client.reads) == [(2, 3), (300, 1)]
+
+        # Nobody is due again yet
+        client.reads.clear()
+        await fast._async_update_data()
+        assert client.reads == []
+
+        # A requested refresh polls the requesting member only
+        await fast.async_request_refresh()
+        assert client.reads == [(300, 1)]
+    finally:
+        for member in (slow, fast):
+            leave_poll_group(hass, member)
+        await fast.async_shutdown()
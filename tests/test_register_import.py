@@ -0,0 +1,88 @@
+"""Bulk register import: CSV and JSON parsing, row validation, overlaps."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.ha_modbus_wizard.register_import import parse_register_import
+
+EXISTING = [{"name": "Voltage", "address": 0, "register_type": "input", "data_type": "float32", "size": 2}]
+
+CSV = """name,address,register_type,data_type,scale,options
+Current,10,input,float32,,
+Mode,20,holding,uint16,0.5,"{""0"": ""off"", ""1"": ""on""}"
+"""
+
+
+def test_csv_and_json_give_the_same_registers():
+    rows = [
+        {"name": "Current", "address": 10, "register_type": "input", "data_type": "float32"},
+        {"name": "Mode", "address": 20, "register_type": "holding", "data_type": "uint16",
+         "scale": 0.5, "options": {"0": "off", "1": "on"}},
+    ]
+    from_csv, errors = parse_register_import(CSV, EXISTING)
+    assert errors == []
+    from_json, errors = parse_register_import(json.dumps(rows), EXISTING)
+    assert errors == []
+    # A template-style object works too
+    from_template, errors = parse_register_import(json.dumps({"registers": rows}), EXISTING)
+    assert errors == []
+
+    assert from_csv == from_json == from_template
+    assert [(r["name"], r["address"], r["size"]) for r in from_csv] == [("Current", 10, 2), ("Mode", 20, 1)]
+    assert from_csv[1]["scale"] == 0.5
+    assert from_csv[1]["options"] == {"0": "off", "1": "on"}
+
+
+def test_bad_rows_are_reported_by_row():
+    text = "name,address,data_type\nGood,30,uint16\nNoAddress,,uint16\nOdd,31,uint12\n"
+    registers, errors = parse_register_import(text, EXISTING)
+    assert [r["name"] for r in registers] == ["Good"]
+    assert len(errors) == 2
+    assert errors[0].startswith("row 3:") and "address" in errors[0]
+    assert errors[1].startswith("row 4:") and "uint12" in errors[1]
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("", "no registers found"),
+        ("[{", "invalid JSON"),
+        ('{"vendor": "x"}', "JSON must be a list"),
+        ("label,value\na,1\n", "CSV needs a header line"),
+    ],
+)
+def test_unusable_input(text, message):
+    registers, errors = parse_register_import(text, [])
+    assert registers == []
+    assert len(errors) == 1
+    assert message in errors[0]
+
+
+def test_overlaps_with_existing_and_other_rows():
+    rows = [
+        # Second word of the existing float32 at input 0
+        {"name": "Clash", "address": 1, "register_type": "input"},
+        # Same address, other table: no overlap
+        {"name": "Holding", "address": 1, "register_type": "holding"},
+        {"name": "Wide", "address": 40, "register_type": "holding", "data_type": "uint32"},
+        {"name": "Inside", "address": 41, "register_type": "holding"},
+        # auto may resolve to either table
+        {"name": "Auto", "address": 1, "register_type": "auto"},
+        # Different bits of one word may coexist, the same bit twice may not
+        {"name": "Bit0", "address": 50, "register_type": "holding", "bit": 0},
+        {"name": "Bit1", "address": 50, "register_type": "holding", "bit": 1},
+        {"name": "Bit1 again", "address": 50, "register_type": "holding", "bit": 1},
+    ]
+    registers, errors = parse_register_import(json.dumps(rows), EXISTING)
+    assert len(registers) == len(rows)
+    assert errors == [
+        "row 1: 'Clash' at 1 overlaps existing 'Voltage'",
+        "row 4: 'Inside' at 41 overlaps row 3",
+        "row 5: 'Auto' at 1 overlaps existing 'Voltage'",
+        "row 8: 'Bit1 again' at 50 overlaps row 7",
+    ]
@@ -0,0 +1,94 @@
+"""Register scanner: block splitting on exception replies, stopping on silence."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from pymodbus.exceptions import ModbusIOException
+
+from custom_components.ha_modbus_wizard.scanner import (
+    ILLEGAL_FUNCTION,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    MAX_REGISTER_BLOCK,
+    RegisterScanner,
+)
+
+ILLEGAL_DATA_ADDRESS = 2
+
+
+class Response:
+    def __init__(self, registers=(), exception_code=0) -> None:
+        self.registers = list(registers)
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+
+class MapClient:
+    """Holding registers readable only in some ranges; no input registers."""
+
+    def __init__(self, readable: list[range], silent: bool = False) -> None:
+        self.readable = readable
+        self.silent = silent
+        self.reads: list[tuple[str, int, int]] = []
+
+    async def read_holding_registers(self, address, count, device_id):
+        self.reads.append(("holding", address, count))
+        if self.silent:
+            raise ModbusIOException("no response")
+        block = range(address, address + count)
+        if any(block[0] in r and block[-1] in r for r in self.readable):
+            return Response([0] * count)
+        return Response(exception_code=ILLEGAL_DATA_ADDRESS)
+
+    async def read_input_registers(self, address, count, device_id):
+        self.reads.append(("input", address, count))
+        return Response(exception_code=ILLEGAL_FUNCTION)
+
+
+def _scanner(hass, client, start: int, end: int, register_types) -> RegisterScanner:
+    coordinator = SimpleNamespace(
+        hass=hass,
+        client=client,
+        slave_id=1,
+        _lock=asyncio.Lock(),
+        my_config_entry=SimpleNamespace(entry_id="scan"),
+    )
+    return RegisterScanner(coordinator, start, end, register_types)
+
+
+async def test_exception_replies_split_blocks_down_to_the_readable_ranges(hass):
+    client = MapClient([range(10, 20), range(200, 300)])
+    scanner = _scanner(hass, client, 0, 299, ("holding", "input"))
+
+    result = await scanner.async_run()
+
+    assert result["complete"] is True
+    assert result["aborted"] is None
+    assert result["ranges"] == {"holding": [[10, 19], [200, 299]], "input": []}
+    assert scanner.done == scanner.total
+    # The fully readable block is read in one request, without splitting
+    assert ("holding", 250, 50) in client.reads
+    # Input registers are not supported: one request, then the type is skipped
+    assert [read for read in client.reads if read[0] == "input"] == [("input", 0, MAX_REGISTER_BLOCK)]
+    # Unreadable areas are split down to single registers, at most ~2 requests each
+    assert len(client.reads) == result["requests"] < 2 * 300
+
+
+async def test_silent_device_is_not_split_and_stops_the_scan(hass):
+    client = MapClient([], silent=True)
+    scanner = _scanner(hass, client, 0, 1999, ("holding", "input"))
+
+    result = await scanner.async_run()
+
+    assert result["complete"] is False
+    assert result["aborted"]
+    assert result["requests"] == MAX_CONSECUTIVE_TIMEOUTS
+    assert all(count == MAX_REGISTER_BLOCK for _, _, count in client.reads)
+    assert not any(read[0] == "input" for read in client.reads)
@@ -0,0 +1,82 @@
+"""Entity writes reverse scale and offset, and decode the read-back with them."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.ha_modbus_wizard.coordinator import ModbusWizardCoordinator
+from custom_components.ha_modbus_wizard.register_store import get_register_store
+from custom_components.ha_modbus_wizard.select import ModbusWizardSelect
+
+SETPOINT = {
+    "name": "Setpoint",
+    "address": 10,
+    "register_type": "holding",
+    "data_type": "int16",
+    "scale": 0.1,
+    "offset": -5,
+    "rw": "rw",
+}
+
+
+class Response:
+    def __init__(self, registers) -> None:
+        self.registers = list(registers)
+
+    def isError(self) -> bool:
+        return False
+
+
+class WriteClient:
+    connected = True
+
+    def __init__(self) -> None:
+        self.words: dict[int, int] = {}
+
+    async def readwrite_registers(self, read_address, read_count, write_address, values, device_id):
+        for i, word in enumerate(values):
+            self.words[write_address + i] = word
+        return Response(self.words[read_address + i] for i in range(read_count))
+
+
+async def test_write_value_round_trips_scale_and_offset(hass):
+    client = WriteClient()
+    entry = SimpleNamespace(entry_id="write", options={}, data={})
+    get_register_store(hass, entry.entry_id).registers = [SETPOINT]
+    coordinator = ModbusWizardCoordinator(hass, client, 1, entry, update_interval=None)
+
+    assert await coordinator.async_write_value(SETPOINT, 21.5)
+    # (21.5 - -5) / 0.1
+    assert client.words[10] == 265
+    assert coordinator.values.get("setpoint") == pytest.approx(21.5)
+
+    assert await coordinator.async_write_value(SETPOINT, -10)
+    assert client.words[10] == 65536 - 50
+    assert coordinator.values.get("setpoint") == pytest.approx(-10)
+
+
+async def test_select_writes_the_numeric_option_key(hass):
+    mode = {"name": "Mode", "address": 20, "register_type": "holding", "rw": "rw", "options": {"0": "Off", "2": "Auto"}}
+    client = WriteClient()
+    entry = SimpleNamespace(entry_id="select", options={}, data={})
+    get_register_store(hass, entry.entry_id).registers = [mode]
+    coordinator = ModbusWizardCoordinator(hass, client, 1, entry, update_interval=None)
+    select = ModbusWizardSelect(coordinator, entry, "select_mode", mode, None)
+
+    await select.async_select_option("Auto")
+    assert client.words[20] == 2
+    assert select.current_option == "Auto"
+
+
+async def test_unencodable_value_fails_the_write(hass):
+    client = WriteClient()
+    entry = SimpleNamespace(entry_id="bad", options={}, data={})
+    get_register_store(hass, entry.entry_id).registers = [SETPOINT]
+    coordinator = ModbusWizardCoordinator(hass, client, 1, entry, update_interval=None)
+
+    assert not await coordinator.async_write_value(SETPOINT, "on")
+    assert client.words == {}